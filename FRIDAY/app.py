@@ -1,50 +1,39 @@
-import speech_recognition as sr
-import pyttsx3
-import pywhatkit
+# Only light modules are imported here. Each skill imports its own
+# dependencies (pywhatkit, wikipedia, openai, ...) the first time it runs,
+# so Friday starts talking without loading all of them.
+import argparse
+import atexit
 import datetime
-import wikipedia
-import pyjokes
-import openai
-import geopy
-from geopy.geocoders import Nominatim
-import gmplot
+import functools
+import hashlib
+import json
 import os
-import subprocess
-import math
+import types
 import webbrowser
-import requests
-import json
-import time
-import threading
-import googletrans
-from googletrans import Translator
-import pytz
-import wolframalpha
-import pyautogui
-import psutil
-import screen_brightness_control as sbc
-from pygame import mixer
-
-# Initialize components
-recognizer = sr.Recognizer()
-engine = pyttsx3.init()
-translator = Translator()
-mixer.init()
-
-# Configure voice
-voices = engine.getProperty('voices')
-engine.setProperty('voice', voices[1].id)  # Female voice
-engine.setProperty('rate', 180)  # Slightly faster speech
-engine.setProperty('volume', 1.0)
+
+from audio import MicrophoneSource, Speaker, StreamingVoicePipeline, TextSource, VoicePipeline, WavSource
+from calculator import evaluate, format_number
+from http_client import WEATHER_URL, HttpClient
+from intents import COMMAND_SKILLS as skills, classify_command
+from recognizers import EarlyRouter, create_recognizer
+from reminders import ReminderScheduler
+from replay import Cassette
+from tracing import CProfiler, SamplingProfiler, Tracer
+from translation import GoogleTranslator, PhraseCache, TranslationLayer
 
 # API setup
-openai.api_key = os.getenv("YOUR_OPENAI_API_KEY")
-wolfram_client = wolframalpha.Client(os.getenv("WOLFRAM_ALPHA_APPID"))
 WEATHER_API_KEY = os.getenv("WEATHER_API_KEY")
+REMINDERS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reminders.json")
+TRANSLATIONS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "translations.db")
 
 # Global state
 current_language = "en"  # Default language
-reminders = []
+reminders = None  # ReminderScheduler, see reminder_scheduler()
+speaker = None  # Speaker thread once the voice pipeline runs
+speech_recognizer = None  # set from --recognizer in main()
+translator = None  # TranslationLayer, see translation_layer()
+http = HttpClient()  # pooled session shared by the web skills
+tracer = Tracer()  # disabled unless --trace or --profile is given
 
 # Supported languages with codes
 SUPPORTED_LANGUAGES = {
@@ -63,47 +52,171 @@ SUPPORTED_LANGUAGES = {
     "german": "de"
 }
 
+# Fixed replies, translated ahead of time when the language changes
+STATIC_RESPONSES = [
+    "Sorry, I'm having trouble connecting to the internet",
+    "I couldn't understand that calculation",
+    "Sorry, I couldn't perform that calculation",
+    "Sorry, I couldn't get weather information",
+    "Sorry, I couldn't retrieve weather information",
+    "Volume increased",
+    "Volume decreased",
+    "Sound muted",
+    "Brightness increased",
+    "Brightness decreased",
+    "Screenshot taken and saved",
+    "Putting system to sleep",
+    "System command not recognized",
+    "Please specify time in minutes or hours",
+    "Sorry, I couldn't set that reminder",
+    "I'm having trouble processing that request right now",
+    "Hello sir!",
+    "Hi there!",
+    "Hey, how can I help?",
+    "Friday activated. How can I help you today?",
+    "I am Friday, your personal assistant!",
+    "Couldn't determine your current location",
+    "Opening Chrome",
+    "Opening YouTube",
+    "Opening Notepad",
+    "Goodbye! Have a great day!",
+]
+
+@functools.lru_cache(maxsize=None)
+def tts_engine():
+    """The text-to-speech engine, initialized on first use"""
+    import pyttsx3
+
+    engine = pyttsx3.init()
+    # Configure voice
+    voices = engine.getProperty('voices')
+    engine.setProperty('voice', voices[1].id)  # Female voice
+    engine.setProperty('rate', 180)  # Slightly faster speech
+    engine.setProperty('volume', 1.0)
+    return engine
+
+def reminder_scheduler():
+    """The reminder scheduler, with the saved reminders loaded on first use"""
+    global reminders
+    if reminders is None:
+        reminders = ReminderScheduler(lambda reminder: speak(f"Reminder: {reminder.message}"), path=REMINDERS_FILE)
+    return reminders
+
+def translation_layer():
+    """The translator for speak(), its phrase cache opened on first use"""
+    global translator
+    if translator is None:
+        translator = TranslationLayer(GoogleTranslator(), PhraseCache(TRANSLATIONS_FILE))
+    return translator
+
+@functools.lru_cache(maxsize=None)
+def wolfram_client():
+    import wolframalpha
+
+    return wolframalpha.Client(os.getenv("WOLFRAM_ALPHA_APPID"))
+
+@functools.lru_cache(maxsize=None)
+def openai_client():
+    import openai
+
+    openai.api_key = os.getenv("YOUR_OPENAI_API_KEY")
+    return openai
+
+def wolfram_answer(command):
+    """Text of Wolfram Alpha's first result for command"""
+    return next(wolfram_client().query(command).results).text
+
+def wikipedia_summary(query):
+    """Two-sentence Wikipedia summary of query"""
+    import wikipedia
+
+    return wikipedia.summary(query, sentences=2)
+
+def openai_reply(command):
+    """GPT-3.5's reply to command"""
+    response = openai_client().ChatCompletion.create(
+        model="gpt-3.5-turbo",
+        messages=[
+            {"role": "system", "content": "You are Friday, a helpful AI assistant. Respond concisely."},
+            {"role": "user", "content": command}
+        ]
+    )
+    return response.choices[0].message.content
+
+def use_cassette(cassette):
+    """Send every backend call through a record/replay Cassette
+
+    Covers the web APIs (weather, location, Wolfram Alpha, Wikipedia,
+    OpenAI), translation, speech recognition and speech output, so a
+    replayed session needs no network, API keys, microphone or TTS engine
+    yet takes as long as the recorded one. Recognition is keyed by a hash
+    of the audio and forced to whole utterances; translations are
+    recorded one sentence per call, so replay does not depend on how
+    prewarm() and speak() happened to batch them.
+    """
+    global say_now, speech_recognizer, translator
+
+    http.get_json = cassette.wrap("http", http.get_json, key=lambda url, skill, params=None: _json_key(
+        skill, {name: value for name, value in (params or {}).items() if name != "appid"}))
+    http.run = cassette.wrap("skill", http.run, key=lambda skill, fn, *args, **kwargs: _json_key(skill, *args))
+
+    backend = GoogleTranslator()
+    translate_one = cassette.wrap("translate", lambda text, lang: backend.translate([text], lang)[0],
+                                  key=lambda text, lang: f"{lang}:{text}")
+    # In memory only: a warm cache on disk would hide the calls
+    translator = TranslationLayer(types.SimpleNamespace(
+        translate=lambda texts, lang: [translate_one(t, lang) for t in texts]), PhraseCache())
+
+    say_now = cassette.wrap("tts", say_now, key=lambda text: text)
+    recognize = speech_recognizer.recognize if speech_recognizer is not None else None
+    speech_recognizer = types.SimpleNamespace(
+        recognize=cassette.wrap("stt", recognize, key=lambda audio: hashlib.sha1(audio.frame_data).hexdigest()),
+        streaming=False)
+
+def _json_key(*parts):
+    return json.dumps(parts, sort_keys=True)
+
 def speak(text, language=None):
-    """Speak text with optional language translation"""
-    global current_language
-    
+    """Speak text in the given language, or the current one"""
     print(f"Friday: {text}")
     
-    if language and language != current_language:
-        try:
-            translated = translator.translate(text, dest=language)
-            text = translated.text
-            current_language = language
-        except:
-            pass
+    try:
+        with tracer.span("translate"):
+            text = translation_layer().translate(text, language or current_language)
+    except Exception as e:
+        print(f"Translation error: {e}")
     
+    if speaker:
+        speaker.say(text)
+    else:
+        say_now(text)
+
+def say_now(text):
+    """Speak text on the calling thread, blocking until done"""
+    engine = tts_engine()
     engine.say(text)
     engine.runAndWait()
 
-def recognize_speech():
-    """Capture and recognize speech with multilingual support"""
-    with sr.Microphone() as source:
-        print("Listening...")
-        recognizer.adjust_for_ambient_noise(source, duration=0.8)
-        try:
-           audio = recognizer.listen(source, timeout=8)
-        except sr.WaitTimeoutError:
-           print("Listening timed out, please try again.")
-           return None
+def recognize_speech(audio):
+    """Recognize one captured utterance with multilingual support"""
+    import speech_recognition as sr
 
-        
-        try:
-            text = recognizer.recognize_google(audio, language="en-IN")
-            print(f"User: {text}")
-            return text.lower()
-        except sr.UnknownValueError:
-            return ""
-        except sr.RequestError:
-            speak("Sorry, I'm having trouble connecting to the internet")
-            return ""
-        except Exception as e:
-            print(f"Recognition error: {e}")
-            return ""
+    try:
+        text = speech_recognizer.recognize(audio)
+        print(f"User: {text}")
+        return text.lower()
+    except sr.UnknownValueError:
+        return ""
+    except sr.RequestError:
+        speak("Sorry, I'm having trouble connecting to the internet")
+        return ""
+    except Exception as e:
+        print(f"Recognition error: {e}")
+        return ""
+
+def recognize_text(text):
+    """Typed input needs no recognition"""
+    return text.strip().lower()
 
 def set_language(command):
     """Change assistant language"""
@@ -112,71 +225,44 @@ def set_language(command):
     for lang_name, lang_code in SUPPORTED_LANGUAGES.items():
         if lang_name in command:
             current_language = lang_code
+            translation_layer().prewarm(STATIC_RESPONSES, lang_code)
             speak(f"Language changed to {lang_name}", "en")
             return True
     return False
 
-def handle_reminders():
-    """Check and notify about reminders"""
-    while True:
-        now = datetime.datetime.now()
-        for reminder in reminders[:]:
-            if now >= reminder["time"]:
-                speak(f"Reminder: {reminder['message']}")
-                reminders.remove(reminder)
-        time.sleep(30)
-
+@skills.handler('calculate')
 def calculate(command):
     """Handle mathematical calculations"""
+    # Plain arithmetic is answered locally; Wolfram Alpha only gets what doesn't parse
+    try:
+        result = evaluate(command)
+    except ValueError:
+        pass
+    except ArithmeticError as e:
+        print(f"Calculation error: {e}")
+        speak("Sorry, I couldn't perform that calculation")
+        return
+    else:
+        speak(f"The result is {format_number(result)}")
+        return
+    
     try:
         # Wolfram Alpha for complex calculations
-        res = wolfram_client.query(command)
-        answer = next(res.results).text
+        answer = http.run("wolfram", wolfram_answer, command)
         speak(f"The answer is {answer}")
-    except:
-        # Fallback to simple calculations
-        try:
-            if '+' in command:
-                parts = command.split('+')
-                result = sum(float(p) for p in parts)
-            elif '-' in command:
-                parts = command.split('-')
-                result = float(parts[0]) - float(parts[1])
-            elif '×' in command or '*' in command:
-                parts = command.split('×') if '×' in command else command.split('*')
-                result = float(parts[0]) * float(parts[1])
-            elif '÷' in command or '/' in command:
-                parts = command.split('÷') if '÷' in command else command.split('/')
-                result = float(parts[0]) / float(parts[1])
-            elif 'sqrt' in command:
-                num = float(command.split('sqrt')[1])
-                result = math.sqrt(num)
-            elif '^' in command:
-                base, exp = command.split('^')
-                result = math.pow(float(base), float(exp))
-            else:
-                speak("I couldn't understand that calculation")
-                return
-            
-            speak(f"The result is {result}")
-        except Exception as e:
-            print(f"Calculation error: {e}")
-            speak("Sorry, I couldn't perform that calculation")
+    except Exception as e:
+        print(f"Calculation error: {e}")
+        speak("I couldn't understand that calculation")
 
 def get_weather(city=None):
     """Get weather information"""
-    if not city:
-        city = "current location"
-    
     try:
-        if city == "current location":
-            # Get location by IP
-            location = requests.get('https://ipinfo.io').json()
-            city = location.get('city', 'Mumbai')
+        if not city:
+            # Location by IP, usually already cached or prefetched at startup
+            city = http.location().get('city', 'Mumbai')
         
-        url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={WEATHER_API_KEY}&units=metric"
-        response = requests.get(url)
-        data = response.json()
+        data = http.get_json(WEATHER_URL, "weather",
+                             params={"q": city, "appid": WEATHER_API_KEY, "units": "metric"})
         
         if data["cod"] != 200:
             speak("Sorry, I couldn't get weather information")
@@ -193,18 +279,23 @@ def get_weather(city=None):
         print(f"Weather error: {e}")
         speak("Sorry, I couldn't retrieve weather information")
 
+@skills.handler('system')
 def system_control(command):
     """Control system functions"""
     if 'volume up' in command:
+        import pyautogui
         pyautogui.press('volumeup')
         speak("Volume increased")
     elif 'volume down' in command:
+        import pyautogui
         pyautogui.press('volumedown')
         speak("Volume decreased")
     elif 'mute' in command:
+        import pyautogui
         pyautogui.press('volumemute')
         speak("Sound muted")
     elif 'brightness' in command:
+        import screen_brightness_control as sbc
         if 'increase' in command:
             current = sbc.get_brightness()[0]
             sbc.set_brightness(min(current + 20, 100))
@@ -214,9 +305,11 @@ def system_control(command):
             sbc.set_brightness(max(current - 20, 0))
             speak("Brightness decreased")
     elif 'screenshot' in command:
+        import pyautogui
         pyautogui.screenshot().save('screenshot.png')
         speak("Screenshot taken and saved")
     elif 'battery' in command:
+        import psutil
         battery = psutil.sensors_battery()
         speak(f"Battery is at {battery.percent}%")
     elif 'sleep' in command:
@@ -225,6 +318,7 @@ def system_control(command):
     else:
         speak("System command not recognized")
 
+@skills.handler('reminder')
 def set_reminder(command):
     """Set a reminder"""
     try:
@@ -242,28 +336,17 @@ def set_reminder(command):
                 speak("Please specify time in minutes or hours")
                 return
             
-            reminder_time = datetime.datetime.now() + datetime.timedelta(minutes=minutes)
-            reminders.append({
-                "message": message,
-                "time": reminder_time
-            })
+            reminder_scheduler().add(message, delay=minutes * 60)
             speak(f"Reminder set for {message} in {minutes} minutes")
     except Exception as e:
         print(f"Reminder error: {e}")
         speak("Sorry, I couldn't set that reminder")
 
+@skills.handler('conversation')
 def handle_conversation(command):
     """Handle conversational queries using GPT-3"""
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are Friday, a helpful AI assistant. Respond concisely."},
-                {"role": "user", "content": command}
-            ]
-        )
-        reply = response.choices[0].message.content
-        speak(reply)
+        speak(http.run("openai", openai_reply, command))
     except Exception as e:
         print(f"GPT error: {e}")
         speak("I'm having trouble processing that request right now")
@@ -282,93 +365,171 @@ def process_command(command):
         return
     
     # Command routing
-    if any(word in command for word in ['play', 'song', 'music']):
-        song = command.replace('play', '').strip()
-        if song:
-            speak(f"Playing {song}")
-            pywhatkit.playonyt(song)
-    
-    elif any(word in command for word in ['hi', 'hello', 'hey']):
-        greetings = ["Hello sir!", "Hi there!", "Hey, how can I help?"]
-        speak(greetings[datetime.datetime.now().second % len(greetings)])
-    
-    elif 'your name' in command:
-        speak('I am Friday, your personal assistant!')
-    
-    elif 'time' in command:
-        tz = pytz.timezone('Asia/Kolkata')
-        current_time = datetime.datetime.now(tz).strftime('%I:%M %p')
-        speak(f"Current time is {current_time}")
-    
-    elif 'date' in command:
-        today = datetime.datetime.now().strftime('%B %d, %Y')
-        speak(f"Today is {today}")
-    
-    elif any(word in command for word in ['who is', 'what is', 'wikipedia']):
-        query = command.replace('wikipedia', '').replace('who is', '').replace('what is', '').strip()
-        if query:
-            try:
-                summary = wikipedia.summary(query, sentences=2)
-                speak(summary)
-            except:
-                speak(f"Sorry, I couldn't find information about {query}")
-    
-    elif 'joke' in command:
-        speak(pyjokes.get_joke())
-    
-    elif any(word in command for word in ['calculate', 'math', 'solve']):
-        calculate(command)
-    
-    elif any(word in command for word in ['weather', 'temperature']):
-        city = command.replace('weather', '').replace('in', '').strip()
-        get_weather(city if city != "" else None)
-    
-    elif any(word in command for word in ['remind', 'reminder']):
-        set_reminder(command)
-    
-    elif any(word in command for word in ['location', 'where am i']):
+    with tracer.span("route"):
+        intent = skills.route(command).name
+    tracer.tag(skill=intent)
+    with tracer.span("skill"):
+        skills.run(intent, command)
+
+@skills.handler('play')
+def play(command):
+    song = command.replace('play', '').strip()
+    if song:
+        speak(f"Playing {song}")
+        import pywhatkit
+        pywhatkit.playonyt(song)
+
+@skills.handler('greeting')
+def greet(command):
+    greetings = ["Hello sir!", "Hi there!", "Hey, how can I help?"]
+    speak(greetings[datetime.datetime.now().second % len(greetings)])
+
+@skills.handler('name')
+def say_name(command):
+    speak('I am Friday, your personal assistant!')
+
+@skills.handler('time')
+def tell_time(command):
+    import pytz
+    tz = pytz.timezone('Asia/Kolkata')
+    current_time = datetime.datetime.now(tz).strftime('%I:%M %p')
+    speak(f"Current time is {current_time}")
+
+@skills.handler('date')
+def tell_date(command):
+    today = datetime.datetime.now().strftime('%B %d, %Y')
+    speak(f"Today is {today}")
+
+@skills.handler('wikipedia')
+def search_wikipedia(command):
+    query = command.replace('wikipedia', '').replace('who is', '').replace('what is', '').strip()
+    if query:
         try:
-            location = requests.get('https://ipinfo.io').json()
-            city = location.get('city', 'Unknown')
-            region = location.get('region', 'Unknown')
-            speak(f"You're in {city}, {region}")
+            summary = http.run("wikipedia", wikipedia_summary, query)
+            speak(summary)
         except:
-            speak("Couldn't determine your current location")
-    
-    elif any(word in command for word in ['open', 'launch']):
-        app = command.replace('open', '').replace('launch', '').strip()
-        if 'chrome' in app:
-            webbrowser.open('https://google.com')
-            speak("Opening Chrome")
-        elif 'youtube' in app:
-            webbrowser.open('https://youtube.com')
-            speak("Opening YouTube")
-        elif 'notepad' in app:
-            os.startfile('notepad.exe')  # Windows
-            speak("Opening Notepad")
-    
-    elif any(word in command for word in ['volume', 'brightness', 'screenshot', 'battery']):
-        system_control(command)
-    
-    elif any(word in command for word in ['exit', 'quit', 'goodbye']):
-        speak("Goodbye! Have a great day!")
-        exit()
-    
-    else:
-        handle_conversation(command)
+            speak(f"Sorry, I couldn't find information about {query}")
+
+@skills.handler('joke')
+def tell_joke(command):
+    import pyjokes
+    speak(pyjokes.get_joke())
+
+@skills.handler('weather')
+def weather(command):
+    city = command.replace('weather', '').replace('in', '').strip()
+    get_weather(city if city != "" else None)
+
+@skills.handler('location')
+def tell_location(command):
+    try:
+        location = http.location()
+        city = location.get('city', 'Unknown')
+        region = location.get('region', 'Unknown')
+        speak(f"You're in {city}, {region}")
+    except:
+        speak("Couldn't determine your current location")
+
+@skills.handler('open')
+def open_app(command):
+    app = command.replace('open', '').replace('launch', '').strip()
+    if 'chrome' in app:
+        webbrowser.open('https://google.com')
+        speak("Opening Chrome")
+    elif 'youtube' in app:
+        webbrowser.open('https://youtube.com')
+        speak("Opening YouTube")
+    elif 'notepad' in app:
+        os.startfile('notepad.exe')  # Windows
+        speak("Opening Notepad")
+
+@skills.handler('exit')
+def goodbye(command):
+    speak("Goodbye! Have a great day!")
+    exit()
 
-def main():
+def main(argv=None):
     """Main application loop"""
-    # Start reminder thread
-    reminder_thread = threading.Thread(target=handle_reminders, daemon=True)
-    reminder_thread.start()
+    global speaker, speech_recognizer, tracer
+
+    parser = argparse.ArgumentParser(description="Friday voice assistant")
+    parser.add_argument("--wav", nargs="+", metavar="FILE", help="feed these audio files instead of the microphone")
+    parser.add_argument("--realtime", action="store_true", help="pace --wav files at their real duration")
+    parser.add_argument("--text", action="store_true", help="type commands instead of speaking them")
+    parser.add_argument("--recalibrate", type=float, default=120.0,
+                        help="seconds between ambient-noise recalibrations (done only while quiet)")
+    parser.add_argument("--no-barge-in", action="store_true",
+                        help="don't let a new utterance interrupt Friday while she speaks")
+    parser.add_argument("--recognizer", choices=["auto", "google", "vosk"], default="auto",
+                        help="speech engine: local Vosk (offline, streaming), Google, or Vosk when a model is set")
+    parser.add_argument("--vosk-model", help="unpacked Vosk model directory (default $VOSK_MODEL)")
+    parser.add_argument("--no-early", action="store_true",
+                        help="always wait for the end of the utterance before acting")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="append per-turn stage timings to FILE as JSON lines (see trace_summary.py)")
+    parser.add_argument("--profile", choices=["cprofile", "sample"],
+                        help="profile commands with cProfile, or sample all threads' stacks")
+    parser.add_argument("--profile-out", help="profile output (default friday.prof / friday.stacks)")
+    parser.add_argument("--plugin", action="append", default=[], metavar="MODULE",
+                        help="load extra skills from MODULE (repeatable; also $FRIDAY_PLUGINS, comma-separated)")
+    cassettes = parser.add_mutually_exclusive_group()
+    cassettes.add_argument("--record", metavar="CASSETTE",
+                           help="save every backend answer (APIs, translation, recognition, speech) "
+                                "with its latency to this JSON file")
+    cassettes.add_argument("--replay", metavar="CASSETTE",
+                           help="answer from a recorded cassette: no network, keys, microphone or TTS needed")
+    parser.add_argument("--replay-speed", type=float, default=1.0,
+                        help="scale recorded latencies when replaying (0 = no waiting)")
+    args = parser.parse_args(argv)
+
+    plugins = args.plugin + [name for name in os.getenv("FRIDAY_PLUGINS", "").split(",") if name.strip()]
+    for name in skills.load_plugins([name.strip() for name in plugins], speak=speak):
+        print(f"Loaded skills from {name}")
+
+    profiler = None
+    if args.profile == "cprofile":
+        profiler = CProfiler(args.profile_out or "friday.prof")
+    elif args.profile == "sample":
+        profiler = SamplingProfiler(args.profile_out or "friday.stacks")
+    tracer = Tracer(args.trace, profiler)
+
+    if args.text:
+        source, recognize = TextSource(), recognize_text
+    else:
+        if not args.replay:
+            speech_recognizer = create_recognizer(args.recognizer, args.vosk_model)
+        if args.wav:
+            source, recognize = WavSource(args.wav, realtime=args.realtime), recognize_speech
+        else:
+            source, recognize = MicrophoneSource(recalibrate_every=args.recalibrate, tracer=tracer), recognize_speech
+
+    if args.record or args.replay:
+        cassette = Cassette(args.record or args.replay, "record" if args.record else "replay", args.replay_speed)
+        use_cassette(cassette)
+        if cassette.recording:
+            atexit.register(cassette.save)
+
+    speaker = Speaker(say_now, None if args.replay else lambda: tts_engine().stop(), tracer=tracer).start()
+    if not args.text and speech_recognizer.streaming:
+        # Words arrive while the user speaks; simple commands can run before they finish
+        early = None if args.no_early else EarlyRouter(classify_command)
+        pipeline = StreamingVoicePipeline(source, speech_recognizer.stream, process_command, speaker,
+                                          early=early, barge_in=not args.no_barge_in, tracer=tracer)
+    else:
+        pipeline = VoicePipeline(source, recognize, process_command, speaker, barge_in=not args.no_barge_in,
+                                 tracer=tracer)
+
+    # Start reminder thread; it sleeps until the next reminder is due
+    reminder_scheduler().start()
+    # Look up the location while Friday greets, so weather and location answer at once
+    http.prefetch_location()
     
     speak("Friday activated. How can I help you today?", "en")
-    
-    while True:
-        command = recognize_speech()
-        process_command(command)
-        time.sleep(1)
+    try:
+        pipeline.run()
+    finally:
+        print(http.stats.summary())
+        tracer.close()
 
 if __name__ == "__main__":
     try:
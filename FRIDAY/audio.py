@@ -0,0 +1,418 @@
+import collections
+import queue
+import threading
+import time
+
+from tracing import Tracer
+
+_STOP = object()
+
+# Spoken on their own, these cut the current speech off instead of running a command
+STOP_WORDS = {"stop", "friday stop", "quiet", "be quiet", "shut up", "cancel"}
+
+
+def audio_duration(audio):
+    """Seconds of sound in a speech_recognition AudioData"""
+    return len(audio.frame_data) / (audio.sample_rate * audio.sample_width)
+
+
+class MicrophoneSource:
+    """Continuous microphone capture
+
+    The microphone stays open for the whole session. Ambient noise is
+    calibrated once at start and refreshed every recalibrate_every seconds,
+    but only right after a quiet listen timed out, so a recalibration never
+    eats the start of an utterance.
+    """
+
+    def __init__(self, recognizer=None, calibrate_duration=0.8, recalibrate_every=120.0,
+                 recalibrate_duration=0.3, listen_timeout=1.0, phrase_time_limit=15, tracer=None):
+        self.recognizer = recognizer
+        self.tracer = tracer or Tracer()
+        self.calibrate_duration = calibrate_duration
+        self.recalibrate_every = recalibrate_every
+        self.recalibrate_duration = recalibrate_duration
+        self.listen_timeout = listen_timeout
+        self.phrase_time_limit = phrase_time_limit
+        self.calibrations = 0
+
+    def utterances(self, stop):
+        """Yield one AudioData per utterance until stop is set"""
+        import speech_recognition as sr
+
+        recognizer = self.recognizer or sr.Recognizer()
+        with sr.Microphone() as source:
+            print("Calibrating microphone...")
+            with self.tracer.span("calibrate"):
+                recognizer.adjust_for_ambient_noise(source, duration=self.calibrate_duration)
+            self.calibrations += 1
+            calibrated = time.monotonic()
+            print("Listening...")
+            while not stop.is_set():
+                try:
+                    audio = recognizer.listen(source, timeout=self.listen_timeout,
+                                              phrase_time_limit=self.phrase_time_limit)
+                except sr.WaitTimeoutError:
+                    if time.monotonic() - calibrated >= self.recalibrate_every:
+                        with self.tracer.span("calibrate"):
+                            recognizer.adjust_for_ambient_noise(source, duration=self.recalibrate_duration)
+                        self.calibrations += 1
+                        calibrated = time.monotonic()
+                    continue
+                yield audio
+
+    def chunk_streams(self, stop, sample_rate=16000, chunk_seconds=0.1):
+        """One endless stream of 16-bit mono PCM chunks, for streaming recognizers"""
+        import speech_recognition as sr
+
+        def chunks(source):
+            frames = int(source.SAMPLE_RATE * chunk_seconds)
+            while not stop.is_set():
+                data = source.stream.read(frames)
+                yield sr.AudioData(data, source.SAMPLE_RATE, source.SAMPLE_WIDTH).get_raw_data(
+                    convert_rate=sample_rate, convert_width=2)
+
+        with sr.Microphone() as source:
+            print("Listening...")
+            yield chunks(source)
+
+
+class WavSource:
+    """Utterances read from WAV/AIFF/FLAC files, one file per utterance
+
+    With realtime=True each file takes as long as its audio to "arrive",
+    like live capture; otherwise files are fed as fast as they are read.
+    """
+
+    def __init__(self, paths, realtime=False, gap=0.0):
+        self.paths = list(paths)
+        self.realtime = realtime
+        self.gap = gap
+
+    def utterances(self, stop):
+        import speech_recognition as sr
+
+        recognizer = sr.Recognizer()
+        for path in self.paths:
+            if stop.is_set():
+                return
+            with sr.AudioFile(path) as source:
+                audio = recognizer.record(source)
+            if self.realtime:
+                time.sleep(audio_duration(audio))
+            yield audio
+            if self.gap:
+                time.sleep(self.gap)
+
+    def chunk_streams(self, stop, sample_rate=16000, chunk_seconds=0.1):
+        """One stream of 16-bit mono PCM chunks per file, for streaming recognizers"""
+        from recognizers import pcm_chunks
+
+        def paced(chunks):
+            for chunk in chunks:
+                if self.realtime:
+                    time.sleep(chunk_seconds)
+                yield chunk
+
+        for audio in WavSource(self.paths, gap=self.gap).utterances(stop):
+            yield paced(pcm_chunks(audio, sample_rate, chunk_seconds))
+
+
+class TextSource:
+    """Typed or scripted utterances, for running without a microphone
+
+    Pair it with a recognize function that returns its input unchanged.
+    """
+
+    def __init__(self, lines=None, prompt="You: "):
+        self.lines = lines
+        self.prompt = prompt
+
+    def utterances(self, stop):
+        if self.lines is not None:
+            for line in self.lines:
+                if stop.is_set():
+                    return
+                yield line
+            return
+        while not stop.is_set():
+            try:
+                yield input(self.prompt)
+            except EOFError:
+                return
+
+
+class Speaker:
+    """Text to speech on its own thread
+
+    say() queues a line and returns at once; lines are spoken in order.
+    interrupt() drops everything queued and stops the line being spoken
+    (barge-in). speak_fn(text) must block until text is spoken; stop_fn()
+    is called from another thread to cut it short. Each line is timed as
+    the "tts" stage of the turn that queued it, when tracing.
+    """
+
+    def __init__(self, speak_fn, stop_fn=None, tracer=None):
+        self.speak_fn = speak_fn
+        self.stop_fn = stop_fn
+        self.tracer = tracer or Tracer()
+        self.lines = queue.Queue()
+        self.speaking = threading.Event()
+        self.idle = threading.Event()
+        self.idle.set()
+        self.interrupted = 0
+        self.spoken = 0
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="speaker", daemon=True)
+        self._thread.start()
+        return self
+
+    def say(self, text):
+        turn = self.tracer.current()
+        if turn is not None:
+            turn.hold()  # the turn isn't written until this line is spoken or dropped
+        self.idle.clear()
+        self.lines.put((text, turn))
+
+    def interrupt(self):
+        dropped = 0
+        while True:
+            try:
+                line = self.lines.get_nowait()
+                if line is _STOP:
+                    self.lines.put(_STOP)
+                    break
+                self.tracer.finish(line[1])
+                dropped += 1
+            except queue.Empty:
+                break
+        if self.speaking.is_set() and self.stop_fn:
+            self.stop_fn()
+            dropped += 1
+        if dropped:
+            self.interrupted += 1
+        if self.lines.empty() and not self.speaking.is_set():
+            self.idle.set()
+
+    def wait_idle(self, timeout=None):
+        return self.idle.wait(timeout)
+
+    def close(self):
+        self.lines.put(_STOP)
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            line = self.lines.get()
+            if line is _STOP:
+                self.idle.set()
+                return
+            text, turn = line
+            self.speaking.set()
+            try:
+                with self.tracer.span("tts", turn):
+                    self.speak_fn(text)
+                self.spoken += 1
+            except Exception as e:
+                print(f"Speech error: {e}")
+            finally:
+                self.speaking.clear()
+                self.tracer.finish(turn)
+            if self.lines.empty():
+                self.idle.set()
+
+
+class VoicePipeline:
+    """Capture -> recognition -> command execution, each on its own thread
+
+    The capture thread keeps listening while commands run and while the
+    Speaker talks. With barge_in on, an utterance that recognizes as words
+    while Friday speaks interrupts her; noise, or her own voice picked up
+    by the microphone, that recognizes as nothing does not. recognize(audio) returns text ("" or None to ignore);
+    handle(text) runs the command and may raise SystemExit to end the
+    session. At most max_pending utterances wait for recognition; older
+    ones are dropped rather than stalling the microphone. With an enabled
+    tracer every utterance becomes a traced turn, active on the executor
+    thread while its command runs.
+    """
+
+    def __init__(self, source, recognize, handle, speaker, barge_in=True, max_pending=4, tracer=None):
+        self.source = source
+        self.recognize = recognize
+        self.handle = handle
+        self.speaker = speaker
+        self.barge_in = barge_in
+        self.audio = queue.Queue(maxsize=max_pending)
+        self.commands = queue.Queue()
+        self.stopped = threading.Event()
+        self.stats = collections.Counter()
+        self.timings = []  # (recognition seconds, command seconds) per handled utterance
+        self.tracer = tracer or Tracer()
+        self._threads = []
+
+    def _stages(self):
+        return (("capture", self._capture), ("recognition", self._recognition), ("executor", self._executor))
+
+    def start(self):
+        for name, target in self._stages():
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        self.stopped.set()
+
+    def run(self):
+        """Start the threads and block until the session ends"""
+        self.start()
+        try:
+            while not self.stopped.wait(0.2):
+                pass
+        except KeyboardInterrupt:
+            self.stop()
+            raise
+        finally:
+            self.speaker.interrupt()
+
+    def _capture(self):
+        try:
+            for audio in self.source.utterances(self.stopped):
+                captured = time.perf_counter()
+                self.stats["utterances"] += 1
+                turn = self.tracer.start_turn()
+                if turn is not None and hasattr(audio, "frame_data"):
+                    turn.add("listen", audio_duration(audio))
+                try:
+                    self.audio.put_nowait((audio, captured, turn))
+                except queue.Full:
+                    self.tracer.finish(self.audio.get_nowait()[2], outcome="dropped")
+                    self.audio.put_nowait((audio, captured, turn))
+                    self.stats["dropped"] += 1
+        except Exception as e:
+            print(f"Capture error: {e}")
+        self.audio.put((_STOP, None, None))
+
+    def _recognition(self):
+        while True:
+            audio, captured, turn = self.audio.get()
+            if audio is _STOP:
+                self.commands.put((_STOP, None, None, None))
+                return
+            start = time.perf_counter()
+            if turn is not None:
+                turn.add("queue", start - captured)
+            try:
+                with self.tracer.span("recognition", turn):
+                    text = self.recognize(audio)
+            except Exception as e:
+                print(f"Recognition error: {e}")
+                self.tracer.finish(turn, outcome="error")
+                continue
+            if not text:
+                self.stats["unrecognized"] += 1
+                self.tracer.finish(turn, outcome="unrecognized")
+                continue
+            if text.strip().lower() in STOP_WORDS:
+                self.speaker.interrupt()
+                self.stats["stop_words"] += 1
+                self.tracer.finish(turn, outcome="stop")
+                continue
+            if self.barge_in and self.speaker.speaking.is_set():
+                self.speaker.interrupt()
+                self.stats["barge_ins"] += 1
+            self.commands.put((text, captured, time.perf_counter() - start, turn))
+
+    def _executor(self):
+        while True:
+            text, captured, recognition, turn = self.commands.get()
+            if text is _STOP:
+                # Source exhausted: let queued speech finish, then end the session
+                self.speaker.wait_idle()
+                self.stop()
+                return
+            start = time.perf_counter()
+            if turn is not None:
+                turn.tags["text"] = text
+            try:
+                with self.tracer.activate(turn), self.tracer.span("command", turn):
+                    self.handle(text)
+            except SystemExit:
+                self.tracer.finish(turn, outcome="exit")
+                self.speaker.wait_idle()
+                self.stop()
+                return
+            except Exception as e:
+                print(f"Command error: {e}")
+            self.timings.append((recognition, time.perf_counter() - start))
+            self.stats["commands"] += 1
+            self.tracer.finish(turn, outcome="handled")
+
+
+class StreamingVoicePipeline(VoicePipeline):
+    """VoicePipeline for streaming recognizers that emit partial hypotheses
+
+    Capture and recognition share one thread: PCM chunks go straight into
+    stream(chunks), which yields Hypothesis(text, final). The first partial
+    with words in it heard while Friday speaks is the barge-in, long before
+    the utterance ends. With an EarlyRouter, a settled partial that routes to an
+    argument-free command is run at once; its final text is then skipped
+    unless it routes somewhere else.
+    """
+
+    def __init__(self, source, stream, handle, speaker, early=None, barge_in=True, tracer=None):
+        super().__init__(source, None, handle, speaker, barge_in=barge_in, tracer=tracer)
+        self.stream = stream
+        self.early = early
+
+    def _stages(self):
+        return (("capture", self._capture), ("executor", self._executor))
+
+    def _capture(self):
+        try:
+            for chunks in self.source.chunk_streams(self.stopped):
+                started = None
+                barged = False
+                for hypothesis in self.stream(chunks):
+                    now = time.perf_counter()
+                    text = hypothesis.text.strip().lower()
+                    if started is None:
+                        started = now
+                        self.stats["utterances"] += 1
+                    if text and not barged and self.barge_in and self.speaker.speaking.is_set():
+                        self.speaker.interrupt()
+                        self.stats["barge_ins"] += 1
+                        barged = True
+                    if text in STOP_WORDS:
+                        if hypothesis.final:
+                            self.speaker.interrupt()
+                            self.stats["stop_words"] += 1
+                            started, barged = None, False
+                        continue
+                    if not hypothesis.final:
+                        if self.early and self.early.partial(text):
+                            self.stats["early_routes"] += 1
+                            self.commands.put((text, now, now - started, self._turn(now - started, early=True)))
+                        continue
+                    if not text:
+                        # Noise the recognizer heard no words in, as in _recognition
+                        self.stats["unrecognized"] += 1
+                    elif self.early is None or self.early.final(text):
+                        self.commands.put((text, now, now - started, self._turn(now - started)))
+                    started, barged = None, False
+                if self.early:
+                    self.early.reset()
+        except Exception as e:
+            print(f"Capture error: {e}")
+        self.commands.put((_STOP, None, None, None))
+
+    def _turn(self, recognition, **tags):
+        """A traced turn whose speech and recognition overlapped for recognition seconds"""
+        turn = self.tracer.start_turn()
+        if turn is not None:
+            turn.add("recognition", recognition)
+            turn.tags.update(tags)
+        return turn
@@ -0,0 +1,99 @@
+import argparse
+import csv
+import math
+import os
+import time
+
+from calculator import compile_expression, evaluate
+
+CASES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "spoken_math.csv")
+
+
+def legacy_local(command):
+    """The previous fallback parser: split on the first operator it finds"""
+    if '+' in command:
+        parts = command.split('+')
+        return sum(float(p) for p in parts)
+    elif '-' in command:
+        parts = command.split('-')
+        return float(parts[0]) - float(parts[1])
+    elif '×' in command or '*' in command:
+        parts = command.split('×') if '×' in command else command.split('*')
+        return float(parts[0]) * float(parts[1])
+    elif '÷' in command or '/' in command:
+        parts = command.split('÷') if '÷' in command else command.split('/')
+        return float(parts[0]) / float(parts[1])
+    elif 'sqrt' in command:
+        return math.sqrt(float(command.split('sqrt')[1]))
+    elif '^' in command:
+        base, exp = command.split('^')
+        return math.pow(float(base), float(exp))
+    raise ValueError("no operator")
+
+
+def load_cases(path=CASES_FILE):
+    """(text, expected value or None when only Wolfram can answer it)"""
+    with open(path, newline="", encoding="utf-8") as f:
+        return [(row["text"], float(row["expected"]) if row["expected"] else None) for row in csv.DictReader(f)]
+
+
+def score(fn, cases):
+    """Correct answers, and expressions wrongly answered instead of handed on"""
+    correct = wrong = 0
+    for text, expected in cases:
+        try:
+            value = fn(text)
+        except Exception:
+            continue
+        if expected is not None and math.isclose(value, expected, rel_tol=1e-9):
+            correct += 1
+        else:
+            wrong += 1
+    return correct, wrong
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="calculate(): Wolfram-first vs local evaluation")
+    parser.add_argument("--cases", default=CASES_FILE)
+    parser.add_argument("--wolfram", type=float, default=0.6, help="Wolfram Alpha round-trip (s)")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    cases = load_cases(args.cases)
+    local = sum(expected is not None for _, expected in cases)
+    print(f"{len(cases)} spoken calculations, {local} plain arithmetic")
+    for name, fn in (("old fallback parser", legacy_local), ("local evaluator", evaluate)):
+        correct, wrong = score(fn, cases)
+        print(f"  {name:<20} right {correct:2d}/{local}  wrong answers {wrong}")
+
+    texts = [text for text, _ in cases]
+    for label, clear in (("cold", True), ("cached", False)):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            if clear:
+                compile_expression.cache_clear()
+            for text in texts:
+                try:
+                    evaluate(text)
+                except (ValueError, ArithmeticError):
+                    pass
+        per_query = (time.perf_counter() - start) / (args.repeat * len(texts))
+        print(f"  local evaluation, {label:<6} {per_query * 1e6:8.1f} us/query")
+
+    # The old path always waited for Wolfram; now only expressions the evaluator rejects do
+    handed_on = 0
+    for text in texts:
+        try:
+            evaluate(text)
+        except ValueError:
+            handed_on += 1
+        except ArithmeticError:
+            pass
+    old = args.wolfram * 1000
+    new = handed_on * args.wolfram * 1000 / len(texts)
+    print(f"  mean calculate() latency: Wolfram-first {old:6.0f} ms, local-first {new:6.0f} ms "
+          f"({handed_on} of {len(texts)} still go to Wolfram)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from http_client import HttpClient
+from stats import percentile
+
+# What the mocked services answer
+IPINFO = {"ip": "203.0.113.7", "city": "Mumbai", "region": "Maharashtra", "loc": "19.07,72.88"}
+WEATHER = {"cod": 200, "main": {"temp": 31.2, "humidity": 70}, "weather": [{"description": "haze"}],
+           "wind": {"speed": 3.1}}
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    """ipinfo.io and OpenWeatherMap stand-ins with keep-alive
+
+    connect_delay is paid once per new connection, like a TLS handshake;
+    request_delay on every request.
+    """
+
+    protocol_version = "HTTP/1.1"
+    wbufsize = -1  # send headers and body in one write, avoiding Nagle/delayed-ACK stalls
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+        time.sleep(self.server.connect_delay)
+
+    def do_GET(self):
+        time.sleep(self.server.request_delay)
+        self.server.requests += 1
+        body = json.dumps(IPINFO if self.path.startswith("/json") else WEATHER).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server(connect_delay, request_delay):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockHandler)
+    server.daemon_threads = True
+    server.connect_delay, server.request_delay = connect_delay, request_delay
+    server.connections = server.requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def old_turn(base, skill):
+    """The old skills: a fresh connection per call, ipinfo.io on every lookup"""
+    import requests
+
+    location = requests.get(f"{base}/json").json()
+    if skill == "weather":
+        requests.get(f"{base}/data/2.5/weather", params={"q": location["city"]}).json()
+
+
+def pooled_turn(client, base, skill):
+    location = client.location()
+    if skill == "weather":
+        client.get_json(f"{base}/data/2.5/weather", "weather", params={"q": location["city"]})
+
+
+def run(server, turns, fn):
+    server.connections = server.requests = 0
+    latencies = []
+    for i in range(turns):
+        start = time.perf_counter()
+        fn("weather" if i % 2 == 0 else "location")
+        latencies.append(time.perf_counter() - start)
+    return latencies, server.connections, server.requests
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Web skill latency against a local mock HTTP server")
+    parser.add_argument("--turns", type=int, default=20, help="alternating weather and location commands")
+    parser.add_argument("--connect-delay", type=float, default=0.05, help="per-connection setup cost (s)")
+    parser.add_argument("--request-delay", type=float, default=0.03, help="per-request server time (s)")
+    args = parser.parse_args(argv)
+
+    server = start_server(args.connect_delay, args.request_delay)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    client = HttpClient(ipinfo_url=f"{base}/json")
+
+    runs = [("old (new connection per call)", run(server, args.turns, lambda skill: old_turn(base, skill)))]
+    runs.append(("pooled + cached location", run(server, args.turns, lambda skill: pooled_turn(client, base, skill))))
+
+    client = HttpClient(ipinfo_url=f"{base}/json")
+    client.prefetch_location().result()
+    runs.append(("pooled + prefetched location",
+                 run(server, args.turns, lambda skill: pooled_turn(client, base, skill))))
+
+    print(f"{args.turns} commands, alternating weather and location")
+    for name, (latencies, connections, requests) in runs:
+        latencies.sort()
+        mean = sum(latencies) / len(latencies) * 1000
+        p95 = percentile(latencies, 95) * 1000
+        print(f"  {name:<30} mean {mean:6.1f} ms  p95 {p95:6.1f} ms  "
+              f"connections {connections:3d}  requests {requests:3d}")
+    print(client.stats.summary())
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
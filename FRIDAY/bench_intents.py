@@ -0,0 +1,71 @@
+import argparse
+import csv
+import os
+import time
+
+from intents import classify_command
+
+CASES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "command_intents.csv")
+
+# The previous if/elif chain of substring checks, first match wins
+LEGACY_CHAIN = [
+    ("play", ['play', 'song', 'music']),
+    ("greeting", ['hi', 'hello', 'hey']),
+    ("name", ['your name']),
+    ("time", ['time']),
+    ("date", ['date']),
+    ("wikipedia", ['who is', 'what is', 'wikipedia']),
+    ("joke", ['joke']),
+    ("calculate", ['calculate', 'math', 'solve']),
+    ("weather", ['weather', 'temperature']),
+    ("reminder", ['remind', 'reminder']),
+    ("location", ['location', 'where am i']),
+    ("open", ['open', 'launch']),
+    ("system", ['volume', 'brightness', 'screenshot', 'battery']),
+    ("exit", ['exit', 'quit', 'goodbye']),
+]
+
+
+def legacy_route(command):
+    for intent, words in LEGACY_CHAIN:
+        if any(word in command for word in words):
+            return intent
+    return "conversation"
+
+
+def load_cases(path=CASES_FILE):
+    with open(path, newline="", encoding="utf-8") as f:
+        return [(row["text"], row["label"]) for row in csv.DictReader(f)]
+
+
+def time_per_query(fn, queries, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for q in queries:
+            fn(q)
+    return (time.perf_counter() - start) / (repeat * len(queries))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Routing accuracy and speed of FRIDAY's command intents")
+    parser.add_argument("--cases", default=CASES_FILE, help="CSV with text,label columns")
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    cases = load_cases(args.cases)
+    queries = [text for text, _ in cases]
+    legacy = sum(legacy_route(t) == label for t, label in cases)
+    router = sum(classify_command(t).name == label for t, label in cases)
+    print(f"{len(cases)} labeled commands")
+    print(f"routing accuracy: legacy chain {legacy / len(cases):.1%}, router {router / len(cases):.1%}")
+    for text, label in cases:
+        result = classify_command(text)
+        if result.name != label:
+            print(f"  miss: {text!r} -> {result.name} ({result.confidence:.2f}), expected {label}")
+
+    print(f"legacy chain: {time_per_query(legacy_route, queries, args.repeat) * 1e6:.2f} µs/command, "
+          f"router: {time_per_query(classify_command, queries, args.repeat) * 1e6:.2f} µs/command")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import argparse
+import time
+
+from audio import Speaker, TextSource, VoicePipeline
+
+# Simulated stage latencies in seconds, roughly what a real session shows
+CALIBRATE = 0.8  # adjust_for_ambient_noise per utterance in the old loop
+LOOP_SLEEP = 1.0  # fixed sleep at the end of the old loop
+
+
+class PacedSource(TextSource):
+    """Scripted utterances that each take utterance seconds to speak"""
+
+    def __init__(self, lines, utterance):
+        super().__init__(lines)
+        self.utterance = utterance
+        self.captured = []
+
+    def utterances(self, stop):
+        for line in super().utterances(stop):
+            time.sleep(self.utterance)
+            self.captured.append(time.perf_counter())
+            yield line
+
+
+def run_sequential(n, utterance, recognize, command, tts):
+    """The old main loop: calibrate, listen, recognize, run, speak, sleep"""
+    start = time.perf_counter()
+    deaf = 0.0
+    latencies = []
+    for _ in range(n):
+        time.sleep(CALIBRATE)
+        time.sleep(utterance)
+        heard = time.perf_counter()
+        time.sleep(recognize)
+        time.sleep(command)
+        latencies.append(time.perf_counter() - heard)
+        time.sleep(tts)
+        time.sleep(LOOP_SLEEP)
+        deaf += time.perf_counter() - heard + CALIBRATE
+    return time.perf_counter() - start, latencies, deaf
+
+
+def run_pipelined(n, utterance, recognize, command, tts):
+    source = PacedSource([f"command {i}" for i in range(n)], utterance)
+    replies = []
+
+    def speak(text):
+        replies.append(time.perf_counter())
+        time.sleep(tts)
+
+    def handle(text):
+        time.sleep(command)
+        speaker.say(f"reply to {text}")
+
+    def recognize_fn(text):
+        time.sleep(recognize)
+        return text
+
+    speaker = Speaker(speak).start()
+    pipeline = VoicePipeline(source, recognize_fn, handle, speaker, barge_in=False, max_pending=n)
+    start = time.perf_counter()
+    pipeline.run()
+    elapsed = time.perf_counter() - start
+    speaker.close()
+    return elapsed, [r - c for c, r in zip(source.captured, replies)], 0.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Old sequential loop vs the threaded voice pipeline")
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--utterance", type=float, default=1.5, help="seconds the user speaks per command")
+    parser.add_argument("--recognize", type=float, default=0.5, help="recognition latency (s)")
+    parser.add_argument("--command", type=float, default=0.2, help="command execution time (s)")
+    parser.add_argument("--tts", type=float, default=1.2, help="time to speak a reply (s)")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every latency (e.g. 0.1 for a quick run)")
+    args = parser.parse_args(argv)
+
+    global CALIBRATE, LOOP_SLEEP
+    CALIBRATE *= args.scale
+    LOOP_SLEEP *= args.scale
+    timings = [t * args.scale for t in (args.utterance, args.recognize, args.command, args.tts)]
+
+    print(f"{args.turns} spoken commands, back to back")
+    for name, run in (("sequential", run_sequential), ("pipelined", run_pipelined)):
+        elapsed, latencies, deaf = run(args.turns, *timings)
+        mean = sum(latencies) / len(latencies) * 1000 if latencies else 0.0
+        print(f"  {name:<10} total {elapsed:6.2f}s  reply starts {mean:6.0f} ms after the user stops  "
+              f"mic deaf {deaf:5.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import argparse
+import glob
+import os
+import time
+
+from intents import classify_command
+from recognizers import CHUNK_SECONDS, EarlyRouter, GoogleRecognizer, VoskRecognizer, pcm_chunks
+from stats import percentile
+
+
+def load_fixtures(directory):
+    """(name, AudioData, expected text or None) for every WAV in directory
+
+    A transcript may sit next to each file as <name>.txt; it is used to
+    check that the recognized command routes to the expected intent.
+    """
+    import speech_recognition as sr
+
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.wav"))):
+        with sr.AudioFile(path) as source:
+            audio = sr.Recognizer().record(source)
+        transcript = os.path.splitext(path)[0] + ".txt"
+        expected = None
+        if os.path.exists(transcript):
+            with open(transcript, encoding="utf-8") as f:
+                expected = f.read().strip().lower()
+        fixtures.append((os.path.basename(path), audio, expected))
+    return fixtures
+
+
+def run_batch(recognizer, audio):
+    """Whole-utterance recognition: nothing happens until the user stops"""
+    start = time.perf_counter()
+    text = recognizer.recognize(audio)
+    return {"text": text.lower(), "final_after_end": time.perf_counter() - start, "early_at": None}
+
+
+def run_streaming(recognizer, audio, realtime=False):
+    """Feed chunks as they would arrive from the microphone
+
+    Without realtime the chunks go in as fast as the engine takes them;
+    the engine keeps up with speech when compute stays under the audio
+    duration, and what the user waits for is the work left after the
+    last chunk. early_at is the audio position (s) of an early route.
+    """
+    chunks = pcm_chunks(audio)
+    router = EarlyRouter(classify_command)
+    result = {"text": "", "early_at": None, "compute": 0.0}
+    fed = 0
+    last_fed = None
+
+    def source():
+        nonlocal fed, last_fed
+        for chunk in chunks:
+            if realtime:
+                time.sleep(CHUNK_SECONDS)
+            fed += 1
+            last_fed = time.perf_counter()
+            yield chunk
+
+    start = time.perf_counter()
+    for hypothesis in recognizer.stream(source()):
+        text = hypothesis.text.strip().lower()
+        if hypothesis.final:
+            result["text"] = f"{result['text']} {text}".strip()
+        elif result["early_at"] is None and router.partial(text):
+            result["early_at"] = fed * CHUNK_SECONDS
+    end = time.perf_counter()
+    result["final_after_end"] = end - last_fed if last_fed else 0.0
+    result["compute"] = end - start
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recognition latency over a directory of WAV utterances")
+    parser.add_argument("wav_dir", help="directory of WAV files, optionally with <name>.txt transcripts")
+    parser.add_argument("--vosk-model", default=os.getenv("VOSK_MODEL"), help="unpacked Vosk model directory")
+    parser.add_argument("--google", action="store_true", help="also time Google recognition (needs the network)")
+    parser.add_argument("--realtime", action="store_true", help="pace streamed chunks at speaking speed")
+    args = parser.parse_args(argv)
+
+    fixtures = load_fixtures(args.wav_dir)
+    if not fixtures:
+        parser.error(f"no .wav files in {args.wav_dir}")
+
+    engines = []
+    if args.vosk_model:
+        vosk = VoskRecognizer(args.vosk_model)
+        engines.append(("vosk", lambda audio: run_streaming(vosk, audio, args.realtime)))
+    if args.google:
+        google = GoogleRecognizer()
+        engines.append(("google", lambda audio: run_batch(google, audio)))
+    if not engines:
+        parser.error("pass --vosk-model (or set VOSK_MODEL) and/or --google")
+
+    speech = sum(len(audio.frame_data) / (audio.sample_rate * audio.sample_width) for _, audio, _ in fixtures)
+    print(f"{len(fixtures)} utterances, {speech:.1f}s of speech")
+    for name, run in engines:
+        waits, early, correct, labeled, failed = [], [], 0, 0, 0
+        for fixture, audio, expected in fixtures:
+            try:
+                result = run(audio)
+            except Exception as e:
+                print(f"  {name}: {fixture} failed: {e}")
+                failed += 1
+                continue
+            waits.append(result["final_after_end"])
+            duration = len(audio.frame_data) / (audio.sample_rate * audio.sample_width)
+            if result["early_at"] is not None:
+                early.append(duration - result["early_at"])
+            if expected is not None:
+                labeled += 1
+                correct += classify_command(result["text"]).name == classify_command(expected).name
+        if not waits:
+            continue
+        waits.sort()
+        mean = sum(waits) / len(waits) * 1000
+        p95 = percentile(waits, 95) * 1000
+        line = f"  {name:<7} final text {mean:6.0f} ms after speech ends (p95 {p95:6.0f} ms)"
+        if early:
+            line += f"  early routes {len(early)}, {sum(early) / len(early) * 1000:5.0f} ms before the end"
+        if labeled:
+            line += f"  intent {correct}/{labeled}"
+        if failed:
+            line += f"  failed {failed}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from reminders import ReminderScheduler
+from stats import percentile
+
+
+class SimulatedClock:
+    """A clock that only moves when told to"""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def run_simulated(n, horizon, seed, path=None):
+    """n reminders over horizon seconds, jumping the clock to each wake-up
+
+    Stands in for the scheduler thread: each step sleeps exactly the time
+    run_due() asks for, so lateness is whatever the heap gets wrong. With
+    a path every add, cancel and fire is persisted as in the app.
+    """
+    rng = random.Random(seed)
+    clock = SimulatedClock()
+    late = []
+    scheduler = ReminderScheduler(lambda r: late.append(clock.now - r.due), path=path, clock=clock)
+
+    start = time.perf_counter()
+    ids = [scheduler.add(f"reminder {i}", due=rng.uniform(0, horizon)) for i in range(n)]
+    added = time.perf_counter() - start
+    cancelled = sum(scheduler.cancel(i) for i in rng.sample(ids, n // 10))
+
+    start = time.perf_counter()
+    wakeups = 0
+    wait = scheduler.run_due()
+    while wait is not None:
+        clock.now += wait
+        wakeups += 1
+        wait = scheduler.run_due()
+    fired = time.perf_counter() - start
+    scheduler.close()
+    return added, cancelled, fired, wakeups, late
+
+
+def run_restart(n, horizon, seed, path):
+    """Seconds to load the log of n adds and n/10 cancels, as Friday does on start"""
+    rng = random.Random(seed)
+    scheduler = ReminderScheduler(print, path=path, clock=SimulatedClock())
+    ids = [scheduler.add(f"reminder {i}", due=rng.uniform(0, horizon)) for i in range(n)]
+    for i in rng.sample(ids, n // 10):
+        scheduler.cancel(i)
+    scheduler.close()
+    start = time.perf_counter()
+    pending = len(ReminderScheduler(print, path=path, clock=SimulatedClock()))
+    return pending, time.perf_counter() - start
+
+
+def run_polling(n, horizon, seed, interval=30.0):
+    """The old loop: scan a list every interval seconds"""
+    rng = random.Random(seed)
+    reminders = [{"message": f"reminder {i}", "time": rng.uniform(0, horizon)} for i in range(n)]
+    late = []
+    now = 0.0
+    start = time.perf_counter()
+    while reminders:
+        now += interval
+        for reminder in reminders[:]:
+            if now >= reminder["time"]:
+                late.append(now - reminder["time"])
+                reminders.remove(reminder)
+    return time.perf_counter() - start, late
+
+
+def run_threaded(n, horizon, seed):
+    """Real clock and thread: n reminders due within horizon seconds"""
+    rng = random.Random(seed)
+    late = []
+    scheduler = ReminderScheduler(lambda r: late.append(time.time() - r.due)).start()
+    for i in range(n):
+        scheduler.add(f"reminder {i}", delay=rng.uniform(0.1, horizon))
+    while len(scheduler):
+        time.sleep(0.05)
+    scheduler.close()
+    return late
+
+
+def summarize(late):
+    late = sorted(late)
+    return (f"late mean {sum(late) / len(late) * 1000:8.2f} ms  "
+            f"p99 {percentile(late, 99) * 1000:8.2f} ms  max {late[-1] * 1000:8.2f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Heap reminder scheduler vs the old 30-second polling loop")
+    parser.add_argument("--reminders", type=int, default=100_000)
+    parser.add_argument("--horizon", type=float, default=7 * 24 * 3600, help="spread reminders over this many s")
+    parser.add_argument("--poll-reminders", type=int, default=2_000,
+                        help="reminders for the polling loop (it is quadratic)")
+    parser.add_argument("--threaded", type=int, default=1_000, help="reminders for the real-clock run")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    added, cancelled, fired, wakeups, late = run_simulated(args.reminders, args.horizon, args.seed)
+    print(f"heap, simulated clock: {args.reminders} added in {added:.2f}s, {cancelled} cancelled, "
+          f"{len(late)} fired in {fired:.2f}s over {wakeups} wake-ups")
+    print(f"  {summarize(late)}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "reminders.json")
+        added, cancelled, fired, wakeups, late = run_simulated(args.reminders, args.horizon, args.seed, path)
+        print(f"heap, persisted: {args.reminders} added in {added:.2f}s, {cancelled} cancelled, "
+              f"{len(late)} fired in {fired:.2f}s")
+        os.remove(path)
+        pending, loaded = run_restart(args.reminders, args.horizon, args.seed, path)
+        print(f"  restart with {pending} pending: loaded in {loaded:.2f}s")
+
+    elapsed, late = run_polling(args.poll_reminders, args.horizon, args.seed)
+    print(f"30 s polling, simulated clock: {args.poll_reminders} reminders scanned in {elapsed:.2f}s")
+    print(f"  {summarize(late)}")
+
+    if args.threaded:
+        late = run_threaded(args.threaded, 2.0, args.seed)
+        print(f"heap, real clock and thread: {args.threaded} reminders over 2 s")
+        print(f"  {summarize(late)}")
+
+
+if __name__ == "__main__":
+    main()
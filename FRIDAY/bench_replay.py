@@ -0,0 +1,195 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import app
+from audio import Speaker, TextSource, VoicePipeline, WavSource
+from replay import Cassette
+from stats import percentile
+from trace_summary import load_records, print_table, summarize
+from tracing import Tracer
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+COMMANDS_FILE = os.path.join(FIXTURES, "session.txt")
+CASSETTE_FILE = os.path.join(FIXTURES, "session.cassette.json")
+
+# Lower is better for these, higher for turns_per_s
+METRICS = ("p50_ms", "p95_ms", "peak_kb")
+
+
+def load_commands(path=COMMANDS_FILE):
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+class PacedTracer(Tracer):
+    """Tracer that signals each time a turn is written, i.e. fully handled and spoken"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.turn_done = threading.Event()
+
+    def _write(self, record):
+        super()._write(record)
+        if record.get("type") == "turn":
+            self.turn_done.set()
+
+
+class PacedSource:
+    """Each utterance of source only once the previous turn is over, like a user waiting for the reply
+
+    Scripted sources yield everything at once, which would time every
+    turn queued behind the replies to the ones before it.
+    """
+
+    def __init__(self, source, tracer):
+        self.source = source
+        self.tracer = tracer
+
+    def utterances(self, stop):
+        for utterance in self.source.utterances(stop):
+            self.tracer.turn_done.clear()
+            yield utterance
+            while not self.tracer.turn_done.wait(0.1):
+                if stop.is_set():
+                    return
+
+
+def run_session(inputs, wav, trace_path):
+    """One session through the real pipeline, skills and speaker; seconds until it ended"""
+    tracer = PacedTracer(trace_path)
+    app.tracer = tracer
+    app.current_language = "en"
+    speaker = app.speaker = Speaker(app.say_now, tracer=tracer).start()
+    if wav:
+        source, recognize = WavSource(inputs), app.recognize_speech
+    else:
+        source, recognize = TextSource(inputs), app.recognize_text
+    pipeline = VoicePipeline(PacedSource(source, tracer), recognize, app.process_command, speaker, barge_in=False,
+                             max_pending=len(inputs), tracer=tracer)
+    start = time.perf_counter()
+    pipeline.start()
+    pipeline.stopped.wait()
+    elapsed = time.perf_counter() - start
+    speaker.close()
+    tracer.close()
+    return elapsed
+
+
+def measure(cassette, inputs, wav, repeat, speed, quiet=True):
+    output = io.StringIO() if quiet else sys.stdout
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(output):
+        elapsed = 0.0
+        traces = []
+        for i in range(repeat):
+            traces.append(os.path.join(tmp, f"run{i}.jsonl"))
+            elapsed += run_session(inputs, wav, traces[-1])
+
+        # Memory in a separate pass without waiting, so tracemalloc does not skew the timings
+        cassette.speed = 0
+        tracemalloc.start()
+        run_session(inputs, wav, os.devnull)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        cassette.speed = speed
+
+        summary = summarize(load_records(traces))
+    totals = sorted(summary["total"])
+    return summary, {"turns": len(totals), "turns_per_s": round(len(totals) / elapsed, 2),
+                     "p50_ms": round(percentile(totals, 50), 1), "p95_ms": round(percentile(totals, 95), 1),
+                     "peak_kb": round(peak / 1024, 1),
+                     "maxrss_kb": max_rss_kb()}
+
+
+def max_rss_kb():
+    """Peak resident memory of this process in KiB, or None where unavailable (Windows)"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    # ru_maxrss is KB on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def compare(result, baseline, tolerance):
+    """Lines describing each metric against baseline; the names of regressed metrics"""
+    lines, regressed = [], []
+    for name in ("turns_per_s",) + METRICS:
+        old, new = baseline.get(name), result[name]
+        if not old:
+            continue
+        change = (new - old) / old
+        worse = change < -tolerance if name == "turns_per_s" else change > tolerance
+        if worse:
+            regressed.append(name)
+        lines.append(f"  {name:<12} {old:>10} -> {new:>10} ({change:+.1%}){'  REGRESSION' if worse else ''}")
+    return lines, regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a scripted FRIDAY session from a recorded cassette")
+    parser.add_argument("--commands", default=COMMANDS_FILE, help="one typed command per line")
+    parser.add_argument("--wav", nargs="+", metavar="FILE", help="speak these audio files instead of --commands")
+    parser.add_argument("--cassette", default=CASSETTE_FILE)
+    parser.add_argument("--record", action="store_true",
+                        help="run once against the live backends (keys, network, TTS) and save the cassette")
+    parser.add_argument("--repeat", type=int, default=1, help="times to run the session")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="scale recorded latencies (0 = measure Friday's own overhead only)")
+    parser.add_argument("--verbose", action="store_true", help="show Friday's replies")
+    parser.add_argument("--baseline", help="compare against this stored result; exit 1 on regression")
+    parser.add_argument("--save-baseline", metavar="FILE", help="store this run's result as a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed relative change (default 10%%)")
+    args = parser.parse_args(argv)
+
+    inputs = args.wav or load_commands(args.commands)
+    if args.record:
+        if args.wav:
+            app.speech_recognizer = app.create_recognizer("google", None)
+        cassette = Cassette(args.cassette, "record")
+        app.use_cassette(cassette)
+        with tempfile.TemporaryDirectory() as tmp:
+            run_session(inputs, args.wav, os.path.join(tmp, "record.jsonl"))
+        cassette.save()
+        print(f"Recorded {sum(cassette.calls.values())} calls to {args.cassette}; re-run without --record to replay")
+        return
+
+    cassette = Cassette(args.cassette, "replay", args.speed)
+    app.use_cassette(cassette)
+    summary, result = measure(cassette, inputs, args.wav, args.repeat, args.speed, quiet=not args.verbose)
+    outcomes = ", ".join(f"{outcome} {n}" for outcome, n in summary["outcomes"].most_common())
+    print(f"{result['turns']} turns ({outcomes}): {result['turns_per_s']} turns/s, "
+          f"p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms")
+    rss = f"{result['maxrss_kb']} KiB" if result["maxrss_kb"] is not None else "unavailable"
+    print(f"memory: traced peak {result['peak_kb']} KiB, max RSS {rss}")
+    print(f"backend calls: {', '.join(f'{kind} {n}' for kind, n in sorted(cassette.calls.items()))}")
+    print_table("stage", summary["stage"])
+    print_table("skill", summary["skill"])
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({"speed": args.speed, **result}, f, indent=1)
+        print(f"Baseline saved to {args.save_baseline}")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("speed", 1.0) != args.speed:
+            print(f"warning: baseline was run with --speed {baseline.get('speed', 1.0)}")
+        lines, regressed = compare(result, baseline, args.tolerance)
+        print(f"against {args.baseline} (tolerance {args.tolerance:.0%}):")
+        print("\n".join(lines))
+        if regressed:
+            print(f"Regressed: {', '.join(regressed)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import argparse
+import random
+import sys
+import time
+
+from bench_intents import LEGACY_CHAIN, legacy_route, load_cases
+from intents import COMMAND_SKILLS
+
+# Words mixed into synthetic commands around the trigger phrases
+FILLER = ("please", "friday", "can", "you", "now", "quickly", "for", "me", "the", "a", "right", "okay",
+          "tell", "what", "um", "so", "just", "this", "sometimes", "anything")
+
+
+def synthetic_commands(registry, n, chatter=0.2, seed=0):
+    """n commands, each a random skill trigger among random filler words
+
+    A chatter share of them is filler only, the conversation fallback
+    that walks the whole if/elif chain.
+    """
+    rng = random.Random(seed)
+    triggers = [phrase for skill in registry.skills.values() for phrases, _ in skill.triggers for phrase in phrases]
+    commands = []
+    for _ in range(n):
+        words = [rng.choice(FILLER) for _ in range(rng.randint(1, 8))]
+        if rng.random() >= chatter:
+            words.insert(rng.randint(0, len(words)), rng.choice(triggers))
+        commands.append(" ".join(words))
+    return commands
+
+
+def golden_check(registry):
+    """Every labeled command must route, and dispatch, to its recorded skill"""
+    ran = []
+    for skill in list(registry.skills.values()):
+        registry.register(skill.name, handler=lambda command, name=skill.name: ran.append(name))
+    failures = []
+    for text, label in load_cases():
+        ran.clear()
+        name = registry.dispatch(text)
+        if name != label or ran != [label]:
+            failures.append((text, label, name, ran[:]))
+    return failures
+
+
+def time_per_command(fn, commands):
+    start = time.perf_counter()
+    for command in commands:
+        fn(command)
+    return (time.perf_counter() - start) / len(commands)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Skill registry routing: golden decisions and speed")
+    parser.add_argument("--commands", type=int, default=20_000, help="synthetic commands to route")
+    parser.add_argument("--extra-skills", type=int, default=200,
+                        help="also time routing with this many extra plugin-style skills registered")
+    args = parser.parse_args(argv)
+
+    failures = golden_check(COMMAND_SKILLS)
+    cases = len(load_cases())
+    print(f"golden routing: {cases - len(failures)}/{cases} labeled commands route and dispatch as recorded")
+    for text, label, name, ran in failures:
+        print(f"  {text!r}: expected {label}, routed to {name}, ran {ran}")
+
+    commands = synthetic_commands(COMMAND_SKILLS, args.commands)
+    agree = sum(legacy_route(c) == COMMAND_SKILLS.route(c).name for c in commands)
+    print(f"{len(commands)} synthetic commands; the old if/elif chain agrees on {agree / len(commands):.1%}")
+    print(f"  if/elif chain     {time_per_command(legacy_route, commands) * 1e6:6.2f} us/command")
+    print(f"  skill registry    {time_per_command(COMMAND_SKILLS.route, commands) * 1e6:6.2f} us/command")
+
+    if args.extra_skills:
+        # More skills cost the chain another substring scan each; the index stays one lookup per word
+        extra = [(f"plugin{i}", [f"plugin word {i}", f"custom{i}"]) for i in range(args.extra_skills)]
+        chain = LEGACY_CHAIN + extra
+
+        def long_chain(command):
+            for intent, words in chain:
+                if any(word in command for word in words):
+                    return intent
+            return "conversation"
+
+        for name, phrases in extra:
+            COMMAND_SKILLS.register(name, phrases)
+        COMMAND_SKILLS.route("warm up the index")
+        print(f"with {args.extra_skills} extra skills:")
+        print(f"  if/elif chain     {time_per_command(long_chain, commands) * 1e6:6.2f} us/command")
+        print(f"  skill registry    {time_per_command(COMMAND_SKILLS.route, commands) * 1e6:6.2f} us/command")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
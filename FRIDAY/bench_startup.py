@@ -0,0 +1,87 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# What app.py imported at the top before skills loaded their own dependencies
+EAGER_IMPORTS = ["speech_recognition", "pyttsx3", "pywhatkit", "wikipedia", "pyjokes", "openai", "geopy",
+                 "geopy.geocoders", "gmplot", "requests", "pytz", "wolframalpha", "pyautogui", "psutil",
+                 "screen_brightness_control", "pygame", "googletrans"]
+# What startup still needs before "Friday activated" is spoken
+STARTUP_IMPORTS = ["pyttsx3"]
+
+
+def import_time(modules):
+    """Microseconds to import modules in a fresh interpreter, from -X importtime
+
+    Returns (total, {module: cumulative}, missing modules). Only the
+    top-level rows of the report are summed, since their cumulative time
+    already includes everything they pulled in, and modules the bare
+    interpreter loads at startup are left out.
+    """
+    code = "\n".join(f"try:\n    import {m}\nexcept Exception:\n    print({m!r})" for m in modules)
+    return _parse_importtime(code, exclude=set(_parse_importtime("pass")[1]))
+
+
+def _parse_importtime(code, exclude=()):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, cwd=HERE)
+    per_module = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  ") and name.strip() not in exclude:  # top level: one space after the bar
+            per_module[name.strip()] = int(cumulative)
+    missing = result.stdout.split()
+    return sum(per_module.values()), per_module, missing
+
+
+def time_to_activated(timeout=60.0):
+    """Seconds from launching app.py --text until it prints the activation line"""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "app.py", "--text"], cwd=HERE, stdin=subprocess.DEVNULL,
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    try:
+        for line in proc.stdout:
+            if "Friday activated" in line:
+                return time.perf_counter() - start
+            if time.perf_counter() - start > timeout:
+                break
+        return None
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FRIDAY startup cost: eager vs lazy dependency imports")
+    parser.add_argument("--runs", type=int, default=3, help="repeat each measurement, keep the best")
+    parser.add_argument("--launch", action="store_true",
+                        help="also time app.py --text until 'Friday activated' (needs its dependencies)")
+    args = parser.parse_args(argv)
+
+    for name, modules in (("eager (all at start)", EAGER_IMPORTS), ("lazy (startup only)", STARTUP_IMPORTS),
+                          ("app.py module", ["app"])):
+        best = None
+        for _ in range(args.runs):
+            total, per_module, missing = import_time(modules)
+            if best is None or total < best[0]:
+                best = (total, per_module, missing)
+        total, per_module, missing = best
+        print(f"{name:<22} imports {total / 1000:8.1f} ms")
+        for module, us in sorted(per_module.items(), key=lambda item: -item[1])[:5]:
+            print(f"    {module:<28} {us / 1000:8.1f} ms")
+        if missing:
+            print(f"    not installed: {', '.join(missing)}")
+
+    if args.launch:
+        seconds = min((time_to_activated() or float("inf")) for _ in range(args.runs))
+        print(f"time to 'Friday activated': {seconds:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
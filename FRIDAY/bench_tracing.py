@@ -0,0 +1,75 @@
+import argparse
+import os
+import tempfile
+import time
+
+from audio import Speaker, TextSource, VoicePipeline
+from intents import classify_command
+from trace_summary import load_records, print_table, summarize
+from tracing import Tracer
+
+
+def hook_cost(tracer, n):
+    """Seconds per span() + tag() pair inside a turn, as process_command pays them"""
+    with tracer.activate(tracer.start_turn()):
+        start = time.perf_counter()
+        for _ in range(n):
+            with tracer.span("route"):
+                pass
+            tracer.tag(skill="time")
+        return (time.perf_counter() - start) / n
+
+
+def run_session(tracer, turns, skill_seconds, tts_seconds):
+    """A scripted session through the real pipeline with simulated skills and speech"""
+    def handle(text):
+        with tracer.span("route"):
+            intent = classify_command(text).name
+        tracer.tag(skill=intent)
+        with tracer.span("skill"):
+            time.sleep(skill_seconds)
+            with tracer.span("translate"):
+                reply = f"reply to {text}"
+            speaker.say(reply)
+
+    commands = ["what's the time", "tell me a joke", "weather in pune", "calculate 2 plus 2"]
+    speaker = Speaker(lambda text: time.sleep(tts_seconds), tracer=tracer).start()
+    pipeline = VoicePipeline(TextSource([commands[i % len(commands)] for i in range(turns)]),
+                             lambda text: text, handle, speaker, barge_in=False, max_pending=turns, tracer=tracer)
+    start = time.perf_counter()
+    pipeline.run()
+    elapsed = time.perf_counter() - start
+    speaker.close()
+    return elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cost of FRIDAY's tracing hooks, disabled and enabled")
+    parser.add_argument("--hooks", type=int, default=200_000, help="span/tag pairs for the micro-benchmark")
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--skill", type=float, default=0.002, help="simulated skill time (s)")
+    parser.add_argument("--tts", type=float, default=0.001, help="simulated speech time (s)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "trace.jsonl")
+        enabled = Tracer(path)
+        print(f"span + tag: disabled {hook_cost(Tracer(), args.hooks) * 1e9:6.0f} ns, "
+              f"enabled {hook_cost(enabled, args.hooks) * 1e9:6.0f} ns")
+        enabled.close()
+        os.remove(path)
+
+        off = run_session(Tracer(), args.turns, args.skill, args.tts)
+        tracer = Tracer(path)
+        on = run_session(tracer, args.turns, args.skill, args.tts)
+        tracer.close()
+        print(f"{args.turns}-turn session: tracing off {off:.3f}s, on {on:.3f}s "
+              f"({(on - off) / args.turns * 1e6:+.0f} us/turn)")
+
+        summary = summarize(load_records([path]))
+        print_table("stage", summary["stage"])
+        print_table("skill", summary["skill"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import argparse
+import time
+
+from translation import OfflineTranslator, PhraseCache, TranslationLayer
+from stats import percentile
+
+# A session's worth of replies: fixed strings repeat, a few are dynamic
+STATIC = ["Volume increased", "Volume decreased", "Brightness increased", "Brightness decreased",
+          "Hi there!", "Opening YouTube", "Goodbye! Have a great day!"]
+SESSION = STATIC * 4 + [
+    "Current weather in Mumbai: haze, Temperature: 31°C. Humidity: 70%.",
+    "Reminder set for call mom in 10 minutes",
+    "Playing believer",
+    "The result is 42",
+]
+
+
+def speak_uncached(backend, text, lang):
+    """The old speak(): one translator round-trip for every reply"""
+    return backend.translate([text], lang)[0]
+
+
+def timed(replies, speak):
+    latencies = []
+    for text in replies:
+        start = time.perf_counter()
+        speak(text)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="speak() translation latency, uncached vs cached")
+    parser.add_argument("--lang", default="hi")
+    parser.add_argument("--delay", type=float, default=0.15, help="simulated translator round-trip (s)")
+    args = parser.parse_args(argv)
+
+    backend = OfflineTranslator(args.delay)
+    before = timed(SESSION, lambda text: speak_uncached(backend, text, args.lang))
+    runs = [("before (uncached)", before, backend.calls)]
+
+    backend = OfflineTranslator(args.delay)
+    layer = TranslationLayer(backend, PhraseCache())
+    runs.append(("cache, cold", timed(SESSION, lambda text: layer.translate(text, args.lang)), backend.calls))
+
+    backend = OfflineTranslator(args.delay)
+    layer = TranslationLayer(backend, PhraseCache())
+    layer.prewarm(STATIC, args.lang, background=False)
+    warm_calls = backend.calls
+    runs.append(("cache, prewarmed", timed(SESSION, lambda text: layer.translate(text, args.lang)),
+                 backend.calls - warm_calls))
+
+    print(f"{len(SESSION)} replies in '{args.lang}', {args.delay * 1000:.0f} ms per translator call")
+    for name, latencies, calls in runs:
+        latencies.sort()
+        mean = sum(latencies) / len(latencies) * 1000
+        p95 = percentile(latencies, 95) * 1000
+        print(f"  {name:<18} speak() translation mean {mean:7.2f} ms  p95 {p95:7.2f} ms  "
+              f"translator calls {calls}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+import functools
+import math
+import operator
+import re
+
+# Spoken phrases rewritten to symbols before tokenizing; longer phrases first.
+# Ambiguous verbs ("add 2 and 3", "divide 10 by 2") are left to Wolfram.
+SPOKEN_OPERATORS = [
+    ("multiplied by", "*"), ("divided by", "/"), ("to the power of", "^"), ("raised to", "^"),
+    ("square root of", "sqrt"), ("cube root of", "cbrt"), ("root of", "sqrt"), ("percent of", "% *"),
+    ("open bracket", "("), ("close bracket", ")"), ("open parenthesis", "("), ("close parenthesis", ")"),
+    ("plus", "+"), ("minus", "-"), ("times", "*"), ("into", "*"), ("x", "*"), ("×", "*"), ("over", "/"),
+    ("÷", "/"), ("modulo", "mod"), ("power", "^"), ("squared", "^ 2"), ("cubed", "^ 3"), ("percent", "%"),
+]
+# Words that only introduce the question
+FILLER = {"calculate", "compute", "solve", "what", "what's", "whats", "is", "the", "of", "value", "answer",
+          "math", "please", "friday", "equals", "equal", "to", "and", "how", "much"}
+
+NUMBER_WORDS = {word: n for n, word in enumerate(
+    "zero one two three four five six seven eight nine ten eleven twelve thirteen fourteen fifteen "
+    "sixteen seventeen eighteen nineteen".split())}
+NUMBER_WORDS.update({word: 10 * n for n, word in enumerate(
+    "twenty thirty forty fifty sixty seventy eighty ninety".split(), start=2)})
+SCALE_WORDS = {"hundred": 100, "thousand": 1000, "million": 10 ** 6, "billion": 10 ** 9}
+
+
+def _factorial(x):
+    if x != int(x) or not 0 <= x <= 1000:
+        raise ValueError("factorial needs a whole number up to 1000")
+    return float(math.factorial(int(x)))
+
+
+FUNCTIONS = {
+    "sqrt": math.sqrt, "cbrt": lambda x: math.copysign(abs(x) ** (1 / 3), x), "abs": abs,
+    "sin": lambda x: math.sin(math.radians(x)), "cos": lambda x: math.cos(math.radians(x)),
+    "tan": lambda x: math.tan(math.radians(x)), "log": math.log10, "ln": math.log, "exp": math.exp,
+    "factorial": _factorial,
+}
+CONSTANTS = {"pi": math.pi, "e": math.e}
+BINARY = {"+": operator.add, "-": operator.sub, "*": operator.mul, "/": operator.truediv,
+          "mod": operator.mod, "^": None}
+# Binding power of each binary operator; ^ is right-associative
+PRECEDENCE = {"+": 1, "-": 1, "*": 2, "/": 2, "mod": 2, "^": 4}
+
+MAX_EXPONENT = 10_000  # keeps "9 ^ 9 ^ 9" from eating the CPU
+MAX_MAGNITUDE = 1e300
+
+_TOKEN = re.compile(r"\s*(?:(\d+(?:\.\d*)?|\.\d+)|([a-z]+)|(\*\*|[-+*/^()%!]))")
+
+
+def _rewrite(text):
+    """Lowercase spoken math with operator words replaced by symbols and filler dropped"""
+    text = f" {text.lower()} ".replace(",", "")
+    for phrase, symbol in SPOKEN_OPERATORS:
+        text = re.sub(rf"(?<![a-z]){re.escape(phrase)}(?![a-z])", f" {symbol} ", text)
+    return " ".join(word for word in text.split() if word not in FILLER)
+
+
+# Which kind of number word may follow which within one number: "twenty five",
+# "one hundred five", "two thousand twelve", but not "five six" or "twenty thirty"
+_MAY_FOLLOW = {
+    "unit": {None, "tens", "hundred", "scale"},
+    "teen": {None, "hundred", "scale"},
+    "tens": {None, "hundred", "scale"},
+    "hundred": {"unit", "teen", "tens"},
+    "scale": {"unit", "teen", "tens", "hundred"},
+}
+
+
+def _number_kind(token):
+    if token in NUMBER_WORDS:
+        value = NUMBER_WORDS[token]
+        return "unit" if value < 10 else "teen" if value < 20 else "tens"
+    if token == "hundred":
+        return "hundred"
+    if token in SCALE_WORDS:
+        return "scale"
+    return None
+
+
+def _merge_number_words(tokens):
+    """Collapse runs like ["twenty", "five", "hundred"] into one number token
+
+    Raises ValueError for a run that doesn't read as one number, such as
+    "five six" or "two and three" (filler is already gone), so the query
+    goes to Wolfram Alpha rather than being summed.
+    """
+    merged, total, current, last, scale, previous = [], 0, 0, None, None, None
+    for token in tokens + [None]:
+        kind = _number_kind(token)
+        if kind in ("hundred", "scale") and last is None:
+            kind = None  # a bare "hundred" is left to the parser
+        if kind is None:
+            if last is not None:
+                merged.append(str(total + current))
+                total, current, last, scale = 0, 0, None, None
+            if token is not None:
+                merged.append(token)
+            continue
+        if last not in _MAY_FOLLOW[kind] or (kind == "scale" and scale and SCALE_WORDS[token] >= scale):
+            raise ValueError(f"{token!r} can't follow {previous!r} in one number")
+        if kind == "hundred":
+            current *= 100
+        elif kind == "scale":
+            scale = SCALE_WORDS[token]
+            total, current = total + current * scale, 0
+        else:
+            current += NUMBER_WORDS[token]
+        last, previous = kind, token
+    return merged
+
+
+def tokenize(text):
+    """Tokens of a spoken or typed expression; raises ValueError on stray characters"""
+    text = _rewrite(text)
+    tokens, pos = [], 0
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if not match:
+            if text[pos:].strip():
+                raise ValueError(f"unexpected {text[pos:].strip()[:10]!r}")
+            break
+        number, word, symbol = match.groups()
+        if word and word not in FUNCTIONS and word not in CONSTANTS and word not in BINARY \
+                and word not in NUMBER_WORDS and word not in SCALE_WORDS:
+            raise ValueError(f"unknown word {word!r}")
+        tokens.append(number or word or ("^" if symbol == "**" else symbol))
+        pos = match.end()
+    return _merge_number_words(tokens)
+
+
+class _Parser:
+    """Precedence-climbing parser from tokens to a nested-tuple AST
+
+    Nodes are ("num", value), ("neg", node), ("call", name, node),
+    ("percent", node) and ("bin", op, left, right). A number followed by
+    a bracket, function or constant, as in "2 (3 + 4)" or "2 pi",
+    multiplies.
+    """
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            raise ValueError("empty expression")
+        node = self.expression(0)
+        if self.peek() is not None:
+            raise ValueError(f"unexpected {self.peek()!r}")
+        return node
+
+    def expression(self, min_precedence):
+        left = self.unary()
+        while True:
+            op = self.peek()
+            if op in PRECEDENCE:
+                precedence = PRECEDENCE[op]
+            elif op == "(" or op in FUNCTIONS or op in CONSTANTS:
+                op, precedence = "*", PRECEDENCE["*"]  # implicit multiplication
+                self.tokens.insert(self.pos, "*")
+            else:
+                return left
+            if precedence < min_precedence:
+                return left
+            self.take()
+            right = self.expression(precedence if op == "^" else precedence + 1)
+            left = ("bin", op, left, right)
+
+    def unary(self):
+        if self.peek() == "-":
+            self.take()
+            # -2 ^ 2 is -(2 ^ 2)
+            return ("neg", self.expression(PRECEDENCE["^"]))
+        if self.peek() == "+":
+            self.take()
+            return self.unary()
+        return self.postfix(self.primary())
+
+    def postfix(self, node):
+        while self.peek() in ("%", "!"):
+            node = ("percent", node) if self.take() == "%" else ("call", "factorial", node)
+        return node
+
+    def primary(self):
+        token = self.take()
+        if token is None:
+            raise ValueError("expression ends early")
+        if token[0].isdigit() or token[0] == ".":
+            return ("num", float(token))
+        if token in CONSTANTS:
+            return ("num", CONSTANTS[token])
+        if token in FUNCTIONS:
+            return ("call", token, self.unary())
+        if token == "(":
+            node = self.expression(0)
+            if self.take() != ")":
+                raise ValueError("missing closing bracket")
+            return node
+        raise ValueError(f"unexpected {token!r}")
+
+
+def _power(base, exponent):
+    if abs(exponent) > MAX_EXPONENT:
+        raise OverflowError("exponent too large")
+    return math.pow(base, exponent)
+
+
+def _compile(node):
+    """Turn an AST into a zero-argument function, so a cached expression skips the tree walk"""
+    kind = node[0]
+    if kind == "num":
+        value = node[1]
+        return lambda: value
+    if kind == "neg":
+        operand = _compile(node[1])
+        return lambda: -operand()
+    if kind == "percent":
+        operand = _compile(node[1])
+        return lambda: operand() / 100
+    if kind == "call":
+        fn, operand = FUNCTIONS[node[1]], _compile(node[2])
+        return lambda: fn(operand())
+    fn = BINARY[node[1]] or _power
+    left, right = _compile(node[2]), _compile(node[3])
+    return lambda: fn(left(), right())
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_expression(text):
+    """Compiled function for a spoken or typed expression; raises ValueError if it doesn't parse"""
+    return _compile(_Parser(tokenize(text)).parse())
+
+
+def evaluate(text):
+    """Value of an expression such as "calculate 2 plus 3 times 4"
+
+    Raises ValueError when the text isn't an expression this evaluator
+    understands, and ArithmeticError when it is but has no value
+    (division by zero, square root of a negative, overflow).
+    """
+    fn = compile_expression(text)
+    try:
+        result = fn()
+    except ValueError as e:  # math domain errors
+        raise ArithmeticError(str(e)) from None
+    except TypeError as e:  # complex results, e.g. a negative number to a fractional power
+        raise ArithmeticError(str(e)) from None
+    if isinstance(result, complex) or math.isnan(result) or abs(result) > MAX_MAGNITUDE:
+        raise ArithmeticError("result out of range")
+    return result
+
+
+def format_number(value):
+    """Speakable number: whole values without '.0', others to at most 6 decimals"""
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return f"{value:.6f}".rstrip("0").rstrip(".")
@@ -0,0 +1,158 @@
+import collections
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from stats import percentile
+
+IPINFO_URL = "https://ipinfo.io/json"
+WEATHER_URL = "https://api.openweathermap.org/data/2.5/weather"
+
+# (connect, read) timeouts in seconds by host; anything else gets DEFAULT_TIMEOUT
+ENDPOINT_TIMEOUTS = {
+    "ipinfo.io": (2.0, 3.0),
+    "api.openweathermap.org": (2.0, 5.0),
+}
+DEFAULT_TIMEOUT = (3.0, 10.0)
+
+# Library calls that manage their own HTTP (wikipedia, wolframalpha, openai) get a wall-clock limit
+SKILL_TIMEOUTS = {
+    "wikipedia": 8.0,
+    "wolfram": 8.0,
+    "openai": 20.0,
+}
+
+
+class SkillStats:
+    """Response times of external calls, by skill"""
+
+    def __init__(self):
+        self.latencies = collections.defaultdict(list)
+        self.errors = collections.Counter()
+        self._lock = threading.Lock()
+
+    def add(self, skill, seconds, error=False):
+        with self._lock:
+            self.latencies[skill].append(seconds)
+            if error:
+                self.errors[skill] += 1
+
+    def summary(self):
+        with self._lock:
+            if not self.latencies:
+                return "Web skills: no calls yet"
+            parts = []
+            for skill, samples in sorted(self.latencies.items()):
+                samples = sorted(samples)
+                part = (f"{skill} p50 {percentile(samples, 50) * 1000:.0f} ms "
+                        f"p95 {percentile(samples, 95) * 1000:.0f} ms (n={len(samples)}")
+                if self.errors[skill]:
+                    part += f", {self.errors[skill]} failed"
+                parts.append(part + ")")
+            return "Web skills: " + "; ".join(parts)
+
+
+class HttpClient:
+    """One pooled, keep-alive HTTP session shared by Friday's web skills
+
+    Requests reuse connections per host, retry idempotent GETs on
+    connection errors and 429/5xx with backoff, and use per-host timeouts.
+    The IP geolocation is cached for location_ttl seconds and can be
+    fetched in the background before anyone asks. run() gives library
+    calls that do their own HTTP a timeout by running them on the pool.
+    Every call's response time is recorded in stats by skill.
+
+    requests is imported when the first request is made.
+    """
+
+    def __init__(self, retries=2, backoff=0.3, pool_size=8, timeouts=None, location_ttl=600.0,
+                 ipinfo_url=IPINFO_URL, session=None, clock=time.monotonic):
+        self.retries = retries
+        self.backoff = backoff
+        self.pool_size = pool_size
+        self.timeouts = {**ENDPOINT_TIMEOUTS, **(timeouts or {})}
+        self.location_ttl = location_ttl
+        self.ipinfo_url = ipinfo_url
+        self.clock = clock
+        self.stats = SkillStats()
+        self.executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="web")
+        self._session = session
+        self._session_lock = threading.Lock()
+        self._location = None  # (ipinfo dict, fetched at)
+        self._location_lock = threading.Lock()
+
+    @property
+    def session(self):
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+
+                retry = Retry(total=self.retries, backoff_factor=self.backoff,
+                              status_forcelist=(429, 500, 502, 503, 504), allowed_methods=frozenset(["GET"]))
+                adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size,
+                                      max_retries=retry)
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    def timeout_for(self, url):
+        return self.timeouts.get(urlsplit(url).hostname, DEFAULT_TIMEOUT)
+
+    def get_json(self, url, skill, params=None):
+        """GET url and decode the JSON body; error statuses are returned, not raised"""
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, params=params, timeout=self.timeout_for(url))
+            data = response.json()
+        except Exception:
+            self.stats.add(skill, time.perf_counter() - start, error=True)
+            raise
+        self.stats.add(skill, time.perf_counter() - start)
+        return data
+
+    def location(self):
+        """ipinfo.io's answer for this machine, cached for location_ttl seconds"""
+        with self._location_lock:
+            if self._location and self.clock() - self._location[1] < self.location_ttl:
+                return self._location[0]
+            # Held while fetching, so concurrent callers wait for one lookup instead of racing
+            data = self.get_json(self.ipinfo_url, "location")
+            self._location = (data, self.clock())
+            return data
+
+    def prefetch_location(self):
+        """Start the geolocation lookup in the background; failures are left for location() to retry"""
+        def fetch():
+            try:
+                self.location()
+            except Exception as e:
+                print(f"Location prefetch error: {e}")
+
+        return self.executor.submit(fetch)
+
+    def run(self, skill, fn, *args, timeout=None, **kwargs):
+        """Call fn(*args, **kwargs) on the pool, giving up after timeout seconds
+
+        Raises concurrent.futures.TimeoutError on timeout. The call itself
+        can't be cancelled and finishes in the background.
+        """
+        timeout = timeout if timeout is not None else SKILL_TIMEOUTS.get(skill, DEFAULT_TIMEOUT[1])
+        start = time.perf_counter()
+        future = self.executor.submit(fn, *args, **kwargs)
+        try:
+            result = future.result(timeout=timeout)
+        except Exception:
+            self.stats.add(skill, time.perf_counter() - start, error=True)
+            raise
+        self.stats.add(skill, time.perf_counter() - start)
+        return result
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+        if self._session is not None:
+            self._session.close()
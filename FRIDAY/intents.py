@@ -0,0 +1,33 @@
+from skills import SkillRegistry
+
+# Friday's built-in skills and their trigger phrases, matched on whole words
+# in one pass. app.py attaches the handlers; plugins can add more skills.
+# Generic question openers weigh less than a domain word, so "what is the
+# weather" routes to weather rather than Wikipedia. Priority (earlier = higher)
+# only breaks ties and follows the original if/elif order. Plurals are
+# listed where the old substring checks matched them ("jokes", "songs").
+COMMAND_SKILLS = SkillRegistry(default="conversation")
+for priority, (intent, keywords) in enumerate(reversed([
+    ("play", ["play", "song", "songs", "music"]),
+    ("greeting", ["hi", "hello", "hey"]),
+    ("name", ["your name"]),
+    ("time", ["time", "what is the time", "what's the time"]),
+    ("date", ["date", "what is the date", "what's the date", "today's date"]),
+    ("wikipedia", ["wikipedia"]),
+    ("joke", ["joke", "jokes"]),
+    ("calculate", ["calculate", "math", "solve"]),
+    ("weather", ["weather", "temperature"]),
+    ("reminder", ["remind", "reminder", "reminders"]),
+    ("location", ["location", "where am i"]),
+    ("open", ["open", "launch"]),
+    ("system", ["volume", "brightness", "screenshot", "screenshots", "battery"]),
+    ("exit", ["exit", "quit", "goodbye"]),
+])):
+    COMMAND_SKILLS.register(intent, keywords, priority=priority)
+COMMAND_SKILLS.register("wikipedia", ["who is", "what is"], weight=0.4)
+COMMAND_SKILLS.register("conversation")  # no triggers: anything nothing else matches
+
+
+def classify_command(command):
+    """Intent name and confidence for a recognized command"""
+    return COMMAND_SKILLS.route(command)
@@ -0,0 +1,12 @@
+"""Example skill plugin: python app.py --plugin plugins.coin"""
+import random
+
+
+def register(skills, speak, **context):
+    @skills.skill("coin", ["flip a coin", "toss a coin", "heads or tails"], priority=20)
+    def flip_coin(command):
+        speak(f"It's {random.choice(['heads', 'tails'])}")
+
+    @skills.skill("dice", ["roll a dice", "roll a die", "roll the dice"], priority=20)
+    def roll_dice(command):
+        speak(f"You rolled a {random.randint(1, 6)}")
@@ -0,0 +1,165 @@
+import collections
+import json
+import os
+
+# One recognition result; final=False for a partial hypothesis that may still change
+Hypothesis = collections.namedtuple("Hypothesis", "text final")
+
+SAMPLE_RATE = 16000  # 16-bit mono PCM fed to streaming engines
+CHUNK_SECONDS = 0.1
+
+# Intents that take no arguments, so a stable partial is as good as the final text
+EARLY_INTENTS = {"greeting", "name", "time", "date", "joke", "location"}
+
+
+def pcm_chunks(audio, sample_rate=SAMPLE_RATE, chunk_seconds=CHUNK_SECONDS):
+    """Split a speech_recognition AudioData into 16-bit mono PCM chunks"""
+    pcm = audio.get_raw_data(convert_rate=sample_rate, convert_width=2)
+    step = int(sample_rate * chunk_seconds) * 2
+    return [pcm[i:i + step] for i in range(0, len(pcm), step)]
+
+
+class GoogleRecognizer:
+    """Google Web Speech recognition (needs the network, no partial results)"""
+
+    streaming = False
+
+    def __init__(self, language="en-IN"):
+        import speech_recognition as sr
+
+        self.recognizer = sr.Recognizer()
+        self.language = language
+
+    def recognize(self, audio):
+        return self.recognizer.recognize_google(audio, language=self.language)
+
+
+class VoskRecognizer:
+    """Local Vosk (Kaldi) recognition on the CPU, with streaming partials
+
+    model_path is an unpacked model directory such as
+    vosk-model-small-en-in-0.4 from https://alphacephei.com/vosk/models.
+    """
+
+    streaming = True
+
+    def __init__(self, model_path, sample_rate=SAMPLE_RATE):
+        import vosk
+
+        vosk.SetLogLevel(-1)
+        self.vosk = vosk
+        self.model = vosk.Model(model_path)
+        self.sample_rate = sample_rate
+
+    def _new(self):
+        return self.vosk.KaldiRecognizer(self.model, self.sample_rate)
+
+    def recognize(self, audio):
+        """Final text of one complete utterance"""
+        recognizer = self._new()
+        recognizer.AcceptWaveform(audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2))
+        return json.loads(recognizer.FinalResult())["text"]
+
+    def stream(self, chunks):
+        """Yield Hypothesis items for a stream of PCM chunks
+
+        Every chunk heard mid-utterance yields the current partial, so an
+        unchanged partial means the words have settled. Vosk's own
+        endpointing yields a final whenever an utterance ends, so one
+        endless microphone stream produces many finals.
+        """
+        recognizer = self._new()
+        for chunk in chunks:
+            if recognizer.AcceptWaveform(chunk):
+                text = json.loads(recognizer.Result())["text"]
+                if text:
+                    yield Hypothesis(text, True)
+            else:
+                partial = json.loads(recognizer.PartialResult())["partial"]
+                if partial:
+                    yield Hypothesis(partial, False)
+        text = json.loads(recognizer.FinalResult())["text"]
+        if text:
+            yield Hypothesis(text, True)
+
+
+class FallbackRecognizer:
+    """Try recognizers in order, moving on when one fails (e.g. offline)"""
+
+    def __init__(self, *recognizers):
+        self.recognizers = recognizers
+        self.streaming = recognizers[0].streaming
+        if self.streaming:
+            self.stream = recognizers[0].stream
+
+    def recognize(self, audio):
+        error = None
+        for recognizer in self.recognizers:
+            try:
+                return recognizer.recognize(audio)
+            except Exception as e:
+                if type(e).__name__ == "UnknownValueError":
+                    raise
+                error = e
+        raise error
+
+
+def create_recognizer(name="auto", vosk_model=None, language="en-IN"):
+    """google, vosk, or auto: Vosk when a model is available, Google as the fallback"""
+    vosk_model = vosk_model or os.getenv("VOSK_MODEL")
+    if name == "google":
+        return GoogleRecognizer(language)
+    if name == "vosk":
+        if not vosk_model:
+            raise ValueError("Set VOSK_MODEL or pass --vosk-model to use the offline recognizer.")
+        return VoskRecognizer(vosk_model)
+    if vosk_model and os.path.isdir(vosk_model):
+        try:
+            return FallbackRecognizer(VoskRecognizer(vosk_model), GoogleRecognizer(language))
+        except ImportError:
+            pass
+    return GoogleRecognizer(language)
+
+
+class EarlyRouter:
+    """Decide when a partial hypothesis is safe to act on
+
+    A partial qualifies once it has stayed the same for `stable` chunks
+    and routes, with at least min_confidence, to an intent that needs no
+    arguments (asking the time, a joke, ...). Commands with arguments,
+    such as "play ..." or "open ...", always wait for the final text.
+    """
+
+    def __init__(self, classify, intents=EARLY_INTENTS, min_confidence=0.8, stable=3):
+        self.classify = classify
+        self.intents = intents
+        self.min_confidence = min_confidence
+        self.stable = stable
+        self.reset()
+
+    def reset(self):
+        self.last = None
+        self.repeats = 0
+        self.routed = None
+
+    def partial(self, text):
+        """Return the intent name to act on now, or None"""
+        if self.routed:
+            return None
+        if text == self.last:
+            self.repeats += 1
+        else:
+            self.last, self.repeats = text, 1
+        if self.repeats < self.stable:
+            return None
+        intent = self.classify(text)
+        if intent.name in self.intents and intent.confidence >= self.min_confidence:
+            self.routed = intent.name
+            return intent.name
+        return None
+
+    def final(self, text):
+        """True when the final text still needs handling (it was not routed early to the same intent)"""
+        routed = self.routed
+        self.reset()
+        return routed is None or self.classify(text).name != routed
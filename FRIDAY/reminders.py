@@ -0,0 +1,184 @@
+import collections
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+
+# One scheduled reminder; due is a Unix timestamp so it survives restarts.
+# Heap order is (due, id), so reminders due together fire in the order set.
+Reminder = collections.namedtuple("Reminder", "due id message")
+
+
+class ReminderScheduler:
+    """Reminders in a min-heap, fired by one thread that sleeps until the next is due
+
+    add() and cancel() may be called from any thread. Cancelled reminders
+    are only dropped from the index and skipped when they reach the top of
+    the heap; the heap is rebuilt once they make up most of it. With a
+    path, every change is appended to a JSON-lines log (one line per add,
+    cancel or fire), which is compacted to the pending reminders on start
+    and whenever most of it is stale. The log is replayed on start, so
+    ones that fell due while Friday was off fire as soon as she starts.
+
+    clock is injectable: run_due() fires everything due at clock() and
+    returns the seconds until the next reminder, which is all the thread
+    loop does between waits.
+    """
+
+    def __init__(self, fire, path=None, clock=time.time):
+        self.fire = fire
+        self.path = path
+        self.clock = clock
+        self._heap = []
+        self._pending = {}  # id -> Reminder, for cancel and persistence
+        self._ids = itertools.count(1)
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = None
+        self._log = None
+        self._log_lines = 0
+        if path:
+            self._load()
+
+    def __len__(self):
+        with self._cond:
+            return len(self._pending)
+
+    def add(self, message, due=None, delay=None):
+        """Schedule message at timestamp due (or delay seconds from now); returns its id"""
+        if due is None:
+            due = self.clock() + delay
+        with self._cond:
+            reminder = Reminder(due, next(self._ids), message)
+            heapq.heappush(self._heap, reminder)
+            self._pending[reminder.id] = reminder
+            if self._heap[0] is reminder:
+                self._cond.notify()  # the thread is sleeping for a later reminder
+            self._append({"op": "add", "id": reminder.id, "due": due, "message": message})
+        return reminder.id
+
+    def cancel(self, reminder_id):
+        """Drop a pending reminder; False when it already fired or never existed"""
+        with self._cond:
+            if self._pending.pop(reminder_id, None) is None:
+                return False
+            if len(self._heap) > 64 and len(self._pending) < len(self._heap) // 2:
+                self._heap = list(self._pending.values())
+                heapq.heapify(self._heap)
+            self._append({"op": "done", "id": reminder_id})
+            return True
+
+    def pending(self):
+        """Pending reminders, soonest first"""
+        with self._cond:
+            return sorted(self._pending.values())
+
+    def next_due(self):
+        with self._cond:
+            self._drop_cancelled()
+            return self._heap[0].due if self._heap else None
+
+    def run_due(self, now=None):
+        """Fire every reminder due by now; returns seconds until the next one, or None"""
+        now = self.clock() if now is None else now
+        due = []
+        with self._cond:
+            while True:
+                self._drop_cancelled()
+                if not self._heap or self._heap[0].due > now:
+                    break
+                reminder = heapq.heappop(self._heap)
+                del self._pending[reminder.id]
+                due.append(reminder)
+                self._append({"op": "done", "id": reminder.id})
+            wait = self._heap[0].due - now if self._heap else None
+        for reminder in due:
+            try:
+                self.fire(reminder)
+            except Exception as e:
+                print(f"Reminder error: {e}")
+        return wait
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="reminders", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread:
+            self._thread.join()
+        with self._cond:
+            if self._log:
+                self._log.close()
+                self._log = None
+
+    def _run(self):
+        while True:
+            self.run_due()
+            with self._cond:
+                if self._closed:
+                    return
+                # Recheck under the lock: add() may have pushed a sooner reminder meanwhile
+                self._drop_cancelled()
+                wait = self._heap[0].due - self.clock() if self._heap else None
+                if wait is None or wait > 0:
+                    self._cond.wait(wait)
+
+    def _drop_cancelled(self):
+        while self._heap and self._heap[0].id not in self._pending:
+            heapq.heappop(self._heap)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        saved = {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # blank, or cut short by a crash mid-write
+                    if entry["op"] == "add":
+                        saved[entry["id"]] = entry
+                    else:
+                        saved.pop(entry["id"], None)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Could not load reminders: {e}")
+            return
+        for item in sorted(saved.values(), key=lambda item: item["due"]):
+            reminder = Reminder(item["due"], next(self._ids), item["message"])
+            self._heap.append(reminder)
+            self._pending[reminder.id] = reminder
+        heapq.heapify(self._heap)
+
+    def _append(self, entry):
+        """Log one change; called with the lock held, costs one short write"""
+        if not self.path:
+            return
+        try:
+            if self._log is None or (self._log_lines > 1000 and self._log_lines > 2 * len(self._pending)):
+                self._compact()
+            self._log.write(json.dumps(entry) + "\n")
+            self._log.flush()
+            self._log_lines += 1
+        except OSError as e:
+            print(f"Could not save reminders: {e}")
+
+    def _compact(self):
+        """Rewrite the log as one add per pending reminder, then keep appending to it"""
+        if self._log:
+            self._log.close()
+            self._log = None
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for r in self._pending.values():
+                f.write(json.dumps({"op": "add", "id": r.id, "due": r.due, "message": r.message}) + "\n")
+        os.replace(tmp, self.path)
+        self._log = open(self.path, "a", encoding="utf-8")
+        self._log_lines = len(self._pending)
@@ -0,0 +1,109 @@
+import importlib
+
+from intent_router import IntentRouter
+
+
+class Skill:
+    """A command Friday can run: trigger phrases, and a handler(command)"""
+
+    def __init__(self, name, priority=0):
+        self.name = name
+        self.priority = priority
+        self.triggers = []  # (phrases, weight)
+        self.patterns = []
+        self.handler = None
+
+    def __repr__(self):
+        return f"Skill({self.name!r}, priority={self.priority})"
+
+
+class SkillRegistry:
+    """Skills and a token index over their trigger phrases
+
+    Skills declare trigger phrases (and optionally regex patterns) and a
+    handler. Routing goes through an IntentRouter built from all triggers:
+    whole-word matching, one hash lookup per token, heavier phrases win
+    and priority only breaks ties. The index is rebuilt on the first
+    route after any registration, so plugins can add or extend skills at
+    startup at no cost per command.
+
+    A plugin is a module with a register(skills, **context) function;
+    load_plugins() imports it and passes the registry plus whatever the
+    app provides (such as speak).
+    """
+
+    def __init__(self, default="conversation"):
+        self.default = default
+        self.skills = {}
+        self._router = None
+
+    def __contains__(self, name):
+        return name in self.skills
+
+    def register(self, name, triggers=(), handler=None, priority=None, weight=1.0, patterns=()):
+        """Add a skill, or more triggers or a handler to an existing one"""
+        skill = self.skills.get(name)
+        if skill is None:
+            skill = self.skills[name] = Skill(name, priority or 0)
+        elif priority is not None:
+            skill.priority = priority
+        if triggers:
+            skill.triggers.append((list(triggers), weight))
+        skill.patterns.extend(patterns)
+        if handler is not None:
+            skill.handler = handler
+        self._router = None
+        return skill
+
+    def skill(self, name, triggers=(), **options):
+        """Decorator form of register() for a handler function"""
+        def decorate(handler):
+            self.register(name, triggers, handler, **options)
+            return handler
+
+        return decorate
+
+    def handler(self, name):
+        """Decorator that sets the handler of a skill whose triggers are declared elsewhere"""
+        return self.skill(name)
+
+    @property
+    def router(self):
+        router = self._router
+        if router is None:
+            router = IntentRouter(default=self.default)
+            for skill in self.skills.values():
+                for phrases, weight in skill.triggers:
+                    router.add(skill.name, phrases, priority=skill.priority, weight=weight)
+                if skill.patterns:
+                    router.add(skill.name, patterns=skill.patterns, priority=skill.priority)
+            self._router = router.compile()
+        return router
+
+    def route(self, command):
+        """Intent(name, confidence, matches) of the skill command routes to"""
+        return self.router.classify(command)
+
+    def run(self, name, command):
+        """Run the handler of skill name, falling back to the default skill's"""
+        skill = self.skills.get(name)
+        if skill is None or skill.handler is None:
+            skill = self.skills.get(self.default)
+        if skill is None or skill.handler is None:
+            raise LookupError(f"no handler for skill {name!r}")
+        return skill.handler(command)
+
+    def dispatch(self, command):
+        """Route command and run its skill; returns the skill name"""
+        name = self.route(command).name
+        self.run(name, command)
+        return name
+
+    def load_plugins(self, modules, **context):
+        """Import each plugin module and call its register(self, **context)"""
+        loaded = []
+        for module_name in modules:
+            module = importlib.import_module(module_name)
+            module.register(self, **context)
+            loaded.append(module_name)
+        return loaded
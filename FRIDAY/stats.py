@@ -0,0 +1,3 @@
+def percentile(ordered, q):
+    """The q-th percentile (nearest rank) of an already sorted list; 0.0 when empty"""
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))] if ordered else 0.0
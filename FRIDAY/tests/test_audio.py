@@ -0,0 +1,81 @@
+import threading
+
+from audio import StreamingVoicePipeline, VoicePipeline, _STOP
+from recognizers import Hypothesis
+
+
+class FakeSpeaker:
+    def __init__(self):
+        self.speaking = threading.Event()
+        self.speaking.set()
+        self.interrupts = 0
+
+    def interrupt(self):
+        self.interrupts += 1
+
+
+def recognize_all(utterances, recognize):
+    """Run the recognition stage over utterances; (speaker, pipeline) afterwards"""
+    speaker = FakeSpeaker()
+    pipeline = VoicePipeline(None, recognize, None, speaker, max_pending=len(utterances) + 1)
+    for audio in utterances:
+        pipeline.audio.put((audio, 0.0, None))
+    pipeline.audio.put((_STOP, None, None))
+    pipeline._recognition()
+    return speaker, pipeline
+
+
+def test_noise_does_not_interrupt_speech():
+    speaker, pipeline = recognize_all(["<hum>", "<echo>"], lambda audio: "")
+    assert speaker.interrupts == 0
+    assert pipeline.stats["unrecognized"] == 2
+
+
+def test_recognized_words_barge_in():
+    speaker, pipeline = recognize_all(["<hum>", "what's the time"], lambda audio: "" if audio == "<hum>" else audio)
+    assert speaker.interrupts == 1
+    assert pipeline.stats["barge_ins"] == 1
+    assert pipeline.commands.get()[0] == "what's the time"
+
+
+def test_no_barge_in_when_disabled():
+    speaker = FakeSpeaker()
+    pipeline = VoicePipeline(None, lambda audio: audio, None, speaker, barge_in=False)
+    pipeline.audio.put(("volume up", 0.0, None))
+    pipeline.audio.put((_STOP, None, None))
+    pipeline._recognition()
+    assert speaker.interrupts == 0
+
+
+class OneStream:
+    def chunk_streams(self, stop):
+        yield [b"pcm"]
+
+
+def test_streaming_barge_in_waits_for_words():
+    def stream(chunks):
+        yield Hypothesis("", False)
+        assert speaker.interrupts == 0  # silence so far
+        yield Hypothesis("what's", False)
+        yield Hypothesis("what's the time", True)
+
+    speaker = FakeSpeaker()
+    pipeline = StreamingVoicePipeline(OneStream(), stream, None, speaker)
+    pipeline._capture()
+    assert speaker.interrupts == 1
+    assert pipeline.commands.get()[0] == "what's the time"
+
+
+def test_streaming_empty_final_is_not_a_command():
+    class TwoStreams:
+        def chunk_streams(self, stop):
+            yield [b"hum"]
+            yield [b"pcm"]
+
+    finals = iter([Hypothesis("  ", True), Hypothesis("volume up", True)])
+    speaker = FakeSpeaker()
+    pipeline = StreamingVoicePipeline(TwoStreams(), lambda chunks: iter([next(finals)]), None, speaker)
+    pipeline._capture()
+    assert pipeline.commands.get()[0] == "volume up"
+    assert pipeline.commands.get()[0] is _STOP
+    assert pipeline.stats["unrecognized"] == 1
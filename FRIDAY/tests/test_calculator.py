@@ -0,0 +1,22 @@
+import csv
+import math
+import os
+
+import pytest
+
+from calculator import evaluate
+
+CASES_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "spoken_math.csv")
+
+with open(CASES_FILE, encoding="utf-8") as f:
+    CASES = [(row["text"], float(row["expected"]) if row["expected"] else None) for row in csv.DictReader(f)]
+
+
+@pytest.mark.parametrize("text,expected", CASES)
+def test_spoken_math(text, expected):
+    if expected is None:
+        # Left to Wolfram Alpha
+        with pytest.raises(ValueError):
+            evaluate(text)
+    else:
+        assert math.isclose(evaluate(text), expected, rel_tol=1e-9)
@@ -0,0 +1,16 @@
+import csv
+import os
+
+import pytest
+
+from intents import classify_command
+
+CASES_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "command_intents.csv")
+
+with open(CASES_FILE, newline="", encoding="utf-8") as f:
+    CASES = [(row["text"], row["label"]) for row in csv.DictReader(f)]
+
+
+@pytest.mark.parametrize("text,label", CASES)
+def test_command_routes_to_labeled_intent(text, label):
+    assert classify_command(text).name == label
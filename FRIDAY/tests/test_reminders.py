@@ -0,0 +1,62 @@
+
+from reminders import ReminderScheduler
+
+
+class Clock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_run_due_follows_injected_clock():
+    clock = Clock(1000.0)
+    fired = []
+    scheduler = ReminderScheduler(lambda r: fired.append(r.message), clock=clock)
+    scheduler.add("later", delay=60)
+    scheduler.add("sooner", delay=10)
+    scheduler.add("same time, set second", delay=10)
+
+    assert scheduler.run_due() == 10
+    assert fired == []
+
+    clock.now = 1010.0
+    assert scheduler.run_due() == 50
+    assert fired == ["sooner", "same time, set second"]
+
+    clock.now = 1100.0
+    assert scheduler.run_due() is None
+    assert fired == ["sooner", "same time, set second", "later"]
+
+
+def test_cancelled_reminder_never_fires():
+    clock = Clock()
+    fired = []
+    scheduler = ReminderScheduler(lambda r: fired.append(r.message), clock=clock)
+    keep = scheduler.add("keep", delay=5)
+    drop = scheduler.add("drop", delay=1)
+    assert scheduler.cancel(drop)
+    assert not scheduler.cancel(drop)
+
+    clock.now = 10
+    scheduler.run_due()
+    assert fired == ["keep"]
+    assert not scheduler.cancel(keep)
+
+
+def test_log_survives_restart(tmp_path):
+    path = str(tmp_path / "reminders.json")
+    clock = Clock()
+    scheduler = ReminderScheduler(print, path=path, clock=clock)
+    scheduler.add("water plants", due=50)
+    tea = scheduler.add("tea", due=20)
+    scheduler.add("done already", due=5)
+    scheduler.cancel(tea)
+    clock.now = 10
+    scheduler.run_due()
+    scheduler.close()
+
+    restarted = ReminderScheduler(print, path=path, clock=clock)
+    assert [(r.due, r.message) for r in restarted.pending()] == [(50, "water plants")]
+
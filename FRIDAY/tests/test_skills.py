@@ -0,0 +1,50 @@
+import copy
+import csv
+import os
+
+import pytest
+
+from intents import COMMAND_SKILLS
+
+CASES_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "command_intents.csv")
+
+with open(CASES_FILE, newline="", encoding="utf-8") as f:
+    CASES = [(row["text"], row["label"]) for row in csv.DictReader(f)]
+
+
+def recording_registry():
+    """A copy of the built-in skills whose handlers only record that they ran"""
+    registry = copy.deepcopy(COMMAND_SKILLS)
+    ran = []
+    for name in registry.skills:
+        registry.register(name, handler=lambda command, name=name: ran.append(name))
+    return registry, ran
+
+
+@pytest.mark.parametrize("text,label", CASES)
+def test_command_dispatches_to_labeled_skill(text, label):
+    registry, ran = recording_registry()
+    assert registry.dispatch(text) == label
+    assert ran == [label]
+
+
+def test_app_attaches_a_handler_to_every_skill():
+    import app
+    assert [name for name, skill in app.skills.skills.items() if skill.handler is None] == []
+
+
+def test_importing_app_opens_no_files():
+    import app
+    assert app.reminders is None and app.translator is None
+
+
+def test_plugin_skills_route_and_dispatch():
+    registry, ran = recording_registry()
+    spoken = []
+    assert registry.load_plugins(["plugins.coin"], speak=spoken.append) == ["plugins.coin"]
+
+    assert registry.dispatch("friday flip a coin for me") == "coin"
+    assert registry.dispatch("roll the dice") == "dice"
+    assert len(spoken) == 2 and spoken[0] in ("It's heads", "It's tails")
+    # Built-in skills still win their own commands
+    assert registry.dispatch("tell me a joke") == "joke" and ran == ["joke"]
@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+from translation import GoogleTranslator, OfflineTranslator, PhraseCache, TranslationLayer
+
+
+class FakeGoogle:
+    """googletrans.Translator stand-in: a list costs one request per item, like the real one"""
+
+    def __init__(self, merge_lines=False):
+        self.requests = []
+        self.merge_lines = merge_lines
+
+    def translate(self, text, dest):
+        if isinstance(text, list):
+            return [self.translate(t, dest) for t in text]
+        self.requests.append(text)
+        out = "\n".join(f"<{dest}>{line}" for line in text.split("\n"))
+        return SimpleNamespace(text=out.replace("\n", " ") if self.merge_lines else out)
+
+
+def test_reply_sentences_cost_one_request():
+    google = FakeGoogle()
+    layer = TranslationLayer(GoogleTranslator(google), PhraseCache())
+
+    reply = layer.translate("Black holes are dense. Light can't escape. They bend space.", "hi")
+
+    assert reply == "<hi>Black holes are dense. <hi>Light can't escape. <hi>They bend space."
+    assert len(google.requests) == 1
+
+
+def test_falls_back_to_one_request_per_text_when_lines_merge():
+    google = FakeGoogle(merge_lines=True)
+    assert GoogleTranslator(google).translate(["One.", "Two."], "hi") == ["<hi>One.", "<hi>Two."]
+
+
+class FlakyBackend(OfflineTranslator):
+    def __init__(self):
+        super().__init__()
+        self.fail = True
+
+    def translate(self, texts, dest):
+        if self.fail:
+            raise ConnectionError("offline")
+        return super().translate(texts, dest)
+
+
+def test_failed_prewarm_is_retried():
+    backend = FlakyBackend()
+    layer = TranslationLayer(backend, PhraseCache())
+
+    layer.prewarm(["Volume increased"], "hi", background=False)
+    assert layer.cache.get("Volume increased", "hi") is None
+
+    backend.fail = False
+    layer.prewarm(["Volume increased"], "hi", background=False)
+    assert layer.cache.get("Volume increased", "hi") == "[hi] Volume increased"
+
+    calls = backend.calls
+    layer.prewarm(["Volume increased"], "hi", background=False)
+    assert backend.calls == calls
@@ -0,0 +1,64 @@
+import argparse
+import collections
+import json
+
+from stats import percentile
+
+
+def load_records(paths):
+    records = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    records.append(json.loads(line))
+    return records
+
+
+def summarize(records):
+    """{"stage": {stage: [ms]}, "skill": {skill: [skill ms]}, "total": [ms], "outcomes": Counter}"""
+    stages = collections.defaultdict(list)
+    skills = collections.defaultdict(list)
+    totals = []
+    outcomes = collections.Counter()
+    for record in records:
+        if record.get("type") == "span":
+            stages[record["stage"]].append(record["ms"])
+            continue
+        outcomes[record.get("outcome", "unknown")] += 1
+        totals.append(record["total_ms"])
+        for stage, ms in record["stages"].items():
+            stages[stage].append(ms)
+        if "skill" in record and "skill" in record["stages"]:
+            skills[record["skill"]].append(record["stages"]["skill"])
+    return {"stage": stages, "skill": skills, "total": totals, "outcomes": outcomes}
+
+
+def print_table(title, groups):
+    if not groups:
+        return
+    print(f"{title:<14} {'n':>5} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for name, samples in sorted(groups.items(), key=lambda item: -percentile(sorted(item[1]), 95)):
+        samples = sorted(samples)
+        print(f"  {name:<12} {len(samples):5d} {percentile(samples, 50):9.1f} {percentile(samples, 95):9.1f} "
+              f"{samples[-1]:9.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="p50/p95 per stage and per skill from FRIDAY --trace files")
+    parser.add_argument("traces", nargs="+", help="JSONL files written by app.py --trace")
+    args = parser.parse_args(argv)
+
+    summary = summarize(load_records(args.traces))
+    totals = sorted(summary["total"])
+    outcomes = ", ".join(f"{outcome} {n}" for outcome, n in summary["outcomes"].most_common())
+    print(f"{len(totals)} turns ({outcomes})")
+    if totals:
+        print(f"turn total: p50 {percentile(totals, 50):.1f} ms, p95 {percentile(totals, 95):.1f} ms")
+    print_table("stage", summary["stage"])
+    print_table("skill", summary["skill"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+import collections
+import contextlib
+import json
+import sys
+import threading
+import time
+
+_NULL = contextlib.nullcontext()
+
+
+class Turn:
+    """Stage durations of one utterance, from capture until its replies are spoken
+
+    Stages are summed by name, so two "tts" spans for a two-line reply
+    add up. Spans nest: "skill" includes any "translate" inside it. The
+    turn is written once the pipeline has finished it and every reply it
+    queued has been spoken or dropped (see hold/release).
+    """
+
+    def __init__(self, tracer, number):
+        self.tracer = tracer
+        self.number = number
+        self.started = time.perf_counter()
+        self.wall = time.time()
+        self.stages = collections.defaultdict(float)
+        self.tags = {}
+        self._holds = 1
+        self._lock = threading.Lock()
+
+    def add(self, stage, seconds):
+        with self._lock:
+            self.stages[stage] += seconds
+
+    def hold(self):
+        with self._lock:
+            self._holds += 1
+
+    def release(self):
+        with self._lock:
+            self._holds -= 1
+            done = self._holds == 0
+        if done:
+            self.tracer._write(self.record())
+
+    def record(self):
+        return {"type": "turn", "turn": self.number, "time": round(self.wall, 3), **self.tags,
+                "total_ms": round((time.perf_counter() - self.started) * 1000, 1),
+                "stages": {stage: round(seconds * 1000, 1) for stage, seconds in self.stages.items()}}
+
+
+class _Span:
+    def __init__(self, tracer, stage, turn):
+        self.tracer = tracer
+        self.stage = stage
+        self.turn = turn
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.start
+        if self.turn is not None:
+            self.turn.add(self.stage, seconds)
+        else:
+            self.tracer._write({"type": "span", "stage": self.stage, "time": round(time.time(), 3),
+                                "ms": round(seconds * 1000, 1)})
+        return False
+
+
+class Tracer:
+    """Per-turn latency traces written as JSON lines
+
+    The pipeline starts a Turn per utterance and activates it on the
+    thread running the command, so span("route"), span("skill") or
+    span("translate") anywhere below attach to it; spans outside a turn
+    (microphone calibration) are written as records of their own.
+
+    Without a path the tracer is disabled: start_turn() returns None and
+    span()/activate() return a shared no-op context manager, so the
+    hooks cost one attribute check. A profiler, if given, runs only
+    while a turn is active.
+    """
+
+    def __init__(self, path=None, profiler=None):
+        self.path = path
+        self.enabled = bool(path)
+        self.profiler = profiler
+        self.turns = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8") if path else None
+
+    def start_turn(self):
+        if not self.enabled:
+            return None
+        with self._lock:
+            self.turns += 1
+            return Turn(self, self.turns)
+
+    def current(self):
+        return getattr(self._local, "turn", None) if self.enabled else None
+
+    @contextlib.contextmanager
+    def _activated(self, turn):
+        previous = getattr(self._local, "turn", None)
+        self._local.turn = turn
+        if self.profiler:
+            self.profiler.enable()
+        try:
+            yield turn
+        finally:
+            if self.profiler:
+                self.profiler.disable()
+            self._local.turn = previous
+
+    def activate(self, turn):
+        """Make turn the current one on this thread for the with-block"""
+        if not self.enabled and not self.profiler:
+            return _NULL
+        return self._activated(turn)
+
+    def span(self, stage, turn=None):
+        """Time a with-block as stage of turn (default: this thread's current turn)"""
+        if not self.enabled:
+            return _NULL
+        return _Span(self, stage, turn if turn is not None else self.current())
+
+    def tag(self, **tags):
+        turn = self.current()
+        if turn is not None:
+            turn.tags.update(tags)
+
+    def finish(self, turn, **tags):
+        if turn is not None:
+            turn.tags.update(tags)
+            turn.release()
+
+    def close(self):
+        if self.profiler:
+            self.profiler.close()
+        if self._file:
+            with self._lock:
+                self._file.close()
+                self._file = None
+
+    def _write(self, record):
+        with self._lock:
+            if self._file:
+                self._file.write(json.dumps(record) + "\n")
+                self._file.flush()
+
+
+class CProfiler:
+    """cProfile over the command thread, only while turns run; stats saved on close"""
+
+    def __init__(self, out="friday.prof", top=15):
+        import cProfile
+
+        self.out = out
+        self.top = top
+        self.profile = cProfile.Profile()
+
+    def enable(self):
+        self.profile.enable()
+
+    def disable(self):
+        self.profile.disable()
+
+    def close(self):
+        import pstats
+
+        self.profile.dump_stats(self.out)
+        print(f"Profile written to {self.out}")
+        pstats.Stats(self.profile).sort_stats("cumulative").print_stats(self.top)
+
+
+class SamplingProfiler:
+    """Samples every thread's stack each interval seconds while a turn is active
+
+    Cheaper than cProfile and sees the other stages' threads too.
+    Collapsed stacks ("outer;inner count") are written to out on close,
+    the input format of flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, out="friday.stacks", interval=0.005, top=15):
+        self.out = out
+        self.interval = interval
+        self.top = top
+        self.stacks = collections.Counter()
+        self._active = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampler", daemon=True)
+        self._thread.start()
+
+    def enable(self):
+        with self._lock:
+            self._active += 1
+
+    def disable(self):
+        with self._lock:
+            self._active -= 1
+
+    def _run(self):
+        me = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            if not self._active:
+                continue
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        with open(self.out, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        print(f"{sum(self.stacks.values())} samples written to {self.out}")
+        leaves = collections.Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        for frame, count in leaves.most_common(self.top):
+            print(f"  {count:6d}  {frame}")
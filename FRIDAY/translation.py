@@ -0,0 +1,170 @@
+import collections
+import re
+import sqlite3
+import threading
+import time
+
+# Sentences are translated and cached one by one, so "Goodbye! Have a great day!"
+# shares its pieces with any other reply that uses them
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def split_sentences(text):
+    return [s for s in _SENTENCE_END.split(text.strip()) if s]
+
+
+class GoogleTranslator:
+    """googletrans backend; a list of texts goes out as one request
+
+    googletrans sends one request per item of a list, so the texts are
+    joined one per line, translated together and split again. If the
+    translation comes back with a different number of lines, each text is
+    sent on its own instead.
+
+    googletrans is imported on the first translation, so an English-only
+    session never loads it.
+    """
+
+    def __init__(self, translator=None):
+        self.translator = translator
+
+    def translate(self, texts, dest):
+        if self.translator is None:
+            from googletrans import Translator
+
+            self.translator = Translator()
+        texts = [text.replace("\n", " ") for text in texts]
+        translated = self.translator.translate("\n".join(texts), dest=dest).text
+        lines = [line.strip() for line in translated.split("\n")]
+        if len(lines) == len(texts):
+            return lines
+        return [r.text for r in self.translator.translate(texts, dest=dest)]
+
+
+class OfflineTranslator:
+    """Deterministic stand-in backend for tests and benchmarks
+
+    Tags each text with its language instead of translating it. delay
+    simulates a network round-trip per call (per batch, not per text).
+    """
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+        self.texts = 0
+
+    def translate(self, texts, dest):
+        texts = list(texts)
+        self.calls += 1
+        self.texts += len(texts)
+        if self.delay:
+            time.sleep(self.delay)
+        return [f"[{dest}] {text}" for text in texts]
+
+
+class PhraseCache:
+    """(phrase, language) -> translation, in memory with an optional SQLite copy
+
+    Translations don't go stale, so entries never expire and all of them
+    are loaded at start.
+    """
+
+    def __init__(self, path=None):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._conn = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("CREATE TABLE IF NOT EXISTS translations "
+                               "(phrase TEXT NOT NULL, lang TEXT NOT NULL, text TEXT NOT NULL, "
+                               "PRIMARY KEY (phrase, lang))")
+            self._conn.commit()
+            for phrase, lang, text in self._conn.execute("SELECT phrase, lang, text FROM translations"):
+                self._entries[phrase, lang] = text
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, phrase, lang):
+        return self._entries.get((phrase, lang))
+
+    def update(self, lang, translations):
+        """Store a {phrase: translation} dict for one language"""
+        with self._lock:
+            for phrase, text in translations.items():
+                self._entries[phrase, lang] = text
+            if self._conn:
+                self._conn.executemany("INSERT OR REPLACE INTO translations VALUES (?, ?, ?)",
+                                       [(phrase, lang, text) for phrase, text in translations.items()])
+                self._conn.commit()
+
+    def close(self):
+        if self._conn:
+            self._conn.close()
+
+
+class TranslationLayer:
+    """Cached, batched translation of Friday's replies
+
+    A reply is split into sentences; cached ones cost a dict lookup and
+    the rest go to the backend in a single batch. prewarm() fills the
+    cache for fixed response strings ahead of time, in the background.
+    """
+
+    def __init__(self, backend, cache=None, source="en"):
+        self.backend = backend
+        self.cache = cache if cache is not None else PhraseCache()
+        self.source = source
+        self.stats = collections.Counter()
+        self._warmed = set()
+        self._warming = set()
+        self._lock = threading.Lock()
+
+    def translate(self, text, lang):
+        if not lang or lang == self.source or not text.strip():
+            return text
+        sentences = split_sentences(text)
+        missing = [s for s in dict.fromkeys(sentences) if self.cache.get(s, lang) is None]
+        self.stats["hits"] += len(sentences) - len(missing)
+        if missing:
+            self._fetch(missing, lang)
+        return " ".join(self.cache.get(s, lang) or s for s in sentences)
+
+    def prewarm(self, phrases, lang, background=True):
+        """Translate phrases into lang once; returns the thread when run in the background
+
+        A failed prewarm is tried again the next time lang is prewarmed.
+        """
+        with self._lock:
+            if lang == self.source or lang in self._warmed or lang in self._warming:
+                return None
+            self._warming.add(lang)
+        sentences = dict.fromkeys(s for phrase in phrases for s in split_sentences(phrase))
+
+        def warm():
+            done = False
+            try:
+                missing = [s for s in sentences if self.cache.get(s, lang) is None]
+                if missing:
+                    self._fetch(missing, lang)
+                done = True
+            except Exception as e:
+                print(f"Translation prewarm error: {e}")
+            finally:
+                with self._lock:
+                    self._warming.discard(lang)
+                    if done:
+                        self._warmed.add(lang)
+
+        if not background:
+            warm()
+            return None
+        thread = threading.Thread(target=warm, name=f"prewarm-{lang}", daemon=True)
+        thread.start()
+        return thread
+
+    def _fetch(self, sentences, lang):
+        translated = self.backend.translate(sentences, lang)
+        self.stats["misses"] += len(sentences)
+        self.stats["backend_calls"] += 1
+        self.cache.update(lang, dict(zip(sentences, translated)))
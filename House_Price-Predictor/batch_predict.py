@@ -0,0 +1,205 @@
+import argparse
+import collections
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from data import CATEGORICAL_FEATURES, FEATURES, NUMERICAL_FEATURES
+from model_store import load_artifact, latest_artifact_path
+
+PREDICTION_COLUMN = 'predicted_price'
+# Why a row could not be scored; empty for scored rows
+ERROR_COLUMN = 'error'
+
+# Model loaded once per worker process by _init_worker
+_worker_model = None
+
+
+def iter_chunks(path, chunk_size, columns=None):
+    """Yield DataFrames of at most chunk_size rows from a CSV or Parquet file"""
+    if path.endswith(('.parquet', '.pq')):
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size, usecols=columns)
+
+
+class PredictionWriter:
+    """Append prediction chunks to a CSV or Parquet output file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet = path.endswith(('.parquet', '.pq'))
+        self._writer = None
+        self._header = True
+
+    def write(self, frame):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            frame.to_csv(self.path, mode='w' if self._header else 'a', header=self._header, index=False)
+            self._header = False
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def clean_chunk(chunk):
+    """The chunk's features coerced as serve.validate_row does, and an error per row
+
+    Numbers become finite floats ("1,200" is accepted, as in the listings)
+    and categories strings. Rows with a missing or unparseable value get
+    an error message, '' otherwise.
+    """
+    missing = [f for f in FEATURES if f not in chunk.columns]
+    if missing:
+        raise ValueError(f"input has no column(s): {', '.join(missing)}")
+    features = pd.DataFrame(index=chunk.index)
+    errors = pd.Series('', index=chunk.index, dtype=object)
+    for f in NUMERICAL_FEATURES:
+        column = chunk[f]
+        if pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column):
+            values = column.astype(float)
+        else:
+            text = column.astype(str).str.replace(',', '', regex=False).str.strip()
+            values = pd.to_numeric(text, errors='coerce').astype(float)
+            values[column.isna() | column.map(lambda v: isinstance(v, bool))] = np.nan
+        bad = ~np.isfinite(values) & (errors == '')
+        errors[bad] = f"{f} must be a finite number"
+        features[f] = values
+    for f in CATEGORICAL_FEATURES:
+        column = chunk[f]
+        bad = column.isna() & (errors == '')
+        errors[bad] = f"{f} is missing"
+        features[f] = column.astype(str)
+    return features, errors
+
+
+def predict_chunk(model, chunk, id_column=None):
+    """Score one chunk: the id (if any), the prediction and an error column
+
+    Bad rows are not scored but kept, with the reason in ERROR_COLUMN. If
+    the model rejects the clean rows as a whole, they are scored one at a
+    time so only the offending rows fail.
+    """
+    features, errors = clean_chunk(chunk)
+    out = pd.DataFrame(index=chunk.index)
+    if id_column:
+        out[id_column] = chunk[id_column].values
+    out[PREDICTION_COLUMN] = np.nan
+    ok = errors == ''
+    if ok.any():
+        try:
+            out.loc[ok, PREDICTION_COLUMN] = model.predict(features[ok])
+        except Exception:
+            for index in features.index[ok]:
+                try:
+                    out.loc[index, PREDICTION_COLUMN] = model.predict(features.loc[[index]])[0]
+                except Exception as e:
+                    errors[index] = f"{type(e).__name__}: {e}"
+    out[ERROR_COLUMN] = errors.values
+    return out
+
+
+def _init_worker(artifact_path):
+    global _worker_model
+    _worker_model = load_artifact(artifact_path)["pipeline"]
+
+
+def _predict_in_worker(chunk, id_column):
+    return predict_chunk(_worker_model, chunk, id_column)
+
+
+def peak_memory_mb():
+    """Peak resident memory of this process (and finished children) in MB"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return float('nan')
+    # ru_maxrss is KB on Linux and bytes on macOS
+    scale = 1 / (1024 * 1024) if sys.platform == 'darwin' else 1 / 1024
+    self_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    child_peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(self_peak, child_peak) * scale
+
+
+def run_batch(input_path, output_path, artifact_path=None, chunk_size=100_000, workers=0, id_column=None):
+    """Stream input_path through the model into output_path and return run stats"""
+    artifact_path = artifact_path or latest_artifact_path()
+    artifact = load_artifact(artifact_path)
+    columns = FEATURES + ([id_column] if id_column else [])
+    writer = PredictionWriter(output_path)
+    counts = collections.Counter()
+    start = time.perf_counter()
+
+    def write(result):
+        writer.write(result)
+        counts["rows"] += len(result)
+        counts["failed"] += int((result[ERROR_COLUMN] != '').sum())
+
+    try:
+        if workers <= 0:
+            model = artifact["pipeline"]
+            for chunk in iter_chunks(input_path, chunk_size, columns):
+                write(predict_chunk(model, chunk, id_column))
+        else:
+            # Keep at most 2 chunks per worker in flight so memory stays bounded,
+            # and write results in input order
+            pending = collections.deque()
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(artifact_path,)) as pool:
+                for chunk in iter_chunks(input_path, chunk_size, columns):
+                    pending.append(pool.submit(_predict_in_worker, chunk, id_column))
+                    if len(pending) >= workers * 2:
+                        write(pending.popleft().result())
+                while pending:
+                    write(pending.popleft().result())
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    rows = counts["rows"]
+    return {
+        "rows": rows,
+        "failed_rows": counts["failed"],
+        "seconds": elapsed,
+        "rows_per_sec": rows / elapsed if elapsed > 0 else float('inf'),
+        "peak_memory_mb": peak_memory_mb(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a CSV/Parquet file of listings in bounded-memory chunks")
+    parser.add_argument("input", help="input .csv or .parquet file")
+    parser.add_argument("output", help="output .csv or .parquet file")
+    parser.add_argument("--artifact", help="model artifact path (default: latest)")
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=0,
+                        help="process pool size (0 = score in this process, -1 = one per CPU)")
+    parser.add_argument("--id-column", help="input column to copy into the output")
+    args = parser.parse_args(argv)
+
+    if args.workers < 0:
+        args.workers = os.cpu_count() or 1
+
+    stats = run_batch(args.input, args.output, args.artifact, args.chunk_size, args.workers, args.id_column)
+    print(f"Scored {stats['rows']:,} rows in {stats['seconds']:.2f}s "
+          f"({stats['rows_per_sec']:,.0f} rows/sec), peak memory {stats['peak_memory_mb']:.1f} MB")
+    if stats['failed_rows']:
+        print(f"{stats['failed_rows']:,} rows could not be scored; see the '{ERROR_COLUMN}' column")
+
+
+if __name__ == "__main__":
+    main()
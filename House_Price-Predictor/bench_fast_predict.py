@@ -0,0 +1,79 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from data import FEATURES
+from fast_predict import CompiledPredictor, compile_pipeline
+from model_store import load_artifact
+
+
+def sample_rows(schema, n, seed=42):
+    """Random rows drawn from the artifact's known categories, plus a few unknowns"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for _ in range(n):
+        row = {
+            'area': float(rng.uniform(300, 3000)),
+            'bedrooms': int(rng.integers(1, 6)),
+            'bathroom': int(rng.integers(1, 5)),
+            'parking': int(rng.integers(0, 3)),
+        }
+        for col in schema["categorical"]:
+            known = schema["categories"][col]
+            row[col] = known[rng.integers(len(known))] if rng.random() > 0.05 else "unseen"
+        rows.append(row)
+    return rows
+
+
+def time_per_row(fn, rows):
+    start = time.perf_counter()
+    for row in rows:
+        fn(row)
+    return (time.perf_counter() - start) / len(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the NumPy fast path against model.predict")
+    parser.add_argument("--artifact", help="model artifact path (default: latest)")
+    parser.add_argument("--rows", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    artifact = load_artifact(args.artifact)
+    model = artifact["pipeline"]
+    fast = CompiledPredictor(compile_pipeline(model))
+    rows = sample_rows(artifact["schema"], args.rows)
+
+    # Correctness: compiled results must match the sklearn pipeline
+    frame = pd.DataFrame(rows, columns=FEATURES)
+    expected = model.predict(frame)
+    single = np.array([fast.predict_one(r) for r in rows])
+    records = frame.to_records(index=False)
+    vectorized = fast.predict(records)
+    tol = dict(rtol=1e-9, atol=1e-6 * max(1.0, float(np.abs(expected).max())))
+    assert np.allclose(single, expected, **tol), "predict_one diverges from model.predict"
+    assert np.allclose(vectorized, expected, **tol), "predict diverges from model.predict"
+    print(f"Max abs difference vs model.predict: {np.abs(single - expected).max():.3e}")
+
+    # Latency: the old single-row path builds a DataFrame per call
+    def sklearn_single(row):
+        return model.predict(pd.DataFrame({k: [row[k]] for k in FEATURES}))[0]
+
+    slow = time_per_row(sklearn_single, rows[:min(len(rows), 500)])
+    quick = time_per_row(fast.predict_one, rows)
+    print(f"Single row, DataFrame + pipeline: {slow * 1e6:10.1f} µs/row")
+    print(f"Single row, compiled predict_one: {quick * 1e6:10.1f} µs/row ({slow / quick:,.0f}x faster)")
+
+    start = time.perf_counter()
+    model.predict(frame)
+    batch_slow = time.perf_counter() - start
+    start = time.perf_counter()
+    fast.predict(records)
+    batch_quick = time.perf_counter() - start
+    print(f"Batch of {len(rows)}, pipeline:         {batch_slow * 1e3:10.2f} ms")
+    print(f"Batch of {len(rows)}, compiled predict: {batch_quick * 1e3:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import urllib.request
+
+import pandas as pd
+
+# Mumbai House Prices dataset
+DATA_URL = "https://raw.githubusercontent.com/rupeshraundal/mumbai-house-prices/main/Mumbai1.csv"
+
+# Small synthetic CSV in the same raw format, for offline runs
+FIXTURE_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "Mumbai_sample.csv")
+
+# Downloaded raw files and cleaned Parquet frames live here
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+
+# Column schema used by training and prediction
+CATEGORICAL_FEATURES = ['locality', 'status', 'transaction', 'type']
+NUMERICAL_FEATURES = ['area', 'bedrooms', 'bathroom', 'parking']
+FEATURES = NUMERICAL_FEATURES + CATEGORICAL_FEATURES
+TARGET = 'price'
+
+# Bump when clean_data changes so stale cached frames are not reused
+CLEAN_VERSION = 1
+
+
+def clean_data(data):
+    """Select, rename and clean the raw listing columns"""
+    # Select relevant columns and rename for consistency
+    data = data[['area', 'Bedroom', 'bathroom', 'locality', 'parking', 'status', 'transaction', 'type', 'price']]
+    data = data.rename(columns={'Bedroom': 'bedrooms'})
+
+    # Remove rows with missing values
+    data = data.dropna()
+
+    # Convert area to float (handle comma separator)
+    data['area'] = data['area'].astype(str).str.replace(',', '').astype(float)
+
+    # Categorical dtypes keep the columnar cache small and fast to read
+    for col in CATEGORICAL_FEATURES:
+        data[col] = data[col].astype(str).astype('category')
+    return data.reset_index(drop=True)
+
+
+def file_checksum(path, block_size=1 << 20):
+    """SHA-256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def is_url(source):
+    return source.startswith(('http://', 'https://'))
+
+
+def fetch_raw(url, cache_dir=CACHE_DIR, refresh=False, offline=False):
+    """Download url into the cache once and return the local path"""
+    raw_dir = os.path.join(cache_dir, "raw")
+    path = os.path.join(raw_dir, os.path.basename(url))
+    if os.path.exists(path) and not refresh:
+        return path
+    if offline:
+        raise FileNotFoundError(f"{url} is not cached and offline mode is on; "
+                                f"pass a local CSV such as {FIXTURE_CSV}")
+
+    os.makedirs(raw_dir, exist_ok=True)
+    # Download to a temp file first so an interrupted fetch never looks cached
+    fd, tmp = tempfile.mkstemp(dir=raw_dir, suffix=".part")
+    try:
+        with os.fdopen(fd, 'wb') as out, urllib.request.urlopen(url, timeout=60) as response:
+            shutil.copyfileobj(response, out)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    return path
+
+
+def load_dataset(source=DATA_URL, cache_dir=CACHE_DIR, refresh=False, offline=False, use_cache=True):
+    """Load the cleaned dataset from a URL or local CSV
+
+    URLs are downloaded once. The cleaned frame is cached as Parquet keyed by
+    the raw file's checksum, so later runs skip both download and cleaning.
+    """
+    if not use_cache:
+        return clean_data(pd.read_csv(source))
+
+    path = fetch_raw(source, cache_dir, refresh, offline) if is_url(source) else source
+    checksum = file_checksum(path)
+    cached = os.path.join(cache_dir, f"clean-v{CLEAN_VERSION}-{checksum[:16]}.parquet")
+
+    if os.path.exists(cached) and not refresh:
+        return pd.read_parquet(cached)
+
+    data = clean_data(pd.read_csv(path))
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = cached + ".part"
+    data.to_parquet(tmp, index=False)
+    os.replace(tmp, cached)
+    return data
+
+
+def data_hash(data):
+    """Stable SHA-256 digest of a cleaned dataset (values and column order)"""
+    digest = hashlib.sha256()
+    digest.update(",".join(data.columns).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=False).values.tobytes())
+    return digest.hexdigest()
@@ -0,0 +1,115 @@
+import argparse
+import json
+import os
+
+import numpy as np
+
+from model_store import load_artifact, latest_artifact_path
+
+COMPILED_FORMAT = 1
+
+
+def compile_pipeline(model):
+    """Flatten a fitted StandardScaler + OneHotEncoder + LinearRegression pipeline
+
+    Returns a plain dict: numeric means, scales and coefficients, a
+    category -> coefficient map per categorical column and the intercept.
+    """
+    preprocessor = model.named_steps['preprocessor']
+    regressor = model.named_steps['regressor']
+    scaler = preprocessor.named_transformers_['num']
+    encoder = preprocessor.named_transformers_['cat']
+
+    if getattr(encoder, 'drop_idx_', None) is not None:
+        raise ValueError("OneHotEncoder with drop= is not supported by the fast path")
+
+    columns = {name: list(cols) for name, _, cols in preprocessor.transformers_}
+    numerical, categorical = columns['num'], columns['cat']
+    coef = np.ravel(regressor.coef_)
+    n_num = len(numerical)
+
+    # ColumnTransformer output order: scaled numerics, then one-hot blocks per column
+    categories = {}
+    offset = n_num
+    for col, cats in zip(categorical, encoder.categories_):
+        categories[col] = {str(c): float(w) for c, w in zip(cats, coef[offset:offset + len(cats)])}
+        offset += len(cats)
+    if offset != len(coef):
+        raise ValueError(f"Expected {offset} coefficients, pipeline has {len(coef)}")
+
+    mean = scaler.mean_ if scaler.with_mean else np.zeros(n_num)
+    scale = scaler.scale_ if scaler.with_std else np.ones(n_num)
+    return {
+        "format": COMPILED_FORMAT,
+        "numerical": numerical,
+        "mean": [float(v) for v in mean],
+        "scale": [float(v) for v in scale],
+        "coef": [float(v) for v in coef[:n_num]],
+        "categorical": categorical,
+        "categories": categories,
+        "intercept": float(np.ravel(regressor.intercept_)[0]),
+    }
+
+
+class CompiledPredictor:
+    """Score rows from the flat arrays produced by compile_pipeline"""
+
+    def __init__(self, compiled):
+        if compiled.get("format") != COMPILED_FORMAT:
+            raise ValueError(f"Unsupported compiled model format {compiled.get('format')!r}")
+        self.numerical = compiled["numerical"]
+        self.categorical = compiled["categorical"]
+        self.mean = np.asarray(compiled["mean"], dtype=np.float64)
+        self.scale = np.asarray(compiled["scale"], dtype=np.float64)
+        self.coef = np.asarray(compiled["coef"], dtype=np.float64)
+        self.categories = compiled["categories"]
+        self.intercept = compiled["intercept"]
+        # Plain-float copies: per-element numpy scalar math is slower than Python floats
+        self._num = list(zip(self.numerical, compiled["mean"], compiled["scale"], compiled["coef"]))
+        self._cat = [(col, self.categories[col]) for col in self.categorical]
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def predict_one(self, row):
+        """Score a single mapping of feature name -> value"""
+        total = self.intercept
+        for name, mean, scale, coef in self._num:
+            total += (float(row[name]) - mean) / scale * coef
+        # Unknown categories contribute nothing, as with handle_unknown='ignore'
+        for col, lookup in self._cat:
+            total += lookup.get(str(row[col]), 0.0)
+        return total
+
+    def predict(self, rows):
+        """Score a structured NumPy array (or a dict of equal-length columns)"""
+        numeric = np.column_stack([np.asarray(rows[name], dtype=np.float64) for name in self.numerical])
+        result = ((numeric - self.mean) / self.scale) @ self.coef + self.intercept
+        for col, lookup in self._cat:
+            result += np.fromiter((lookup.get(str(v), 0.0) for v in rows[col]),
+                                  dtype=np.float64, count=len(result))
+        return result
+
+
+def export_compiled(artifact_path=None, out_path=None):
+    """Compile an artifact's pipeline and write it next to the artifact as JSON"""
+    artifact_path = artifact_path or latest_artifact_path()
+    compiled = compile_pipeline(load_artifact(artifact_path)["pipeline"])
+    out_path = out_path or os.path.splitext(artifact_path)[0] + ".fast.json"
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(compiled, f)
+    return out_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a trained pipeline to the NumPy fast-path format")
+    parser.add_argument("--artifact", help="model artifact path (default: latest)")
+    parser.add_argument("--out", help="output JSON path (default: next to the artifact)")
+    args = parser.parse_args(argv)
+    print(f"Compiled model written to {export_compiled(args.artifact, args.out)}")
+
+
+if __name__ == "__main__":
+    main()
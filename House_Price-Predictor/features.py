@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.compose import ColumnTransformer
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.pipeline import Pipeline, make_pipeline
+from sklearn.preprocessing import FunctionTransformer, OneHotEncoder, StandardScaler, TargetEncoder
+
+from data import CATEGORICAL_FEATURES, NUMERICAL_FEATURES
+
+# How the high-cardinality locality column is encoded
+#   onehot    - dense-threshold ColumnTransformer + LinearRegression (original model)
+#   sparse    - sparse one-hot end to end + Ridge with a sparse solver
+#   hashing   - locality hashed into locality_cap buckets, sparse + Ridge
+#   target    - locality replaced by its smoothed mean price (TargetEncoder) + Ridge
+#   frequency - locality replaced by its share of training rows + Ridge
+STRATEGIES = ['onehot', 'sparse', 'hashing', 'target', 'frequency']
+
+LOW_CARDINALITY = [c for c in CATEGORICAL_FEATURES if c != 'locality']
+
+
+class FrequencyEncoder(BaseEstimator, TransformerMixin):
+    """Replace each category with its relative frequency in the training data"""
+
+    def fit(self, X, y=None):
+        X = pd.DataFrame(X)
+        self.frequencies_ = [X[col].astype(str).value_counts(normalize=True).to_dict() for col in X.columns]
+        self.n_features_in_ = X.shape[1]
+        return self
+
+    def transform(self, X):
+        X = pd.DataFrame(X)
+        return np.column_stack([X[col].astype(str).map(freq).fillna(0.0).to_numpy(dtype=np.float64)
+                                for col, freq in zip(X.columns, self.frequencies_)])
+
+    def get_feature_names_out(self, input_features=None):
+        if input_features is None:
+            input_features = [f"x{i}" for i in range(self.n_features_in_)]
+        return np.asarray([f"{name}_frequency" for name in input_features], dtype=object)
+
+
+def _as_string_lists(X):
+    """FeatureHasher(input_type='string') wants one list of tokens per row"""
+    return [[str(v)] for v in np.asarray(X).ravel()]
+
+
+def build_preprocessor(strategy='onehot', locality_cap=None):
+    """ColumnTransformer for the given locality encoding strategy"""
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy {strategy!r}; choose from {', '.join(STRATEGIES)}")
+
+    if strategy == 'onehot':
+        return ColumnTransformer(
+            transformers=[
+                ('num', StandardScaler(), NUMERICAL_FEATURES),
+                ('cat', OneHotEncoder(handle_unknown='ignore'), CATEGORICAL_FEATURES)
+            ])
+
+    if strategy == 'sparse':
+        # locality_cap keeps the most frequent localities and folds the rest into one column
+        encoder = (OneHotEncoder(handle_unknown='infrequent_if_exist', max_categories=locality_cap)
+                   if locality_cap else OneHotEncoder(handle_unknown='ignore'))
+        return ColumnTransformer(
+            transformers=[
+                ('num', StandardScaler(), NUMERICAL_FEATURES),
+                ('cat', OneHotEncoder(handle_unknown='ignore'), LOW_CARDINALITY),
+                ('locality', encoder, ['locality'])
+            ], sparse_threshold=1.0)
+
+    if strategy == 'hashing':
+        locality = make_pipeline(FunctionTransformer(_as_string_lists),
+                                 FeatureHasher(n_features=locality_cap or 1024, input_type='string'))
+        sparse_threshold = 1.0
+    elif strategy == 'target':
+        # Encoded values are on the price scale; standardise them to keep the ridge system well conditioned
+        locality = make_pipeline(TargetEncoder(target_type='continuous'), StandardScaler())
+        sparse_threshold = 0.0
+    else:
+        locality = FrequencyEncoder()
+        sparse_threshold = 0.0
+
+    return ColumnTransformer(
+        transformers=[
+            ('num', StandardScaler(), NUMERICAL_FEATURES),
+            ('cat', OneHotEncoder(handle_unknown='ignore'), LOW_CARDINALITY),
+            ('locality', locality, ['locality'])
+        ], sparse_threshold=sparse_threshold)
+
+
+def build_regressor(strategy='onehot', alpha=1.0):
+    if strategy == 'onehot':
+        return LinearRegression()
+    # sparse_cg works directly on CSR input, including the intercept
+    return Ridge(alpha=alpha, solver='sparse_cg' if strategy in ('sparse', 'hashing') else 'auto')
+
+
+def build_pipeline(strategy='onehot', locality_cap=None, alpha=1.0):
+    """Unfitted preprocessing + regressor pipeline for a locality strategy"""
+    return Pipeline(steps=[
+        ('preprocessor', build_preprocessor(strategy, locality_cap)),
+        ('regressor', build_regressor(strategy, alpha))
+    ])
@@ -0,0 +1,141 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.preprocessing import StandardScaler, OneHotEncoder
+from sklearn.compose import ColumnTransformer
+from sklearn.linear_model import LinearRegression
+from sklearn.pipeline import Pipeline
+
+from data import CATEGORICAL_FEATURES, NUMERICAL_FEATURES, TARGET, clean_data
+
+# StandardScaler attributes learned by partial_fit in the first pass
+_SCALER_ATTRS = ('mean_', 'var_', 'scale_', 'n_samples_seen_')
+
+
+def iter_clean_chunks(path, chunk_size):
+    """Yield cleaned DataFrames of at most chunk_size raw rows"""
+    for chunk in pd.read_csv(path, chunksize=chunk_size):
+        chunk = clean_data(chunk)
+        if len(chunk):
+            yield chunk
+
+
+def test_mask(n, chunk_no, test_size, seed):
+    """Deterministic per-chunk holdout mask"""
+    return np.random.default_rng([seed, chunk_no]).random(n) < test_size
+
+
+class NormalEquations:
+    """Running sums for least squares: X'X, X'y, sum(x), sum(y), y'y, n"""
+
+    def __init__(self, n_features):
+        self.xtx = np.zeros((n_features, n_features))
+        self.xty = np.zeros(n_features)
+        self.sx = np.zeros(n_features)
+        self.sy = 0.0
+        self.yty = 0.0
+        self.n = 0
+
+    def update(self, X, y):
+        if sparse.issparse(X):
+            self.xtx += (X.T @ X).toarray()
+            self.sx += np.asarray(X.sum(axis=0)).ravel()
+        else:
+            self.xtx += X.T @ X
+            self.sx += X.sum(axis=0)
+        self.xty += X.T @ y
+        self.sy += y.sum()
+        self.yty += y @ y
+        self.n += len(y)
+
+    def solve(self):
+        """Minimum-norm solution on centered data, as LinearRegression computes it"""
+        mx = self.sx / self.n
+        my = self.sy / self.n
+        centered_xtx = self.xtx - self.n * np.outer(mx, mx)
+        centered_xty = self.xty - self.n * mx * my
+        coef = np.linalg.lstsq(centered_xtx, centered_xty, rcond=None)[0]
+        return coef, my - mx @ coef
+
+    def score(self, coef, intercept):
+        """(rmse, r2) of a linear model on the accumulated rows, without revisiting them"""
+        w = np.append(coef, intercept)
+        xtx = np.block([[self.xtx, self.sx[:, None]], [self.sx[None, :], np.array([[self.n]])]])
+        xty = np.append(self.xty, self.sy)
+        sse = self.yty - 2 * w @ xty + w @ xtx @ w
+        sst = self.yty - self.sy ** 2 / self.n
+        return float(np.sqrt(max(sse, 0.0) / self.n)), float(1 - sse / sst)
+
+
+def fit_preprocessor(path, chunk_size):
+    """First pass: scaler statistics and category vocabularies"""
+    scaler = StandardScaler()
+    vocab = {col: set() for col in CATEGORICAL_FEATURES}
+    first = None
+    for chunk in iter_clean_chunks(path, chunk_size):
+        if first is None:
+            first = chunk
+        scaler.partial_fit(chunk[NUMERICAL_FEATURES])
+        for col in CATEGORICAL_FEATURES:
+            vocab[col].update(chunk[col].astype(str).unique())
+    if first is None:
+        raise ValueError(f"No usable rows in {path}")
+
+    preprocessor = ColumnTransformer(
+        transformers=[
+            ('num', StandardScaler(), NUMERICAL_FEATURES),
+            ('cat', OneHotEncoder(categories=[sorted(vocab[c]) for c in CATEGORICAL_FEATURES],
+                                  handle_unknown='ignore'), CATEGORICAL_FEATURES)
+        ])
+    # Fit on one chunk to set up the transformer, then swap in the full-data statistics
+    preprocessor.fit(first)
+    fitted_scaler = preprocessor.named_transformers_['num']
+    for attr in _SCALER_ATTRS:
+        setattr(fitted_scaler, attr, getattr(scaler, attr))
+    return preprocessor
+
+
+def train_incremental(path, chunk_size=100_000, test_size=0.2, random_state=42):
+    """Two-pass out-of-core fit; returns (model, metrics) like train.train"""
+    preprocessor = fit_preprocessor(path, chunk_size)
+
+    # Second pass: accumulate normal equations for train and holdout rows
+    train_eq = test_eq = None
+    for chunk_no, chunk in enumerate(iter_clean_chunks(path, chunk_size)):
+        X = preprocessor.transform(chunk)
+        y = chunk[TARGET].to_numpy(dtype=np.float64)
+        if train_eq is None:
+            train_eq, test_eq = NormalEquations(X.shape[1]), NormalEquations(X.shape[1])
+        mask = test_mask(len(y), chunk_no, test_size, random_state)
+        train_eq.update(X[~mask], y[~mask])
+        if mask.any():
+            test_eq.update(X[mask], y[mask])
+
+    coef, intercept = train_eq.solve()
+    regressor = LinearRegression()
+    regressor.coef_ = coef
+    regressor.intercept_ = intercept
+    regressor.n_features_in_ = len(coef)
+    model = Pipeline(steps=[('preprocessor', preprocessor), ('regressor', regressor)])
+
+    rmse, r2 = test_eq.score(coef, intercept) if test_eq.n else (float('nan'), float('nan'))
+    print("\nModel Performance (incremental):")
+    print(f"RMSE: {rmse:.2f}")
+    print(f"R² Score: {r2:.4f}")
+    return model, {"rmse": rmse, "r2": r2, "n_train": train_eq.n, "n_test": test_eq.n}
+
+
+def compare_with_closed_form(model, path, chunk_size=100_000, test_size=0.2, random_state=42):
+    """Refit LinearRegression in memory on the same rows and return the max relative prediction gap"""
+    chunks = list(iter_clean_chunks(path, chunk_size))
+    train_rows = pd.concat([c[~test_mask(len(c), i, test_size, random_state)] for i, c in enumerate(chunks)])
+    reference = Pipeline(steps=[('preprocessor', model.named_steps['preprocessor']),
+                                ('regressor', LinearRegression())])
+    # Only the regressor is refit; the preprocessor was already fit on all rows
+    X = reference.named_steps['preprocessor'].transform(train_rows)
+    reference.named_steps['regressor'].fit(X, train_rows[TARGET])
+
+    data = pd.concat(chunks)
+    expected = reference.predict(data)
+    actual = model.predict(data)
+    return float(np.max(np.abs(actual - expected)) / max(1.0, float(np.max(np.abs(expected)))))
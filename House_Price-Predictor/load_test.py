@@ -0,0 +1,98 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from stats import percentile
+
+# Sample values used to build random single-row requests
+LOCALITIES = ["Andheri West", "Bandra West", "Borivali East", "Chembur", "Powai", "Thane West"]
+STATUSES = ["Ready to Move", "Under Construction"]
+TRANSACTIONS = ["New Property", "Resale"]
+TYPES = ["Apartment", "Builder Floor"]
+
+
+def random_row(rng):
+    return {
+        "area": rng.randint(300, 3000),
+        "bedrooms": rng.randint(1, 5),
+        "bathroom": rng.randint(1, 4),
+        "parking": rng.randint(0, 2),
+        "locality": rng.choice(LOCALITIES),
+        "status": rng.choice(STATUSES),
+        "transaction": rng.choice(TRANSACTIONS),
+        "type": rng.choice(TYPES),
+    }
+
+
+async def http_request(reader, writer, host, method, path, payload=None):
+    """Send one keep-alive HTTP/1.1 request and return the decoded JSON body"""
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n"
+                 f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+
+    status_line = await reader.readline()
+    status = int(status_line.split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    data = json.loads(await reader.readexactly(length))
+    if status != 200:
+        raise RuntimeError(f"HTTP {status}: {data}")
+    return data
+
+
+async def worker(host, port, requests, latencies, rng):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(requests):
+            start = time.perf_counter()
+            await http_request(reader, writer, host, "POST", "/predict", random_row(rng))
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def run(host, port, concurrency, total, seed):
+    rng = random.Random(seed)
+    latencies = []
+    per_worker = max(1, total // concurrency)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(host, port, per_worker, latencies, random.Random(rng.random()))
+                           for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    ordered = sorted(latencies)
+    print(f"Requests: {len(ordered):,} with concurrency {concurrency} in {elapsed:.2f}s "
+          f"({len(ordered) / elapsed:,.0f} req/sec)")
+    print(f"Client latency: p50 {percentile(ordered, 50) * 1000:.2f} ms, "
+          f"p99 {percentile(ordered, 99) * 1000:.2f} ms")
+
+    reader, writer = await asyncio.open_connection(host, port)
+    metrics = await http_request(reader, writer, host, "GET", "/metrics")
+    writer.close()
+    print("Server metrics:")
+    print(json.dumps(metrics, indent=2))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the local prediction server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+    asyncio.run(run(args.host, args.port, args.concurrency, args.requests, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+import argparse
+import csv
+import os
+import statistics
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from sklearn.compose import TransformedTargetRegressor
+from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.linear_model import Lasso, LinearRegression, Ridge
+from sklearn.metrics import mean_squared_error, r2_score
+from sklearn.model_selection import KFold
+from sklearn.pipeline import Pipeline
+
+from data import DATA_URL, FEATURES, TARGET, load_dataset, data_hash
+from features import build_preprocessor
+from model_store import ARTIFACT_DIR, save_artifact
+
+# Preprocessing variants: name -> (features.py strategy, locality cap)
+PREPROCESSORS = {
+    'onehot': ('onehot', None),
+    'sparse-cap500': ('sparse', 500),
+    'target': ('target', None),
+    'frequency': ('frequency', None),
+}
+
+# Regressor grid: name -> factory. Each also runs with a log-price target.
+REGRESSORS = {
+    'linear': LinearRegression,
+    **{f'ridge-{a:g}': (lambda a=a: Ridge(alpha=a)) for a in (0.1, 1.0, 10.0, 100.0)},
+    **{f'lasso-{a:g}': (lambda a=a: Lasso(alpha=a, max_iter=5000)) for a in (10.0, 1000.0)},
+    'gbr': lambda: GradientBoostingRegressor(n_estimators=200, max_depth=3, random_state=42),
+}
+
+# Single-row predictions timed per candidate to estimate serving cost
+LATENCY_SAMPLES = 50
+
+# Data shared with worker processes by _init_worker
+_X = _y = None
+
+
+def build_regressor(name, log_target):
+    regressor = REGRESSORS[name]()
+    if log_target:
+        return TransformedTargetRegressor(regressor=regressor, func=np.log1p, inverse_func=np.expm1)
+    return regressor
+
+
+def candidate_names(regressors, log_target):
+    return [(r, log) for r in regressors for log in ((False, True) if log_target else (False,))]
+
+
+def _init_worker(X, y):
+    global _X, _y
+    _X, _y = X, y
+    # Lasso at small alphas rarely converges fully; the leaderboard shows the effect anyway
+    warnings.filterwarnings("ignore", category=ConvergenceWarning)
+
+
+def evaluate_fold(preprocessor_name, fold, train_idx, val_idx, candidates):
+    """Fit one preprocessing variant on a fold once, then every candidate on its output"""
+    strategy, cap = PREPROCESSORS[preprocessor_name]
+    X_train, X_val = _X.iloc[train_idx], _X.iloc[val_idx]
+    y_train, y_val = _y.iloc[train_idx], _y.iloc[val_idx]
+
+    # Preprocess once per fold; all candidates below reuse these matrices
+    preprocessor = build_preprocessor(strategy, cap)
+    Xt_train = preprocessor.fit_transform(X_train, y_train)
+    Xt_val = preprocessor.transform(X_val)
+    rows = [X_val.iloc[[i % len(X_val)]] for i in range(LATENCY_SAMPLES)]
+
+    results = []
+    for name, log_target in candidates:
+        regressor = build_regressor(name, log_target)
+        start = time.perf_counter()
+        try:
+            regressor.fit(Xt_train, y_train)
+        except (ValueError, TypeError) as e:
+            print(f"Skipping {preprocessor_name}/{name}: {e}")
+            continue
+        fit_seconds = time.perf_counter() - start
+        y_pred = regressor.predict(Xt_val)
+
+        # Serving cost: one row through preprocessing and model, as the app does it
+        latencies = []
+        for row in rows:
+            start = time.perf_counter()
+            regressor.predict(preprocessor.transform(row))
+            latencies.append(time.perf_counter() - start)
+
+        results.append({
+            "preprocessor": preprocessor_name,
+            "regressor": name,
+            "log_target": log_target,
+            "fold": fold,
+            "rmse": float(np.sqrt(mean_squared_error(y_val, y_pred))),
+            "r2": float(r2_score(y_val, y_pred)),
+            "fit_seconds": fit_seconds,
+            "predict_ms": statistics.median(latencies) * 1000,
+        })
+    return results
+
+
+def summarize(results):
+    """Average fold results per candidate, best RMSE first"""
+    grouped = {}
+    for r in results:
+        grouped.setdefault((r["preprocessor"], r["regressor"], r["log_target"]), []).append(r)
+    board = []
+    for (preprocessor, regressor, log_target), folds in grouped.items():
+        rmse = [f["rmse"] for f in folds]
+        board.append({
+            "preprocessor": preprocessor,
+            "regressor": regressor + (" (log y)" if log_target else ""),
+            "log_target": log_target,
+            "folds": len(folds),
+            "rmse": statistics.mean(rmse),
+            "rmse_std": statistics.stdev(rmse) if len(rmse) > 1 else 0.0,
+            "r2": statistics.mean(f["r2"] for f in folds),
+            "fit_seconds": statistics.mean(f["fit_seconds"] for f in folds),
+            "predict_ms": statistics.mean(f["predict_ms"] for f in folds),
+        })
+    return sorted(board, key=lambda r: r["rmse"])
+
+
+def run_search(data, preprocessors, regressors, folds=5, workers=None, log_target=True, seed=42):
+    X, y = data[FEATURES], data[TARGET]
+    candidates = candidate_names(regressors, log_target)
+    splits = list(KFold(n_splits=folds, shuffle=True, random_state=seed).split(X))
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(X, y)) as pool:
+        futures = [pool.submit(evaluate_fold, p, i, train_idx, val_idx, candidates)
+                   for p in preprocessors for i, (train_idx, val_idx) in enumerate(splits)]
+        for future in as_completed(futures):
+            results.extend(future.result())
+    return summarize(results)
+
+
+def print_leaderboard(board):
+    print(f"{'#':>3} {'preprocessor':<14} {'regressor':<20} {'RMSE':>14} {'± std':>12} "
+          f"{'R²':>7} {'fit (s)':>8} {'predict (ms)':>13}")
+    for i, r in enumerate(board, 1):
+        print(f"{i:>3} {r['preprocessor']:<14} {r['regressor']:<20} {r['rmse']:>14,.0f} {r['rmse_std']:>12,.0f} "
+              f"{r['r2']:>7.4f} {r['fit_seconds']:>8.3f} {r['predict_ms']:>13.3f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cross-validated search over regressors and preprocessing variants")
+    parser.add_argument("--data", default=DATA_URL, help="CSV URL or local path")
+    parser.add_argument("--offline", action="store_true", help="never download; use cached or local data")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--preprocessors", nargs="+", choices=list(PREPROCESSORS), default=list(PREPROCESSORS))
+    parser.add_argument("--regressors", nargs="+", choices=list(REGRESSORS), default=list(REGRESSORS))
+    parser.add_argument("--no-log-target", action="store_true", help="skip the log-price variants")
+    parser.add_argument("--out", help="write the leaderboard to this CSV file")
+    parser.add_argument("--save-best", action="store_true",
+                        help="refit the top candidate on all data and save it as an artifact")
+    args = parser.parse_args(argv)
+
+    data = load_dataset(args.data, offline=args.offline)
+    start = time.perf_counter()
+    board = run_search(data, args.preprocessors, args.regressors, args.folds, args.workers,
+                       log_target=not args.no_log_target)
+    print(f"Evaluated {len(board)} candidates x {args.folds} folds in {time.perf_counter() - start:.1f}s\n")
+    print_leaderboard(board)
+
+    if args.out:
+        with open(args.out, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(board[0]))
+            writer.writeheader()
+            writer.writerows(board)
+
+    if args.save_best:
+        best = board[0]
+        strategy, cap = PREPROCESSORS[best["preprocessor"]]
+        regressor_name = best["regressor"].replace(" (log y)", "")
+        model = Pipeline(steps=[
+            ('preprocessor', build_preprocessor(strategy, cap)),
+            ('regressor', build_regressor(regressor_name, best["log_target"]))
+        ])
+        model.fit(data[FEATURES], data[TARGET])
+        from train import build_schema
+        config = {"search": best["preprocessor"], "regressor": best["regressor"]}
+        metrics = {k: best[k] for k in ("rmse", "r2", "fit_seconds", "predict_ms")}
+        path = save_artifact(model, build_schema(model), data_hash(data), metrics, ARTIFACT_DIR, config)
+        print(f"\nSaved best model ({best['preprocessor']} / {best['regressor']}): {path}")
+
+
+if __name__ == "__main__":
+    main()
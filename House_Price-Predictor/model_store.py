@@ -0,0 +1,107 @@
+import datetime
+import glob
+import json
+import os
+import re
+
+import joblib
+
+# Bump when the artifact layout changes in an incompatible way
+ARTIFACT_FORMAT = 1
+
+ARTIFACT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "artifacts")
+ARTIFACT_PREFIX = "house_price_v"
+LATEST_FILE = "latest.json"
+
+_VERSION_RE = re.compile(re.escape(ARTIFACT_PREFIX) + r"(\d+)\.json")
+
+
+def _metadata_files(artifact_dir):
+    # Only house_price_vNNN.json; sidecars such as .fast.json are not metadata
+    paths = glob.glob(os.path.join(artifact_dir, ARTIFACT_PREFIX + "*.json"))
+    return sorted(p for p in paths if _VERSION_RE.fullmatch(os.path.basename(p)))
+
+
+def _read_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def next_version(artifact_dir=ARTIFACT_DIR):
+    """Return the version number the next saved artifact will get"""
+    versions = [int(_VERSION_RE.fullmatch(os.path.basename(p)).group(1)) for p in _metadata_files(artifact_dir)]
+    return max(versions, default=0) + 1
+
+
+def save_artifact(pipeline, schema, data_hash, metrics, artifact_dir=ARTIFACT_DIR, config=None):
+    """Save a fitted pipeline with its metadata as a new versioned artifact
+
+    config records the training options, so an artifact is only reused for
+    the same data *and* the same options.
+    """
+    os.makedirs(artifact_dir, exist_ok=True)
+    version = next_version(artifact_dir)
+    name = f"{ARTIFACT_PREFIX}{version:03d}"
+
+    metadata = {
+        "format": ARTIFACT_FORMAT,
+        "version": version,
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "data_hash": data_hash,
+        "config": config or {},
+        "schema": schema,
+        "metrics": metrics,
+        "model_file": name + ".joblib",
+    }
+
+    # Model first, then metadata, then the pointer, so a crash never leaves
+    # metadata referring to a missing model file
+    joblib.dump({"pipeline": pipeline, **metadata}, os.path.join(artifact_dir, name + ".joblib"))
+    with open(os.path.join(artifact_dir, name + ".json"), "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=2)
+    with open(os.path.join(artifact_dir, LATEST_FILE), "w", encoding="utf-8") as f:
+        json.dump({"version": version, "model_file": metadata["model_file"]}, f, indent=2)
+
+    return os.path.join(artifact_dir, metadata["model_file"])
+
+
+def find_artifact(data_hash, artifact_dir=ARTIFACT_DIR, config=None):
+    """Return the path of the newest artifact trained on data_hash with config, or None"""
+    for path in reversed(_metadata_files(artifact_dir)):
+        metadata = _read_json(path)
+        if (metadata.get("format") == ARTIFACT_FORMAT and metadata.get("data_hash") == data_hash
+                and metadata.get("config", {}) == (config or {})):
+            model_path = os.path.join(artifact_dir, metadata["model_file"])
+            if os.path.exists(model_path):
+                return model_path
+    return None
+
+
+def latest_artifact_path(artifact_dir=ARTIFACT_DIR):
+    """Return the path of the most recently saved artifact, or None"""
+    latest = os.path.join(artifact_dir, LATEST_FILE)
+    if not os.path.exists(latest):
+        return None
+    path = os.path.join(artifact_dir, _read_json(latest)["model_file"])
+    return path if os.path.exists(path) else None
+
+
+def mark_latest(path):
+    """Point latest.json at an existing artifact"""
+    artifact_dir = os.path.dirname(path)
+    metadata = _read_json(os.path.splitext(path)[0] + ".json")
+    with open(os.path.join(artifact_dir, LATEST_FILE), "w", encoding="utf-8") as f:
+        json.dump({"version": metadata["version"], "model_file": metadata["model_file"]}, f, indent=2)
+
+
+def load_artifact(path=None, artifact_dir=ARTIFACT_DIR):
+    """Load an artifact dict (pipeline plus metadata); defaults to the latest one"""
+    if path is None:
+        path = latest_artifact_path(artifact_dir)
+        if path is None:
+            raise FileNotFoundError(f"No trained model found in {artifact_dir}. Run `python train.py` first.")
+
+    artifact = joblib.load(path)
+    if artifact.get("format") != ARTIFACT_FORMAT:
+        raise ValueError(f"Unsupported artifact format {artifact.get('format')!r} in {path}")
+    return artifact
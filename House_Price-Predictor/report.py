@@ -0,0 +1,125 @@
+import datetime
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+REPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reports")
+
+# Above this many test points the actual-vs-predicted plot switches to a hexbin
+MAX_SCATTER_POINTS = 20_000
+# The KDE curve on the price histogram is fitted on at most this many prices
+MAX_KDE_POINTS = 50_000
+
+
+def _pyplot():
+    """Import pyplot on the non-interactive backend; only report workers pay for this"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def write_dataset_stats(path, shape, head, missing):
+    """Dataset shape, first rows and missing-value counts as plain text"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"Dataset Shape: {shape}\n")
+        f.write(f"\nFirst 5 Rows:\n{head}\n")
+        f.write(f"\nMissing Values:\n{missing}\n")
+    return path
+
+
+def plot_price_distribution(path, prices, seed=42):
+    plt = _pyplot()
+    import seaborn as sns
+
+    prices = np.asarray(prices)
+    plt.figure(figsize=(12, 8))
+    if len(prices) > MAX_KDE_POINTS:
+        # Histogram of everything, KDE on a sample: KDE cost grows with every point
+        sample = np.random.default_rng(seed).choice(prices, MAX_KDE_POINTS, replace=False)
+        plt.hist(prices, bins=100, density=True, alpha=0.5)
+        sns.kdeplot(sample)
+    else:
+        sns.histplot(prices, kde=True)
+    plt.title('House Price Distribution (Mumbai)')
+    plt.savefig(path, dpi=100, bbox_inches="tight")
+    plt.close()
+    return path
+
+
+def plot_predictions(path, y_true, y_pred):
+    plt = _pyplot()
+
+    y_true, y_pred = np.asarray(y_true), np.asarray(y_pred)
+    low, high = float(min(y_true.min(), y_pred.min())), float(max(y_true.max(), y_pred.max()))
+    plt.figure(figsize=(10, 6))
+    if len(y_true) > MAX_SCATTER_POINTS:
+        plt.hexbin(y_true, y_pred, gridsize=80, bins='log', mincnt=1)
+        plt.colorbar(label='listings (log scale)')
+    else:
+        plt.scatter(y_true, y_pred, alpha=0.5)
+    plt.plot([low, high], [low, high], 'r--')
+    plt.xlabel('Actual Prices (₹)')
+    plt.ylabel('Predicted Prices (₹)')
+    plt.title('Actual vs Predicted House Prices (Mumbai)')
+    plt.savefig(path, dpi=100, bbox_inches="tight")
+    plt.close()
+    return path
+
+
+def make_run_dir(path):
+    """Create the directory path, or path-2, path-3... if another run already took it"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    candidate, n = path, 1
+    while True:
+        try:
+            os.mkdir(candidate)
+            return candidate
+        except FileExistsError:
+            n += 1
+            candidate = f"{path}-{n}"
+
+
+class Reporter:
+    """Render report files in a background process so training never waits on plotting
+
+    A disabled Reporter accepts the same calls and does nothing.
+    """
+
+    def __init__(self, report_dir=REPORT_DIR, enabled=True):
+        self.enabled = enabled
+        self.run_dir = os.path.join(report_dir, datetime.datetime.now().strftime("%Y%m%d-%H%M%S"))
+        self._pool = None
+        self._futures = []
+
+    def submit(self, fn, filename, *args):
+        if not self.enabled:
+            return
+        if self._pool is None:
+            # Runs started in the same second get their own directory, never a shared one
+            self.run_dir = make_run_dir(self.run_dir)
+            self._pool = ProcessPoolExecutor(max_workers=1)
+        self._futures.append(self._pool.submit(fn, os.path.join(self.run_dir, filename), *args))
+
+    def dataset(self, data, target):
+        self.submit(write_dataset_stats, "dataset.txt", data.shape, data.head().to_string(),
+                    data.isnull().sum().to_string())
+        self.submit(plot_price_distribution, "price_distribution.png", data[target].to_numpy())
+
+    def predictions(self, y_true, y_pred):
+        self.submit(plot_predictions, "actual_vs_predicted.png", np.asarray(y_true), np.asarray(y_pred))
+
+    def close(self):
+        """Wait for outstanding reports and return the paths written"""
+        if self._pool is None:
+            return []
+        paths = []
+        for future in self._futures:
+            try:
+                paths.append(future.result())
+            except Exception as e:
+                print(f"Report error: {e}")
+        self._pool.shutdown()
+        self._pool = None
+        return paths
@@ -0,0 +1,279 @@
+import argparse
+import asyncio
+import bisect
+import collections
+import json
+import math
+import time
+
+import pandas as pd
+
+from data import CATEGORICAL_FEATURES, FEATURES, NUMERICAL_FEATURES
+from model_store import load_artifact
+from stats import percentile
+
+# Largest request body read; bigger ones get 413 without being read
+MAX_BODY_BYTES = 1 << 20
+
+# Upper bounds of the batch-size histogram buckets
+BATCH_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512]
+
+
+class LatencyStats:
+    """Rolling window of request latencies plus a batch-size histogram"""
+
+    def __init__(self, window=10_000):
+        self.latencies = collections.deque(maxlen=window)
+        self.batch_hist = collections.Counter()
+        self.requests = 0
+        self.batches = 0
+
+    def record_latency(self, seconds):
+        self.latencies.append(seconds)
+        self.requests += 1
+
+    def record_batch(self, size):
+        idx = bisect.bisect_left(BATCH_BUCKETS, size)
+        label = f"<={BATCH_BUCKETS[idx]}" if idx < len(BATCH_BUCKETS) else f">{BATCH_BUCKETS[-1]}"
+        self.batch_hist[label] += 1
+        self.batches += 1
+
+    def percentile(self, q):
+        return percentile(sorted(self.latencies), q)
+
+    def snapshot(self):
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "avg_batch_size": self.requests / self.batches if self.batches else 0.0,
+            "latency_ms": {
+                "p50": self.percentile(50) * 1000,
+                "p99": self.percentile(99) * 1000,
+            },
+            "batch_size_histogram": {label: self.batch_hist[label] for label in
+                                     [f"<={b}" for b in BATCH_BUCKETS] + [f">{BATCH_BUCKETS[-1]}"]
+                                     if self.batch_hist[label]},
+        }
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-row predictions into one vectorized call
+
+    A batch is flushed when it reaches max_batch rows or max_wait seconds
+    after its first row arrived, whichever comes first.
+    """
+
+    def __init__(self, predict_fn, max_batch=64, max_wait=0.005, stats=None):
+        self.predict_fn = predict_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.stats = stats or LatencyStats()
+        self._queue = asyncio.Queue()
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def predict(self, row):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            rows = [row for row, _ in batch]
+            self.stats.record_batch(len(rows))
+            try:
+                # Run the model off the event loop so new requests keep queueing
+                predictions = await loop.run_in_executor(None, self.predict_fn, rows)
+            except Exception:
+                # Find the bad row(s) rather than failing every request batched with them
+                predictions = await loop.run_in_executor(None, self._predict_each, rows)
+            for (_, future), value in zip(batch, predictions):
+                if future.done():
+                    continue
+                if isinstance(value, Exception):
+                    future.set_exception(value)
+                else:
+                    future.set_result(float(value))
+
+    def _predict_each(self, rows):
+        """One prediction or exception per row, scoring the rows one at a time"""
+        results = []
+        for row in rows:
+            try:
+                results.append(self.predict_fn([row])[0])
+            except Exception as e:
+                results.append(e)
+        return results
+
+
+def make_predict_fn(model):
+    """Wrap a fitted pipeline as rows -> predictions"""
+    def predict_rows(rows):
+        return model.predict(pd.DataFrame(rows, columns=FEATURES))
+    return predict_rows
+
+
+def validate_row(row):
+    """The model's fields of row, numbers as floats and categories as strings
+
+    Raises ValueError for anything the model can't score, so one bad row
+    is rejected before it is batched with other requests.
+    """
+    if not isinstance(row, dict):
+        raise ValueError("each row must be a JSON object")
+    missing = [f for f in FEATURES if f not in row]
+    if missing:
+        raise ValueError(f"missing fields: {', '.join(missing)}")
+    clean = {}
+    for f in NUMERICAL_FEATURES:
+        value = row[f]
+        if isinstance(value, str):
+            value = value.replace(',', '').strip()  # "1,200" as in the listings
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise ValueError(f"{f} must be a number, got {row[f]!r}")
+        try:
+            value = float(value)
+        except ValueError:
+            raise ValueError(f"{f} must be a number, got {row[f]!r}") from None
+        if not math.isfinite(value):
+            raise ValueError(f"{f} must be a finite number, got {row[f]!r}")
+        clean[f] = value
+    for f in CATEGORICAL_FEATURES:
+        value = row[f]
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            raise ValueError(f"{f} must be a string, got {value!r}")
+        clean[f] = str(value)
+    return clean
+
+
+class PredictionServer:
+    """Minimal HTTP/1.1 server: POST /predict, GET /metrics, GET /health"""
+
+    def __init__(self, batcher, max_body=MAX_BODY_BYTES):
+        self.batcher = batcher
+        self.max_body = max_body
+
+    async def handle_predict(self, body):
+        payload = json.loads(body or b"null")
+        rows = payload if isinstance(payload, list) else [payload]
+        rows = [validate_row(r) for r in rows]
+        predictions = await asyncio.gather(*(self.batcher.predict(r) for r in rows))
+        if isinstance(payload, list):
+            return {"predictions": predictions}
+        return {"prediction": predictions[0]}
+
+    async def route(self, method, path, body):
+        if method == "POST" and path == "/predict":
+            start = time.perf_counter()
+            try:
+                result = await self.handle_predict(body)
+            except ValueError as e:  # includes JSONDecodeError
+                return 400, {"error": str(e)}
+            except Exception as e:
+                print(f"Prediction error: {e!r}")
+                return 500, {"error": "internal error"}
+            self.batcher.stats.record_latency(time.perf_counter() - start)
+            return 200, result
+        if method == "GET" and path == "/metrics":
+            return 200, self.batcher.stats.snapshot()
+        if method == "GET" and path == "/health":
+            return 200, {"status": "ok"}
+        return 404, {"error": "not found"}
+
+    async def respond(self, writer, status, result, keep_alive):
+        payload = json.dumps(result).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + payload)
+        await writer.drain()
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if not 0 <= length <= self.max_body:
+                    # The body is left unread, so the connection can't be reused
+                    await self.respond(writer, 413, {"error": f"body must be at most {self.max_body} bytes"}, False)
+                    break
+                body = await reader.readexactly(length)
+
+                status, result = await self.route(method, path, body)
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                await self.respond(writer, status, result, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host, port, predict_fn, max_batch, max_wait, max_body=MAX_BODY_BYTES):
+    batcher = MicroBatcher(predict_fn, max_batch=max_batch, max_wait=max_wait)
+    batcher.start()
+    server = await asyncio.start_server(PredictionServer(batcher, max_body).handle_connection, host, port)
+    print(f"Serving predictions on http://{host}:{port}/predict "
+          f"(max batch {max_batch}, max wait {max_wait * 1000:.1f} ms)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await batcher.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve house price predictions over HTTP with micro-batching")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--artifact", help="model artifact path (default: latest)")
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--max-body", type=int, default=MAX_BODY_BYTES,
+                        help="largest request body in bytes; larger ones get 413")
+    args = parser.parse_args(argv)
+
+    model = load_artifact(args.artifact)["pipeline"]
+    try:
+        asyncio.run(serve(args.host, args.port, make_predict_fn(model), args.max_batch, args.max_wait_ms / 1000,
+                          args.max_body))
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import math
+
+import pandas as pd
+import pytest
+
+from batch_predict import ERROR_COLUMN, PREDICTION_COLUMN, clean_chunk, predict_chunk, run_batch
+from data import FEATURES, FIXTURE_CSV, TARGET, load_dataset
+from features import build_pipeline
+from model_store import save_artifact
+
+ROW = {"area": 1200, "bedrooms": 2, "bathroom": 2, "parking": 1,
+       "locality": "Andheri West", "status": "Ready to Move", "transaction": "Resale", "type": "Apartment"}
+
+
+@pytest.fixture(scope="module")
+def model():
+    data = load_dataset(FIXTURE_CSV, use_cache=False)
+    return build_pipeline().fit(data[FEATURES], data[TARGET])
+
+
+def test_clean_chunk_coerces_like_the_server():
+    chunk = pd.DataFrame([{**ROW, "area": "1,200"}, {**ROW, "bedrooms": "two"}, {**ROW, "parking": None},
+                          {**ROW, "locality": None}, {**ROW, "bathroom": float("inf")}])
+    features, errors = clean_chunk(chunk)
+    assert features.loc[0, "area"] == 1200.0
+    assert list(errors) == ["", "bedrooms must be a finite number", "parking must be a finite number",
+                            "locality is missing", "bathroom must be a finite number"]
+
+
+def test_bad_rows_get_an_error_instead_of_failing_the_chunk(model):
+    chunk = pd.DataFrame([ROW, {**ROW, "area": float("nan")}, {**ROW, "locality": "Nowhere"}])
+    out = predict_chunk(model, chunk)
+    assert list(out[ERROR_COLUMN]) == ["", "area must be a finite number", ""]
+    assert math.isnan(out.loc[1, PREDICTION_COLUMN])
+    assert out.loc[0, PREDICTION_COLUMN] == pytest.approx(model.predict(clean_chunk(chunk.iloc[[0]])[0])[0])
+
+
+def test_run_batch_counts_failed_rows(model, tmp_path):
+    artifact = save_artifact(model, {}, "test", {}, str(tmp_path / "artifacts"))
+    source = tmp_path / "listings.csv"
+    pd.DataFrame([{**ROW, "id": i, "area": "" if i % 3 == 0 else 500 + i} for i in range(10)]).to_csv(
+        source, index=False)
+    output = tmp_path / "predictions.csv"
+
+    stats = run_batch(str(source), str(output), artifact, chunk_size=4, id_column="id")
+
+    assert stats["rows"] == 10 and stats["failed_rows"] == 4
+    written = pd.read_csv(output, keep_default_na=False)
+    assert list(written["id"]) == list(range(10))
+    assert (written[ERROR_COLUMN] != "").sum() == 4
+
+
+class FussyModel:
+    """Fails any batch containing a type it has never seen, like an encoder with handle_unknown='error'"""
+
+    def predict(self, X):
+        if (X["type"] == "Bungalow").any():
+            raise ValueError("unknown category 'Bungalow'")
+        return X["area"].to_numpy() * 10
+
+
+def test_rows_are_scored_one_at_a_time_when_the_model_rejects_the_chunk():
+    chunk = pd.DataFrame([ROW, {**ROW, "type": "Bungalow"}, {**ROW, "area": 900}])
+    out = predict_chunk(FussyModel(), chunk)
+    assert list(out[PREDICTION_COLUMN].fillna(-1)) == [12000.0, -1, 9000.0]
+    assert list(out[ERROR_COLUMN]) == ["", "ValueError: unknown category 'Bungalow'", ""]
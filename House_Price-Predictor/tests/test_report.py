@@ -0,0 +1,18 @@
+import os
+
+from report import Reporter, make_run_dir, write_dataset_stats
+
+
+def test_runs_in_the_same_second_get_separate_directories(tmp_path):
+    base = str(tmp_path / "reports" / "20240101-120000")
+    assert [make_run_dir(base) for _ in range(3)] == [base, base + "-2", base + "-3"]
+
+
+def test_reporter_writes_into_its_own_run_directory(tmp_path):
+    first, second = Reporter(str(tmp_path)), Reporter(str(tmp_path))
+    second.run_dir = first.run_dir  # as if started in the same second
+    for reporter in (first, second):
+        reporter.submit(write_dataset_stats, "dataset.txt", (1, 1), "head", "missing")
+        reporter.close()
+    assert first.run_dir != second.run_dir
+    assert all(os.path.exists(os.path.join(r.run_dir, "dataset.txt")) for r in (first, second))
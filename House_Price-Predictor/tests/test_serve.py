@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from serve import MicroBatcher, PredictionServer, validate_row
+
+ROW = {"area": 1200, "bedrooms": 2, "bathroom": 2, "parking": 1,
+       "locality": "Andheri", "status": "Ready_to_move", "transaction": "Resale", "type": "Apartment"}
+
+
+def test_validate_row_coerces_fields():
+    row = validate_row({**ROW, "area": "1,200", "bedrooms": "3", "extra": "ignored"})
+    assert row["area"] == 1200.0 and row["bedrooms"] == 3.0
+    assert "extra" not in row
+
+
+@pytest.mark.parametrize("field,value", [("area", "abc"), ("area", None), ("area", True), ("area", float("nan")),
+                                         ("bedrooms", [2]), ("locality", {"name": "x"}), ("status", None)])
+def test_validate_row_rejects_bad_fields(field, value):
+    with pytest.raises(ValueError, match=field):
+        validate_row({**ROW, field: value})
+
+
+def fussy_model(rows):
+    """Fails the whole batch when any row has area 13, like a model choking on one bad value"""
+    if any(row["area"] == 13 for row in rows):
+        raise RuntimeError("unlucky row")
+    return [row["area"] * 10 for row in rows]
+
+
+def test_failed_batch_only_fails_the_bad_row():
+    async def run():
+        batcher = MicroBatcher(fussy_model, max_batch=8, max_wait=0.05)
+        batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.predict({"area": area}) for area in (1, 13, 2)),
+                                        return_exceptions=True)
+        finally:
+            await batcher.stop()
+
+    good, bad, other = asyncio.run(run())
+    assert (good, other) == (10.0, 20.0)
+    assert isinstance(bad, RuntimeError)
+
+
+def test_unexpected_errors_become_500():
+    async def run():
+        batcher = MicroBatcher(fussy_model, max_wait=0)
+        batcher.start()
+        try:
+            server = PredictionServer(batcher)
+            return (await server.route("POST", "/predict", b'{"area": 13, "bedrooms": 1, "bathroom": 1, '
+                                       b'"parking": 0, "locality": "a", "status": "b", "transaction": "c", "type": "d"}'),
+                    await server.route("POST", "/predict", b'{"area": "abc"}'))
+        finally:
+            await batcher.stop()
+
+    (status, body), (bad_status, _) = asyncio.run(run())
+    assert status == 500 and "error" in body
+    assert bad_status == 400
+
+
+def test_oversized_body_is_rejected_before_reading():
+    async def run():
+        batcher = MicroBatcher(fussy_model, max_wait=0)
+        batcher.start()
+        server = await asyncio.start_server(PredictionServer(batcher, max_body=100).handle_connection, "127.0.0.1", 0)
+        try:
+            reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+            # Only the headers are sent: the server must answer without waiting for the body
+            writer.write(b"POST /predict HTTP/1.1\r\nHost: x\r\nContent-Length: 1000000000\r\n\r\n")
+            response = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+            return response
+        finally:
+            server.close()
+            await server.wait_closed()
+            await batcher.stop()
+
+    response = asyncio.run(run())
+    assert response.startswith(b"HTTP/1.1 413 ")
+    assert b"Connection: close" in response and b"at most 100 bytes" in response
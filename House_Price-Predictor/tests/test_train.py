@@ -0,0 +1,18 @@
+import pytest
+
+import train
+
+
+@pytest.mark.parametrize("options", [["--strategy", "sparse"], ["--locality-cap", "20"], ["--alpha", "5"]])
+def test_incremental_rejects_encoder_options(options, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        train.main(["--incremental", "--offline", *options])
+    assert exit_info.value.code == 2
+    assert "--incremental only trains the onehot strategy" in capsys.readouterr().err
+
+
+def test_incremental_trains_onehot(tmp_path):
+    from data import FIXTURE_CSV
+    path = train.main(["--incremental", "--strategy", "onehot", "--data", FIXTURE_CSV,
+                       "--artifact-dir", str(tmp_path), "--chunk-size", "50"])
+    assert path.startswith(str(tmp_path))
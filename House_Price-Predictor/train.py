@@ -0,0 +1,173 @@
+import argparse
+import time
+
+import numpy as np
+import sklearn
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import OneHotEncoder
+from sklearn.metrics import mean_squared_error, r2_score
+
+from data import (DATA_URL, CATEGORICAL_FEATURES, NUMERICAL_FEATURES, TARGET,
+                  load_dataset, data_hash, fetch_raw, file_checksum, is_url)
+from features import STRATEGIES, build_pipeline
+from model_store import ARTIFACT_DIR, save_artifact, find_artifact, mark_latest
+from report import REPORT_DIR, Reporter
+
+
+def build_schema(model):
+    """Describe the input columns a fitted pipeline expects"""
+    categories = {}
+    for _, transformer, columns in model.named_steps['preprocessor'].transformers_:
+        if isinstance(transformer, OneHotEncoder):
+            for col, cats in zip(columns, transformer.categories_):
+                categories[col] = [str(c) for c in cats]
+    return {
+        "numerical": list(NUMERICAL_FEATURES),
+        "categorical": list(CATEGORICAL_FEATURES),
+        "target": TARGET,
+        "categories": categories,
+        "sklearn_version": sklearn.__version__,
+    }
+
+
+def train(data, test_size=0.2, random_state=42, reporter=None, verbose=False,
+          strategy='onehot', locality_cap=None, alpha=1.0):
+    """Fit the pipeline on an 80/20 split and return (model, metrics)
+
+    Plots and dataset stats go to reporter, which renders them in the
+    background; pass None to skip them.
+    """
+    reporter = reporter or Reporter(enabled=False)
+
+    # Display dataset information
+    print("Dataset Shape:", data.shape)
+    if verbose:
+        print("\nFirst 5 Rows:")
+        print(data.head())
+        print("\nMissing Values:")
+        print(data.isnull().sum())
+
+    # Stats and distribution plot
+    reporter.dataset(data, TARGET)
+
+    # Prepare data for modeling
+    X = data.drop(TARGET, axis=1)
+    y = data[TARGET]
+
+    # Split data into train/test sets
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, random_state=random_state
+    )
+
+    # Train model
+    model = build_pipeline(strategy, locality_cap, alpha)
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+
+    # Evaluate model
+    y_pred = model.predict(X_test)
+    mse = mean_squared_error(y_test, y_pred)
+    rmse = np.sqrt(mse)
+    r2 = r2_score(y_test, y_pred)
+
+    print("\nModel Performance:")
+    print(f"RMSE: {rmse:.2f}")
+    print(f"R² Score: {r2:.4f}")
+
+    # Predictions vs actual plot
+    reporter.predictions(y_test, y_pred)
+
+    metrics = {
+        "rmse": float(rmse),
+        "r2": float(r2),
+        "n_train": int(len(X_train)),
+        "n_test": int(len(X_test)),
+        "fit_seconds": fit_seconds,
+    }
+    return model, metrics
+
+
+def main(argv=None):
+    """Train (or reuse) a model artifact and return its path"""
+    parser = argparse.ArgumentParser(description="Train the house price model and save a versioned artifact")
+    parser.add_argument("--data", default=DATA_URL, help="CSV URL or local path")
+    parser.add_argument("--artifact-dir", default=ARTIFACT_DIR)
+    parser.add_argument("--force", action="store_true", help="retrain even if the data is unchanged")
+    parser.add_argument("--no-report", "--no-plots", dest="no_report", action="store_true",
+                        help="skip writing plots and dataset stats")
+    parser.add_argument("--report-dir", default=REPORT_DIR)
+    parser.add_argument("--verbose", action="store_true", help="also print the first rows and missing values")
+    parser.add_argument("--offline", action="store_true", help="never download; use cached or local data")
+    parser.add_argument("--refresh", action="store_true", help="re-download and re-clean the dataset")
+    parser.add_argument("--incremental", action="store_true",
+                        help="stream the CSV in chunks instead of loading it into memory")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="rows per chunk with --incremental")
+    parser.add_argument("--check", action="store_true",
+                        help="with --incremental, compare against an in-memory LinearRegression fit")
+    parser.add_argument("--strategy", choices=STRATEGIES, default='onehot',
+                        help="locality encoding and solver (see features.py)")
+    parser.add_argument("--locality-cap", type=int,
+                        help="max locality columns for the sparse and hashing strategies")
+    parser.add_argument("--alpha", type=float, default=1.0, help="ridge penalty for non-onehot strategies")
+    args = parser.parse_args(argv)
+
+    if args.incremental:
+        # The out-of-core fit is one-hot + least squares only
+        if args.strategy != 'onehot' or args.locality_cap is not None or args.alpha != 1.0:
+            parser.error("--incremental only trains the onehot strategy; "
+                         "drop --strategy, --locality-cap and --alpha")
+        return main_incremental(args)
+
+    data = load_dataset(args.data, refresh=args.refresh, offline=args.offline)
+    digest = data_hash(data)
+    config = {"strategy": args.strategy, "locality_cap": args.locality_cap,
+              "alpha": args.alpha if args.strategy != 'onehot' else None}
+
+    # Reuse the existing artifact when the data and options haven't changed
+    existing = None if args.force else find_artifact(digest, args.artifact_dir, config)
+    if existing:
+        mark_latest(existing)
+        print(f"Data unchanged ({digest[:12]}), reusing {existing}")
+        return existing
+
+    reporter = Reporter(args.report_dir, enabled=not args.no_report)
+    model, metrics = train(data, reporter=reporter, verbose=args.verbose, strategy=args.strategy,
+                           locality_cap=args.locality_cap, alpha=args.alpha)
+    path = save_artifact(model, build_schema(model), digest, metrics, args.artifact_dir, config)
+    print(f"\nSaved model artifact: {path}")
+
+    # The artifact is already on disk; only now wait for the background reports
+    reports = reporter.close()
+    if reports:
+        print(f"Reports written to {reporter.run_dir}")
+    return path
+
+
+def main_incremental(args):
+    """Out-of-core variant of main: the dataset is never held in memory at once"""
+    import incremental
+
+    path = fetch_raw(args.data, refresh=args.refresh, offline=args.offline) if is_url(args.data) else args.data
+    # The cleaned frame is never materialised, so key the artifact on the raw file
+    digest = "file:" + file_checksum(path)
+    config = {"mode": "incremental"}
+
+    existing = None if args.force else find_artifact(digest, args.artifact_dir, config)
+    if existing:
+        mark_latest(existing)
+        print(f"Data unchanged ({digest[:17]}), reusing {existing}")
+        return existing
+
+    model, metrics = incremental.train_incremental(path, args.chunk_size)
+    if args.check:
+        gap = incremental.compare_with_closed_form(model, path, args.chunk_size)
+        print(f"Max relative difference vs closed-form LinearRegression: {gap:.2e}")
+        metrics["closed_form_gap"] = gap
+    path = save_artifact(model, build_schema(model), digest, metrics, args.artifact_dir, config)
+    print(f"\nSaved model artifact: {path}")
+    return path
+
+
+if __name__ == "__main__":
+    main()
@@ -1,95 +1,91 @@
+import argparse
+import atexit
 import os
 from dotenv import load_dotenv
-import google.generativeai as genai
-from serpapi import GoogleSearch
-import re
 import time
 
+from backends import FakeChat, GeminiChat, SerpApiClient, StubSerpClient
+from hedge import HedgeStats, Hedger, is_ambiguous
+from history import HistoryManager
+from intent_router import IntentRouter
+from replay import Cassette
+from search_cache import SearchCache
+
 # Load API keys from .env file
 load_dotenv()
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 SERPAPI_KEY = os.getenv("SERPAPI_KEY")
 
-# Validate keys
-if not GEMINI_API_KEY:
-    raise ValueError("GEMINI_API_KEY not found in environment variables.")
-if not SERPAPI_KEY:
-    raise ValueError("SERPAPI_KEY not found in environment variables.")
+# Enhanced Google Search Function
+def search_google(query, client=None, cache=None):
+    """Perform a Google search and return formatted results
 
-# Configure Gemini
-genai.configure(api_key=GEMINI_API_KEY)
-model = genai.GenerativeModel(model_name="models/gemini-pro")
-chat = model.start_chat(history=[])
+    Answers are served from cache when a fresh one exists for the same
+    normalized query.
+    """
+    if cache:
+        cached = cache.get(query)
+        if cached is not None:
+            return cached
 
-# Enhanced Google Search Function
-def search_google(query):
-    """Perform a Google search and return formatted results"""
     params = {
         "engine": "google",
         "q": query,
-        "api_key": SERPAPI_KEY,
         "num": 3  # Get top 3 results
     }
     try:
-        search = GoogleSearch(params)
-        results = search.get_dict()
-        
-        # Try to extract different types of results
-        if "answer_box" in results and "answer" in results["answer_box"]:
-            return results["answer_box"]["answer"]
-        
-        if "featured_snippet" in results and "snippet" in results["featured_snippet"]:
-            return f"Featured snippet: {results['featured_snippet']['snippet']}"
-        
-        if "knowledge_graph" in results and "description" in results["knowledge_graph"]:
-            return results["knowledge_graph"]["description"]
-        
-        # Compile top organic results
-        if "organic_results" in results:
-            snippets = []
-            for i, res in enumerate(results["organic_results"][:3], 1):
-                if "snippet" in res:
-                    snippets.append(f"{i}. {res['snippet']}")
-                elif "link" in res:
-                    snippets.append(f"{i}. {res.get('title', 'No title')} - {res['link']}")
-            
-            if snippets:
-                return "\n".join(snippets)
-                
-        return "I couldn't find any relevant information."
-        
+        results = (client or SerpApiClient(SERPAPI_KEY)).search(params)
     except Exception as e:
         print(f"Search error: {e}")
         return "There was an error performing the search."
 
+    answer = format_search_results(results)
+    if cache:
+        cache.set(query, answer)
+    return answer
+
+def format_search_results(results):
+    """Pick the most direct answer out of a SerpAPI result dict"""
+    # Try to extract different types of results
+    if "answer_box" in results and "answer" in results["answer_box"]:
+        return results["answer_box"]["answer"]
+
+    if "featured_snippet" in results and "snippet" in results["featured_snippet"]:
+        return f"Featured snippet: {results['featured_snippet']['snippet']}"
+
+    if "knowledge_graph" in results and "description" in results["knowledge_graph"]:
+        return results["knowledge_graph"]["description"]
+
+    # Compile top organic results
+    if "organic_results" in results:
+        snippets = []
+        for i, res in enumerate(results["organic_results"][:3], 1):
+            if "snippet" in res:
+                snippets.append(f"{i}. {res['snippet']}")
+            elif "link" in res:
+                snippets.append(f"{i}. {res.get('title', 'No title')} - {res['link']}")
+
+        if snippets:
+            return "\n".join(snippets)
+
+    return "I couldn't find any relevant information."
+
+# Live-data intents, matched on whole words in one pass
+LIVE_INTENTS = IntentRouter(default="chat")
+LIVE_INTENTS.add("weather", ["weather", "temperature", "forecast"])
+LIVE_INTENTS.add("market", ["price", "prices", "stock", "stocks", "currency", "exchange rate", "exchange rates"])
+LIVE_INTENTS.add("time", ["time", "date", "current", "now", "today",
+                          "time in", "what time is it", "current time", "date today", "what's the date"])
+LIVE_INTENTS.add("news", ["news", "headlines", "update", "updates", "latest"])
+
+def classify_query(query):
+    """Intent (weather/market/time/news/chat) and confidence for a query"""
+    return LIVE_INTENTS.classify(query)
+
 # Check if query needs live data
 def needs_live_data(query):
     """Determine if a query requires live information"""
-    query = query.lower()
-    live_keywords = [
-        "weather", "temperature", "forecast",
-        "price", "stock", "currency", "exchange rate",
-        "time", "date", "current", "now", "today", 
-        "news", "headlines", "update", "latest"
-    ]
-    
-    # Check for time/date patterns
-    time_patterns = [
-        r"time in .+",
-        r"what time is it",
-        r"current time",
-        r"date today",
-        r"what's the date"
-    ]
-    
-    if any(kw in query for kw in live_keywords):
-        return True
-        
-    for pattern in time_patterns:
-        if re.search(pattern, query):
-            return True
-            
-    return False
+    return classify_query(query).name != "chat"
 
 # Format response with typing effect
 def print_with_typing(text, delay=0.02):
@@ -99,50 +95,201 @@ def print_with_typing(text, delay=0.02):
         time.sleep(delay)
     print()
 
+class StreamMetrics:
+    """Timing of one streamed reply"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.first_token = None
+        self.end = None
+        self.chars = 0
+
+    @property
+    def ttft(self):
+        """Seconds until the first chunk arrived"""
+        return (self.first_token or self.end or self.start) - self.start
+
+    @property
+    def total(self):
+        return (self.end or time.perf_counter()) - self.start
+
+    def __str__(self):
+        return f"[first token {self.ttft * 1000:.0f} ms, total {self.total * 1000:.0f} ms, {self.chars} chars]"
+
+def print_stream(chunks, typing_delay=0.0, header=None):
+    """Print chunks as they arrive and return their StreamMetrics
+
+    header is printed when the first chunk arrives, replacing the
+    "Thinking..." line. typing_delay > 0 re-enables the old per-character
+    typing effect.
+    """
+    metrics = StreamMetrics()
+    for chunk in chunks:
+        if metrics.first_token is None:
+            metrics.first_token = time.perf_counter()
+            if header:
+                print(" " * 15, end='\r')  # Clear "Thinking" message
+                print(header)
+        metrics.chars += len(chunk)
+        if typing_delay:
+            for char in chunk:
+                print(char, end='', flush=True)
+                time.sleep(typing_delay)
+        else:
+            print(chunk, end='', flush=True)
+    metrics.end = time.perf_counter()
+    print()
+    return metrics
+
+def create_chat(fake=False, history_budget=4000):
+    """Real Gemini chat, or the offline FakeChat
+
+    history_budget caps the conversation memory sent per turn in tokens
+    (0 or None = unbounded).
+    """
+    history = HistoryManager(token_budget=history_budget or None)
+    if fake:
+        return FakeChat(history=history)
+    if not GEMINI_API_KEY:
+        raise ValueError("GEMINI_API_KEY not found in environment variables.")
+    return GeminiChat(GEMINI_API_KEY, history=history)
+
+def use_cassette(cassette, chat, search_client):
+    """Send chat and search calls through a record/replay Cassette
+
+    Replies are keyed by the user's text and searches by their query, so a
+    replayed session must ask what the recorded one asked. Replayed
+    replies do not reach the chat's history.
+    """
+    chat.send_message_stream = cassette.wrap_stream(
+        "gemini", chat.send_message_stream,
+        key=lambda text, context=None, remember=True: f"{text}\n{context}" if context else text)
+    search_client.search = cassette.wrap("search", search_client.search, key=lambda params: params["q"])
+
 # Main chat loop
-print("Hello! I'm Gemini. Ask me anything. Type 'exit' to quit.")
-print("I can also fetch live information like weather, prices, time, and news.\n")
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gemini chatbot with live search")
+    parser.add_argument("--typing", type=float, nargs="?", const=0.02, default=0.0, metavar="DELAY",
+                        help="simulate typing with DELAY seconds per character (default off)")
+    parser.add_argument("--metrics", action="store_true", help="print time-to-first-token and total time")
+    parser.add_argument("--fake", action="store_true",
+                        help="use an offline fake model and stub search (no API keys needed)")
+    parser.add_argument("--cache-size", type=int, default=1024, help="max cached search answers")
+    parser.add_argument("--cache-file", help="SQLite file that keeps cached search answers across restarts")
+    parser.add_argument("--history-budget", type=int, default=4000,
+                        help="max tokens of conversation memory sent per turn (0 = unbounded)")
+    parser.add_argument("--hedge", choices=["off", "merge", "first"], default="off",
+                        help="for ambiguous queries run search and Gemini concurrently; "
+                             "'merge' grounds the reply with live results, 'first' takes whichever is first")
+    parser.add_argument("--hedge-threshold", type=float, default=0.75,
+                        help="live-intent confidence below which a query counts as ambiguous")
+    parser.add_argument("--hedge-deadline", type=float, default=1.5,
+                        help="seconds to wait for the second path before answering with the first")
+    parser.add_argument("--search-timeout", type=float, default=5.0, help="hedged search timeout (s)")
+    parser.add_argument("--model-timeout", type=float, default=20.0, help="hedged Gemini timeout (s)")
+    parser.add_argument("--hedge-log", help="append per-path latencies of hedged queries to this JSONL file")
+    cassettes = parser.add_mutually_exclusive_group()
+    cassettes.add_argument("--record", metavar="CASSETTE",
+                           help="save every Gemini reply and search result, with its latency, to this JSON file")
+    cassettes.add_argument("--replay", metavar="CASSETTE",
+                           help="answer from a recorded cassette instead of the APIs (no API keys needed)")
+    parser.add_argument("--replay-speed", type=float, default=1.0,
+                        help="scale recorded latencies when replaying (0 = no waiting)")
+    args = parser.parse_args(argv)
 
-while True:
-    try:
-        user_input = input("You: ").strip()
-        
-        if not user_input:
-            continue
-            
-        if user_input.lower() in ['exit', 'quit', 'bye']:
-            print("Goodbye!")
-            break
-
-        # Handle special commands
-        if user_input.lower() in ['help', '/help']:
-            print("\nAvailable commands:")
-            print("- 'exit' or 'quit': End conversation")
-            print("- 'clear': Reset conversation history")
-            print("- 'help': Show this help message")
-            print("- Ask normally for other queries\n")
-            continue
-            
-        if user_input.lower() == 'clear':
-            chat = model.start_chat(history=[])
-            print("Conversation history cleared.")
-            continue
-
-        # Check for live data needs
-        if needs_live_data(user_input):
-            print("🔍 Searching for live information...")
-            answer = search_google(user_input)
-            print("\nGemini (Live Results):")
-            print_with_typing(answer)
-            continue
-
-        # Get Gemini response
-        print("💭 Thinking...", end='\r')
-        response = chat.send_message(user_input)
-        print(" " * 15, end='\r')  # Clear "Thinking" message
-        print("\nGemini:")
-        print_with_typing(response.text)
-        
-    except Exception as e:
-        print(f"\n⚠️ An error occurred: {e}")
-        print("Please try again or rephrase your question.\n")
\ No newline at end of file
+    chat = create_chat(args.fake or bool(args.replay), args.history_budget)
+    if args.fake or args.replay:
+        search_client = StubSerpClient()
+    elif SERPAPI_KEY:
+        search_client = SerpApiClient(SERPAPI_KEY)
+    else:
+        raise ValueError("SERPAPI_KEY not found in environment variables.")
+    if args.record or args.replay:
+        cassette = Cassette(args.record or args.replay, "record" if args.record else "replay", args.replay_speed)
+        use_cassette(cassette, chat, search_client)
+        if cassette.recording:
+            atexit.register(cassette.save)
+    search_cache = SearchCache(max_entries=args.cache_size, disk_path=args.cache_file)
+    hedger = None
+    if args.hedge != "off":
+        hedger = Hedger(lambda query: search_google(query, search_client, search_cache), chat,
+                        policy=args.hedge, search_timeout=args.search_timeout,
+                        model_timeout=args.model_timeout, merge_deadline=args.hedge_deadline,
+                        stats=HedgeStats(args.hedge_log))
+
+    print("Hello! I'm Gemini. Ask me anything. Type 'exit' to quit.")
+    print("I can also fetch live information like weather, prices, time, and news.\n")
+
+    while True:
+        try:
+            user_input = input("You: ").strip()
+
+            if not user_input:
+                continue
+
+            if user_input.lower() in ['exit', 'quit', 'bye']:
+                print("Goodbye!")
+                break
+
+            # Handle special commands
+            if user_input.lower() in ['help', '/help']:
+                print("\nAvailable commands:")
+                print("- 'exit' or 'quit': End conversation")
+                print("- 'clear': Reset conversation history")
+                print("- 'stats': Show search cache and hedging statistics")
+                print("- 'help': Show this help message")
+                print("- Ask normally for other queries\n")
+                continue
+
+            if user_input.lower() == 'clear':
+                chat.reset()
+                print("Conversation history cleared.")
+                continue
+
+            if user_input.lower() == 'stats':
+                print(search_cache.summary())
+                if hedger:
+                    print(hedger.stats.summary())
+                continue
+
+            intent = classify_query(user_input)
+
+            # Unsure whether live data is needed: ask both and take the best in time
+            if hedger and is_ambiguous(intent, args.hedge_threshold):
+                print("🔀 Searching and thinking...", end='\r')
+                result = hedger.run(user_input, intent)
+                labels = {"merged": "Gemini (with Live Results):", "search": "Gemini (Live Results):"}
+                print(" " * 30, end='\r')
+                print("\n" + labels.get(result.source, "Gemini:"))
+                if args.typing:
+                    print_with_typing(result.answer, args.typing)
+                else:
+                    print(result.answer)
+                if args.metrics:
+                    print(" ".join(f"[{path} {seconds * 1000:.0f} ms]" if seconds is not None else f"[{path} -]"
+                                   for path, seconds in result.latencies.items()))
+                continue
+
+            # Check for live data needs
+            if intent.name != "chat":
+                print("🔍 Searching for live information...")
+                answer = search_google(user_input, search_client, search_cache)
+                print("\nGemini (Live Results):")
+                if args.typing:
+                    print_with_typing(answer, args.typing)
+                else:
+                    print(answer)
+                continue
+
+            # Stream Gemini response as it is generated
+            print("💭 Thinking...", end='\r')
+            metrics = print_stream(chat.send_message_stream(user_input), args.typing, header="\nGemini:")
+            if args.metrics:
+                print(f"{metrics} [prompt ~{chat.history.last_prompt_tokens} tokens]")
+
+        except Exception as e:
+            print(f"\n⚠️ An error occurred: {e}")
+            print("Please try again or rephrase your question.\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import time
+
+from history import HistoryManager, contents_tokens
+
+
+def _with_context(text, context):
+    return f"{context}\n\n{text}" if context else text
+
+
+class GeminiChat:
+    """Gemini chat session that yields the reply as it is generated
+
+    Conversation memory is kept by a HistoryManager, so each request sends
+    a bounded prompt instead of the SDK's ever-growing chat history.
+    """
+
+    def __init__(self, api_key, model_name="models/gemini-pro", history=None):
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(model_name=model_name)
+        self.history = history or HistoryManager()
+
+    def send_message_stream(self, text, context=None, remember=True):
+        """Yield text chunks of the reply as they arrive
+
+        context (such as live search results) is sent ahead of text but
+        not kept in the history. With remember=False the turn is not added
+        to the history at all; the caller adds it if it uses the reply.
+        """
+        contents = self.history.build_contents(_with_context(text, context))
+        reply = []
+        for chunk in self.model.generate_content(contents, stream=True):
+            if chunk.text:
+                reply.append(chunk.text)
+                yield chunk.text
+        if remember:
+            self.history.add_turn(text, "".join(reply))
+
+    def reset(self):
+        self.history.clear()
+
+
+class FakeChat:
+    """Offline stand-in for GeminiChat with scripted latency
+
+    Replies echo the prompt unless a reply_fn is given. first_token_delay
+    simulates time to first token, chunk_delay the gap between chunks.
+    payload_sizes records the estimated tokens of every prompt received.
+    """
+
+    def __init__(self, reply_fn=None, chunk_size=12, first_token_delay=0.3, chunk_delay=0.05, history=None):
+        self.reply_fn = reply_fn or (lambda text: f"You said: {text}. This is a canned offline reply.")
+        self.chunk_size = chunk_size
+        self.first_token_delay = first_token_delay
+        self.chunk_delay = chunk_delay
+        self.history = history or HistoryManager()
+        self.payload_sizes = []
+
+    def send_message_stream(self, text, context=None, remember=True):
+        prompt = _with_context(text, context)
+        contents = self.history.build_contents(prompt)
+        self.payload_sizes.append(contents_tokens(contents))
+        reply = self.reply_fn(prompt)
+        time.sleep(self.first_token_delay)
+        for i in range(0, len(reply), self.chunk_size):
+            if i:
+                time.sleep(self.chunk_delay)
+            yield reply[i:i + self.chunk_size]
+        if remember:
+            self.history.add_turn(text, reply)
+
+    def reset(self):
+        self.history.clear()
+
+
+class SerpApiClient:
+    """SerpAPI Google search returning the raw result dict"""
+
+    def __init__(self, api_key):
+        self.api_key = api_key
+
+    def search(self, params):
+        from serpapi import GoogleSearch
+
+        return GoogleSearch({**params, "api_key": self.api_key}).get_dict()
+
+
+class StubSerpClient:
+    """Offline SerpAPI stand-in that counts calls
+
+    results maps a lowercased query to a SerpAPI-shaped dict; anything else
+    gets a single organic result echoing the query.
+    """
+
+    def __init__(self, results=None, latency=0.2):
+        self.results = results or {}
+        self.latency = latency
+        self.calls = 0
+
+    def search(self, params):
+        self.calls += 1
+        time.sleep(self.latency)
+        query = params["q"]
+        return self.results.get(query.lower(), {
+            "organic_results": [{"snippet": f"Stub result for '{query}'"}]
+        })
@@ -0,0 +1,36 @@
+import argparse
+
+from backends import FakeChat
+from history import HistoryManager
+
+
+def long_reply(text):
+    return (f"Here is a detailed answer about {text}. " + "It covers background, examples and caveats. " * 12).strip()
+
+
+def run(turns, budget):
+    chat = FakeChat(reply_fn=long_reply, first_token_delay=0, chunk_delay=0,
+                    history=HistoryManager(token_budget=budget))
+    for i in range(turns):
+        for _ in chat.send_message_stream(f"question number {i} about topic {i % 7}"):
+            pass
+    return chat.payload_sizes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prompt size per turn with and without a history budget")
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--budget", type=int, default=2000, help="token budget for the bounded run")
+    args = parser.parse_args(argv)
+
+    unbounded = run(args.turns, None)
+    bounded = run(args.turns, args.budget)
+    print(f"{'turn':>6} {'unbounded tokens':>17} {'budget ' + str(args.budget):>14}")
+    for turn in sorted({1, 2, 5, 10, 20, 50, 100, args.turns} & set(range(1, args.turns + 1))):
+        print(f"{turn:>6} {unbounded[turn - 1]:>17,} {bounded[turn - 1]:>14,}")
+    print(f"\ntotal prompt tokens over {args.turns} turns: unbounded {sum(unbounded):,}, "
+          f"bounded {sum(bounded):,} ({sum(bounded) / sum(unbounded):.1%})")
+
+
+if __name__ == "__main__":
+    main()
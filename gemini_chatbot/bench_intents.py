@@ -0,0 +1,93 @@
+import argparse
+import csv
+import os
+import random
+import re
+import string
+import time
+
+from app import classify_query
+from intent_router import IntentRouter
+
+CASES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "live_intent_cases.csv")
+
+
+def legacy_needs_live_data(query):
+    """The previous substring/regex check, kept here for comparison"""
+    query = query.lower()
+    live_keywords = [
+        "weather", "temperature", "forecast",
+        "price", "stock", "currency", "exchange rate",
+        "time", "date", "current", "now", "today",
+        "news", "headlines", "update", "latest"
+    ]
+    time_patterns = [r"time in .+", r"what time is it", r"current time", r"date today", r"what's the date"]
+    if any(kw in query for kw in live_keywords):
+        return True
+    return any(re.search(pattern, query) for pattern in time_patterns)
+
+
+def load_cases(path=CASES_FILE):
+    with open(path, newline="", encoding="utf-8") as f:
+        return [(row["text"], row["label"]) for row in csv.DictReader(f)]
+
+
+def time_per_query(fn, queries, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for q in queries:
+            fn(q)
+    return (time.perf_counter() - start) / (repeat * len(queries))
+
+
+def scaling(keyword_counts, queries, repeat, seed=42):
+    """Substring scan vs router as the keyword vocabulary grows"""
+    rng = random.Random(seed)
+    print("keywords   substring any() µs/query   router µs/query")
+    for count in keyword_counts:
+        keywords = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 9)))
+                    for _ in range(count)]
+        router = IntentRouter()
+        for i in range(0, count, 50):
+            router.add(f"intent{i // 50}", keywords[i:i + 50])
+
+        def substring(query, keywords=keywords):
+            query = query.lower()
+            return any(kw in query for kw in keywords)
+
+        print(f"{count:>8}   {time_per_query(substring, queries, repeat) * 1e6:>24.2f}   "
+              f"{time_per_query(router.classify, queries, repeat) * 1e6:>15.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Routing accuracy and speed of the live-data intent router")
+    parser.add_argument("--cases", default=CASES_FILE, help="CSV with text,label columns")
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--scaling", type=int, nargs="*", default=[16, 100, 500, 2000],
+                        help="synthetic vocabulary sizes for the scaling comparison")
+    args = parser.parse_args(argv)
+
+    cases = load_cases(args.cases)
+    queries = [text for text, _ in cases]
+
+    legacy_live = sum(legacy_needs_live_data(t) == (label != "chat") for t, label in cases)
+    router_live = sum((classify_query(t).name != "chat") == (label != "chat") for t, label in cases)
+    router_intent = sum(classify_query(t).name == label for t, label in cases)
+    print(f"{len(cases)} labeled queries")
+    print(f"live/chat accuracy: legacy {legacy_live / len(cases):.1%}, router {router_live / len(cases):.1%}")
+    print(f"intent accuracy (router): {router_intent / len(cases):.1%}")
+    for text, label in cases:
+        result = classify_query(text)
+        if result.name != label:
+            print(f"  miss: {text!r} -> {result.name} ({result.confidence:.2f}), expected {label}")
+
+    legacy = time_per_query(legacy_needs_live_data, queries, args.repeat)
+    router = time_per_query(classify_query, queries, args.repeat)
+    print(f"legacy: {legacy * 1e6:.2f} µs/query, router: {router * 1e6:.2f} µs/query\n")
+
+    if args.scaling:
+        scaling(args.scaling, queries, max(1, args.repeat // 10))
+
+
+if __name__ == "__main__":
+    main()
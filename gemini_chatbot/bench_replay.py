@@ -0,0 +1,154 @@
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from app import SERPAPI_KEY, classify_query, create_chat, search_google, use_cassette
+from backends import SerpApiClient, StubSerpClient
+from replay import Cassette
+from search_cache import SearchCache
+from stats import percentile
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+CONVERSATION_FILE = os.path.join(FIXTURES, "conversation.txt")
+CASSETTE_FILE = os.path.join(FIXTURES, "conversation.cassette.json")
+
+# Lower is better for these, higher for turns_per_s
+METRICS = ("p50_ms", "p95_ms", "ttft_p50_ms", "peak_kb")
+
+
+def load_conversation(path=CONVERSATION_FILE):
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+def run_conversation(messages, chat, search_client):
+    """Each message routed like the chat loop does; [(total s, first output s)] per turn"""
+    cache = SearchCache()
+    turns = []
+    for text in messages:
+        start = time.perf_counter()
+        first = None
+        if classify_query(text).name != "chat":
+            search_google(text, search_client, cache)
+        else:
+            for _ in chat.send_message_stream(text):
+                if first is None:
+                    first = time.perf_counter()
+        end = time.perf_counter()
+        turns.append((end - start, (first or end) - start))
+    return turns
+
+
+def replay_backends(cassette):
+    chat, search_client = create_chat(fake=True), StubSerpClient()
+    use_cassette(cassette, chat, search_client)
+    return chat, search_client
+
+
+def record(path, messages, fake):
+    if fake:
+        chat, search_client = create_chat(fake=True), StubSerpClient()
+    else:
+        chat, search_client = create_chat(), SerpApiClient(SERPAPI_KEY)
+    cassette = Cassette(path, "record")
+    use_cassette(cassette, chat, search_client)
+    run_conversation(messages, chat, search_client)
+    cassette.save()
+    print(f"Recorded {sum(cassette.calls.values())} calls to {path}")
+
+
+def measure(cassette_path, messages, repeat, speed):
+    cassette = Cassette(cassette_path, "replay", speed)
+    turns = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        turns += run_conversation(messages, *replay_backends(cassette))
+    elapsed = time.perf_counter() - start
+
+    # Memory in a separate pass so tracemalloc does not skew the timings
+    tracemalloc.start()
+    run_conversation(messages, *replay_backends(Cassette(cassette_path, "replay", 0)))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    totals = sorted(total for total, _ in turns)
+    firsts = sorted(first for _, first in turns)
+    return {"turns": len(turns), "turns_per_s": round(len(turns) / elapsed, 2),
+            "p50_ms": round(percentile(totals, 50) * 1000, 2), "p95_ms": round(percentile(totals, 95) * 1000, 2),
+            "ttft_p50_ms": round(percentile(firsts, 50) * 1000, 2), "peak_kb": round(peak / 1024, 1),
+            "maxrss_kb": max_rss_kb()}
+
+
+def max_rss_kb():
+    """Peak resident memory of this process in KiB, or None where unavailable (Windows)"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    # ru_maxrss is KB on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def compare(result, baseline, tolerance):
+    """Lines describing each metric against baseline; the names of regressed metrics"""
+    lines, regressed = [], []
+    for name in ("turns_per_s",) + METRICS:
+        old, new = baseline.get(name), result[name]
+        if not old:
+            continue
+        change = (new - old) / old
+        worse = change < -tolerance if name == "turns_per_s" else change > tolerance
+        if worse:
+            regressed.append(name)
+        lines.append(f"  {name:<12} {old:>10} -> {new:>10} ({change:+.1%}){'  REGRESSION' if worse else ''}")
+    return lines, regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a scripted conversation from a recorded cassette")
+    parser.add_argument("--conversation", default=CONVERSATION_FILE, help="one user message per line")
+    parser.add_argument("--cassette", default=CASSETTE_FILE)
+    parser.add_argument("--record", action="store_true",
+                        help="record the cassette from the live APIs first (needs API keys, or --fake)")
+    parser.add_argument("--fake", action="store_true", help="record from the offline fake backends")
+    parser.add_argument("--repeat", type=int, default=3, help="times to run the conversation")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="scale recorded latencies (0 = measure the app's own overhead only)")
+    parser.add_argument("--baseline", help="compare against this stored result; exit 1 on regression")
+    parser.add_argument("--save-baseline", metavar="FILE", help="store this run's result as a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed relative change (default 10%%)")
+    args = parser.parse_args(argv)
+
+    messages = load_conversation(args.conversation)
+    if args.record:
+        record(args.cassette, messages, args.fake)
+
+    result = measure(args.cassette, messages, args.repeat, args.speed)
+    print(f"{result['turns']} turns: {result['turns_per_s']} turns/s, "
+          f"p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms, first output p50 {result['ttft_p50_ms']} ms")
+    rss = f"{result['maxrss_kb']} KiB" if result["maxrss_kb"] is not None else "unavailable"
+    print(f"memory: traced peak {result['peak_kb']} KiB, max RSS {rss}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({"speed": args.speed, **result}, f, indent=1)
+        print(f"Baseline saved to {args.save_baseline}")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("speed", 1.0) != args.speed:
+            print(f"warning: baseline was run with --speed {baseline.get('speed', 1.0)}")
+        lines, regressed = compare(result, baseline, args.tolerance)
+        print(f"against {args.baseline} (tolerance {args.tolerance:.0%}):")
+        print("\n".join(lines))
+        if regressed:
+            print(f"Regressed: {', '.join(regressed)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
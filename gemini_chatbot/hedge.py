@@ -0,0 +1,203 @@
+import collections
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from stats import percentile
+
+# Live-intent words too generic to decide the route on their own
+WEAK_LIVE_WORDS = {"current", "now", "today", "latest", "update", "updates"}
+
+# search_google answers that mean nothing useful came back
+SEARCH_FAILURES = {"I couldn't find any relevant information.", "There was an error performing the search."}
+
+HedgeResult = collections.namedtuple("HedgeResult", "answer source latencies")
+
+# Worker threads one hedged query can occupy: search, speculative model, grounded model
+PATHS_PER_QUERY = 3
+
+GROUNDING = "Live search results:\n{results}\n\nUse them where they are relevant to answer:"
+
+
+def is_ambiguous(intent, threshold=0.75):
+    """True when the live/chat routing is unsure
+
+    That is a live intent whose confidence is below threshold (keywords of
+    several intents matched), or one matched only by generic words such as
+    "latest" or "today".
+    """
+    if intent.name == "chat":
+        return False
+    return intent.confidence < threshold or all(m in WEAK_LIVE_WORDS for m in intent.matches)
+
+
+class HedgeStats:
+    """Per-path latencies and outcomes of hedged queries
+
+    Latencies are recorded whenever a path finishes, including a path that
+    lost the race, so both distributions stay comparable. With log_path
+    every hedged query is appended as a JSON line for tuning the threshold.
+    """
+
+    def __init__(self, log_path=None):
+        self.latencies = collections.defaultdict(list)
+        self.outcomes = collections.Counter()
+        self.log_path = log_path
+        self._lock = threading.Lock()
+
+    def add_latency(self, path, seconds):
+        with self._lock:
+            self.latencies[path].append(seconds)
+
+    def record(self, query, intent, result):
+        with self._lock:
+            self.outcomes[result.source] += 1
+            if self.log_path:
+                row = {"query": query, "intent": intent.name, "confidence": round(intent.confidence, 3),
+                       "source": result.source}
+                for path, seconds in result.latencies.items():
+                    row[f"{path}_ms"] = round(seconds * 1000, 1) if seconds is not None else None
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(row) + "\n")
+
+    def summary(self):
+        with self._lock:
+            parts = []
+            for path in ("search", "model", "grounded"):
+                samples = sorted(self.latencies[path])
+                if samples:
+                    parts.append(f"{path} p50 {percentile(samples, 50) * 1000:.0f} ms "
+                                 f"p95 {percentile(samples, 95) * 1000:.0f} ms (n={len(samples)})")
+            if not parts:
+                return "Hedging: no hedged queries yet"
+            outcomes = ", ".join(f"{source} {n}" for source, n in self.outcomes.most_common())
+            return f"Hedging: {'; '.join(parts)}; answered by {outcomes}"
+
+
+class Hedger:
+    """Run live search and the model concurrently for one query
+
+    Each path has its own timeout. With policy "first" the first good
+    answer wins at once. With policy "merge", if search answers within
+    merge_deadline (measured from the start) and before the speculative
+    model call has streamed anything, that call is closed and the model
+    is asked again with the snippets in its prompt, so the reply is
+    grounded in them ("merged"). Once the speculative answer is
+    streaming it is used as it is, so a query never pays for a second
+    model round-trip on top of a first one that is already answering.
+    If search is late, fails, or the grounded call fails or runs out of
+    model time, the best answer already in hand is used.
+
+    Model calls don't touch the chat history while they run: only the
+    answer that is returned is added as a turn, so a model path that
+    finishes after losing leaves no trace. A losing search runs to
+    completion in the background and still fills the search cache.
+    """
+
+    def __init__(self, search_fn, chat, policy="merge", search_timeout=5.0, model_timeout=20.0,
+                 merge_deadline=1.5, stats=None, concurrent_queries=1):
+        self.search_fn = search_fn
+        self.chat = chat
+        self.policy = policy
+        self.timeouts = {"search": search_timeout, "model": model_timeout}
+        self.merge_deadline = merge_deadline
+        self.stats = stats or HedgeStats()
+        # Abandoned paths can still be finishing when the next query starts,
+        # so leave room for one more query's worth of them
+        self.executor = ThreadPoolExecutor(max_workers=PATHS_PER_QUERY * (concurrent_queries + 1))
+
+    def _search(self, query):
+        start = time.perf_counter()
+        answer = self.search_fn(query)
+        self.stats.add_latency("search", time.perf_counter() - start)
+        return answer
+
+    def _model(self, query, cancelled, context=None, started=None):
+        start = time.perf_counter()
+        chunks = []
+        stream = self.chat.send_message_stream(query, context=context, remember=False)
+        try:
+            for chunk in stream:
+                if cancelled.is_set():
+                    return None
+                if started is not None:
+                    started.set()
+                chunks.append(chunk)
+        finally:
+            stream.close()  # ends the request as soon as the answer is no longer wanted
+        self.stats.add_latency("grounded" if context else "model", time.perf_counter() - start)
+        return "".join(chunks)
+
+    def _grounded(self, query, results, timeout):
+        """The model's answer to query with results in its prompt, or None"""
+        if timeout <= 0:
+            return None
+        cancelled = threading.Event()
+        future = self.executor.submit(self._model, query, cancelled, GROUNDING.format(results=results))
+        try:
+            return future.result(timeout=timeout)
+        except Exception as e:
+            print(f"Grounded model error: {e or 'timed out'}")
+            return None
+        finally:
+            cancelled.set()
+
+    def run(self, query, intent=None):
+        """Return HedgeResult(answer, source, latencies); source is search/model/merged/timeout"""
+        start = time.perf_counter()
+        cancelled = threading.Event()
+        streaming = threading.Event()
+        paths = {
+            self.executor.submit(self._search, query): "search",
+            self.executor.submit(self._model, query, cancelled, None, streaming): "model",
+        }
+        deadlines = {future: start + self.timeouts[path] for future, path in paths.items()}
+        merge_by = start + self.merge_deadline
+        answers = {}
+        latencies = {"search": None, "model": None}
+
+        pending = set(paths)
+        while pending:
+            now = time.perf_counter()
+            if answers and (self.policy == "first" or "model" in answers):
+                break
+            if "search" in answers and not streaming.is_set():
+                break  # ground the model in the results, or answer from them if too late
+            # Paths past their own timeout are abandoned
+            pending = {future for future in pending if deadlines[future] > now}
+            if not pending:
+                break
+            until = min(deadlines[future] for future in pending)
+            done, pending = wait(pending, timeout=until - now, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = paths[future]
+                latencies[path] = time.perf_counter() - start
+                try:
+                    answer = future.result()
+                except Exception as e:
+                    print(f"{path.capitalize()} error: {e}")
+                    continue
+                if answer and answer not in SEARCH_FAILURES:
+                    answers[path] = answer
+
+        cancelled.set()
+        grounded = None
+        if (self.policy == "merge" and "search" in answers and not streaming.is_set()
+                and start + latencies["search"] <= merge_by):
+            grounded = self._grounded(query, answers["search"],
+                                      start + self.timeouts["model"] - time.perf_counter())
+            latencies["grounded"] = time.perf_counter() - start if grounded else None
+        if grounded:
+            result = HedgeResult(grounded, "merged", latencies)
+        elif answers:
+            source = "model" if "model" in answers else "search"
+            result = HedgeResult(answers[source], source, latencies)
+        else:
+            result = HedgeResult("Sorry, neither live search nor Gemini answered in time.", "timeout", latencies)
+
+        if result.source in ("model", "merged"):
+            self.chat.history.add_turn(query, result.answer)
+        if intent is not None:
+            self.stats.record(query, intent, result)
+        return result
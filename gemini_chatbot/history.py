@@ -0,0 +1,84 @@
+import collections
+import re
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+
+def estimate_tokens(text):
+    """Rough token count (~4 characters per token), good enough for budgeting"""
+    return (len(text) + 3) // 4
+
+
+def contents_tokens(contents):
+    return sum(estimate_tokens(part) for message in contents for part in message["parts"])
+
+
+def _clip(text, limit):
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+
+def extractive_summary(user, reply):
+    """One compact line per turn: the question and the first sentence of the answer"""
+    first_sentence = _SENTENCE_END.split(reply.strip(), 1)[0]
+    return f"- User asked: {_clip(user, 120)} / Answer: {_clip(first_sentence, 160)}"
+
+
+class HistoryManager:
+    """Conversation memory held to a token budget
+
+    The most recent turns are kept verbatim. When they exceed the budget the
+    oldest are folded, one line each, into a rolling summary, which is
+    itself capped at summary_budget tokens by dropping its oldest lines.
+    token_budget=None keeps everything (the old unbounded behaviour).
+    """
+
+    def __init__(self, token_budget=4000, min_recent=2, summary_budget=None, summarize=extractive_summary):
+        self.token_budget = token_budget
+        self.min_recent = min_recent
+        self.summary_budget = summary_budget if summary_budget is not None else (token_budget or 0) // 4
+        self.summarize = summarize
+        self.recent = collections.deque()  # (user, reply, tokens)
+        self.summary = collections.deque()  # (line, tokens)
+        self.recent_tokens = 0
+        self.summary_tokens = 0
+        self.turns = 0
+        self.last_prompt_tokens = 0  # estimated tokens of the last prompt built
+
+    def add_turn(self, user, reply):
+        tokens = estimate_tokens(user) + estimate_tokens(reply)
+        self.recent.append((user, reply, tokens))
+        self.recent_tokens += tokens
+        self.turns += 1
+        if self.token_budget is not None:
+            self._compact()
+
+    def _compact(self):
+        while (self.recent_tokens + self.summary_tokens > self.token_budget
+               and len(self.recent) > self.min_recent):
+            user, reply, tokens = self.recent.popleft()
+            self.recent_tokens -= tokens
+            line = self.summarize(user, reply)
+            self.summary.append((line, estimate_tokens(line)))
+            self.summary_tokens += self.summary[-1][1]
+        while self.summary_tokens > self.summary_budget and self.summary:
+            self.summary_tokens -= self.summary.popleft()[1]
+
+    def build_contents(self, message):
+        """Gemini contents for the next turn: summary, recent turns, then message"""
+        contents = []
+        if self.summary:
+            contents.append({"role": "user", "parts": [
+                "Summary of our earlier conversation:\n" + "\n".join(line for line, _ in self.summary)]})
+            contents.append({"role": "model", "parts": ["Understood, I'll keep that in mind."]})
+        for user, reply, _ in self.recent:
+            contents.append({"role": "user", "parts": [user]})
+            contents.append({"role": "model", "parts": [reply]})
+        contents.append({"role": "user", "parts": [message]})
+        self.last_prompt_tokens = contents_tokens(contents)
+        return contents
+
+    def clear(self):
+        self.recent.clear()
+        self.summary.clear()
+        self.recent_tokens = self.summary_tokens = 0
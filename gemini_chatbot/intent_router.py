@@ -0,0 +1,88 @@
+import collections
+import re
+
+Intent = collections.namedtuple("Intent", "name confidence matches")
+
+# Words, keeping contractions such as "what's" in one token
+_WORD_RE = re.compile(r"\w+(?:'\w+)?")
+
+
+class IntentRouter:
+    """Single-pass keyword intent classifier
+
+    Keywords and multi-word phrases of every intent are indexed by word, so
+    a query is tokenized once and each token costs one hash lookup however
+    many intents exist. Matching is on whole words: "hi" does not match
+    "this", nor "time" "sometimes". Optional regex patterns are compiled
+    into one combined regex and scanned once.
+
+    Each hit adds its weight to its intent. The best-scoring intent wins,
+    and its share of the total score is the confidence. Ties go to the
+    higher priority, then to the intent added first.
+    """
+
+    def __init__(self, default="default"):
+        self.default = default
+        self._intents = {}  # name -> (priority, order)
+        self._phrases = {}  # space-joined words -> (intent, weight)
+        self._starts = {}  # first word -> longest phrase length starting with it
+        self._patterns = []  # (regex source, intent, weight)
+        self._pattern_regex = None
+
+    def add(self, intent, keywords=(), patterns=(), priority=0, weight=1.0, pattern_weight=2.0):
+        """Register keywords (plain words or phrases) and regex patterns for an intent
+
+        A phrase weighs weight per word, so "what time is it" outweighs a
+        stray "time".
+        """
+        self._intents.setdefault(intent, (priority, len(self._intents)))
+        for phrase in keywords:
+            words = _WORD_RE.findall(phrase.lower())
+            self._phrases[" ".join(words)] = (intent, weight * len(words))
+            self._starts[words[0]] = max(self._starts.get(words[0], 0), len(words))
+        for pattern in patterns:
+            self._patterns.append((pattern, intent, pattern_weight))
+        self._pattern_regex = None
+        return self
+
+    def compile(self):
+        """Build the combined pattern regex (done lazily on first use otherwise)"""
+        if self._patterns:
+            self._pattern_regex = re.compile(
+                "|".join(f"(?P<p{i}>{pattern})" for i, (pattern, _, _) in enumerate(self._patterns)),
+                re.IGNORECASE)
+        return self
+
+    def classify(self, text):
+        """Return Intent(name, confidence, matches) for text"""
+        if self._patterns and self._pattern_regex is None:
+            self.compile()
+
+        scores = {}
+        matches = []
+        phrases, starts = self._phrases, self._starts
+        tokens = _WORD_RE.findall(text.lower())
+        for i, token in enumerate(tokens):
+            longest = starts.get(token)
+            if longest is None:
+                continue
+            for n in range(1, min(longest, len(tokens) - i) + 1):
+                key = token if n == 1 else " ".join(tokens[i:i + n])
+                hit = phrases.get(key)
+                if hit:
+                    scores[hit[0]] = scores.get(hit[0], 0.0) + hit[1]
+                    matches.append(key)
+
+        if self._pattern_regex is not None:
+            for m in self._pattern_regex.finditer(text):
+                _, intent, weight = self._patterns[int(m.lastgroup[1:])]
+                scores[intent] = scores.get(intent, 0.0) + weight
+                matches.append(m.group())
+
+        if not scores:
+            return Intent(self.default, 0.0, ())
+        best = max(scores, key=lambda name: (scores[name], self._intents[name][0], -self._intents[name][1]))
+        return Intent(best, scores[best] / sum(scores.values()), tuple(matches))
+
+    def intents(self):
+        return list(self._intents)
@@ -0,0 +1,70 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from stats import percentile
+
+# Mix of live-data and model questions sent by each simulated user
+PROMPTS = [
+    "weather in Mumbai",
+    "usd to inr exchange rate",
+    "latest news headlines",
+    "explain recursion simply",
+    "write a haiku about the monsoon",
+    "what is a linked list",
+    "give me three dinner ideas",
+    "summarize the plot of Hamlet",
+]
+
+
+async def session(host, port, turns, rng, results):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(turns):
+            start = time.perf_counter()
+            writer.write(json.dumps({"text": rng.choice(PROMPTS)}).encode() + b"\n")
+            await writer.drain()
+            while True:
+                message = json.loads(await reader.readline())
+                if message["type"] == "done":
+                    results.append((message["source"], message["ttft_ms"], (time.perf_counter() - start) * 1000))
+                    break
+                if message["type"] == "error":
+                    results.append(("error", 0.0, (time.perf_counter() - start) * 1000))
+                    break
+    finally:
+        writer.close()
+
+
+async def run(host, port, sessions, turns, seed):
+    rng = random.Random(seed)
+    results = []
+    start = time.perf_counter()
+    await asyncio.gather(*(session(host, port, turns, random.Random(rng.random()), results)
+                           for _ in range(sessions)))
+    elapsed = time.perf_counter() - start
+
+    print(f"{sessions} sessions x {turns} turns = {len(results)} turns in {elapsed:.2f}s "
+          f"({len(results) / elapsed:.1f} turns/sec)")
+    for source in sorted({r[0] for r in results}):
+        ttft = sorted(r[1] for r in results if r[0] == source)
+        total = sorted(r[2] for r in results if r[0] == source)
+        print(f"  {source:<7} n={len(total):<6} first token p50 {percentile(ttft, 50):7.1f} ms  "
+              f"turn p50 {percentile(total, 50):7.1f} ms  p99 {percentile(total, 99):7.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive many concurrent sessions against server.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--turns", type=int, default=5, help="messages per session")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+    asyncio.run(run(args.host, args.port, args.sessions, args.turns, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import collections
+import json
+import threading
+import time
+
+
+class Cassette:
+    """Backend responses recorded once, replayed with their original latency
+
+    wrap(kind, fn) returns a stand-in for fn. In "record" mode it calls fn
+    and stores the result (or the error) and how long it took; in
+    "replay" mode it never calls fn, sleeps the recorded latency times
+    speed and returns the recorded result. wrap_stream() does the same
+    for generators, keeping each chunk's offset from the call.
+
+    Calls are keyed by kind plus key(*args, **kwargs); a key recorded
+    several times replays its answers in order, wrapping around. Results
+    must be JSON-serializable, and keys must not contain secrets.
+    Replaying a call that was never recorded raises KeyError.
+    """
+
+    def __init__(self, path, mode="replay", speed=1.0):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"unknown cassette mode {mode!r}")
+        self.path = path
+        self.mode = mode
+        self.speed = speed
+        self.entries = collections.defaultdict(list)
+        self.calls = collections.Counter()
+        self._positions = collections.Counter()
+        self._lock = threading.Lock()
+        if mode == "replay":
+            with open(path, encoding="utf-8") as f:
+                self.entries.update(json.load(f)["entries"])
+
+    @property
+    def recording(self):
+        return self.mode == "record"
+
+    def wrap(self, kind, fn, key=None):
+        key = key or _default_key
+
+        def call(*args, **kwargs):
+            name = f"{kind}:{key(*args, **kwargs)}"
+            self.calls[kind] += 1
+            if not self.recording:
+                entry = self._next(name)
+                self._sleep(entry["latency"])
+                if "error" in entry:
+                    raise RuntimeError(entry["error"])
+                return entry["result"]
+            start = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                self._add(name, {"error": f"{type(e).__name__}: {e}", "latency": time.perf_counter() - start})
+                raise
+            self._add(name, {"result": result, "latency": time.perf_counter() - start})
+            return result
+
+        return call
+
+    def wrap_stream(self, kind, fn, key=None):
+        key = key or _default_key
+
+        def call(*args, **kwargs):
+            name = f"{kind}:{key(*args, **kwargs)}"
+            self.calls[kind] += 1
+            if not self.recording:
+                entry = self._next(name)
+                start = time.perf_counter()
+                for offset, chunk in entry["chunks"]:
+                    self._sleep(offset - (time.perf_counter() - start) / (self.speed or 1))
+                    yield chunk
+                self._sleep(entry["latency"] - (time.perf_counter() - start) / (self.speed or 1))
+                if "error" in entry:
+                    raise RuntimeError(entry["error"])
+                return
+            start = time.perf_counter()
+            chunks = []
+            try:
+                for chunk in fn(*args, **kwargs):
+                    chunks.append((time.perf_counter() - start, chunk))
+                    yield chunk
+            except Exception as e:
+                self._add(name, {"chunks": chunks, "error": f"{type(e).__name__}: {e}",
+                                 "latency": time.perf_counter() - start})
+                raise
+            self._add(name, {"chunks": chunks, "latency": time.perf_counter() - start})
+
+        return call
+
+    def save(self, path=None):
+        with self._lock:
+            entries = dict(self.entries)
+        with open(path or self.path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "entries": entries}, f, indent=1, ensure_ascii=False)
+
+    def _add(self, name, entry):
+        entry["latency"] = round(entry["latency"], 4)
+        if "chunks" in entry:
+            entry["chunks"] = [(round(offset, 4), chunk) for offset, chunk in entry["chunks"]]
+        with self._lock:
+            self.entries[name].append(entry)
+
+    def _next(self, name):
+        with self._lock:
+            entries = self.entries.get(name)
+            if not entries:
+                raise KeyError(f"nothing recorded for {name}")
+            position = self._positions[name]
+            self._positions[name] += 1
+        return entries[position % len(entries)]
+
+    def _sleep(self, seconds):
+        if self.speed and seconds > 0:
+            time.sleep(seconds * self.speed)
+
+
+def _default_key(*args, **kwargs):
+    return json.dumps([args, kwargs], sort_keys=True, default=str)
@@ -0,0 +1,146 @@
+import collections
+import json
+import re
+import sqlite3
+import threading
+import time
+
+# Seconds a cached answer stays fresh, by query category
+CATEGORY_TTLS = {
+    "time": 30,
+    "market": 60,
+    "weather": 30 * 60,
+    "news": 15 * 60,
+    "default": 60 * 60,
+}
+
+# First matching category wins, so the most volatile come first
+CATEGORY_KEYWORDS = [
+    ("time", {"time", "date", "today", "now", "clock"}),
+    ("market", {"stock", "stocks", "price", "prices", "share", "currency", "exchange", "rate", "usd", "inr",
+                "eur", "bitcoin", "crypto", "nifty", "sensex"}),
+    ("weather", {"weather", "temperature", "forecast", "rain", "humidity"}),
+    ("news", {"news", "headlines", "latest", "update", "updates"}),
+]
+
+_NON_WORD = re.compile(r"[^\w\s]")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_query(query):
+    """Lowercase, drop punctuation and collapse whitespace"""
+    return _SPACES.sub(" ", _NON_WORD.sub(" ", query.lower())).strip()
+
+
+def query_category(normalized):
+    words = set(normalized.split())
+    for category, keywords in CATEGORY_KEYWORDS:
+        if words & keywords:
+            return category
+    return "default"
+
+
+class DiskStore:
+    """SQLite table of (key, value, expires_at) that survives restarts"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS search_cache "
+                           "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)")
+        self._conn.commit()
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM search_cache WHERE key = ?",
+                                     (key,)).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def set(self, key, value, expires_at):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO search_cache VALUES (?, ?, ?)",
+                               (key, json.dumps(value), expires_at))
+            self._conn.commit()
+
+    def purge_expired(self, now):
+        with self._lock:
+            self._conn.execute("DELETE FROM search_cache WHERE expires_at <= ?", (now,))
+            self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+
+class SearchCache:
+    """LRU cache of search answers keyed by normalized query, with per-category TTLs
+
+    Thread-safe. With a disk_path, entries are written through to SQLite
+    and memory misses fall back to it.
+    """
+
+    def __init__(self, max_entries=1024, ttls=None, disk_path=None, clock=time.time):
+        self.max_entries = max_entries
+        self.ttls = {**CATEGORY_TTLS, **(ttls or {})}
+        self.clock = clock
+        self._entries = collections.OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+        self.disk = DiskStore(disk_path) if disk_path else None
+        if self.disk:
+            self.disk.purge_expired(clock())
+        self.stats = collections.Counter()
+
+    def get(self, query):
+        key = normalize_query(query)
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[0]
+            if entry:
+                del self._entries[key]
+                self.stats["expired"] += 1
+
+        if self.disk:
+            entry = self.disk.get(key)
+            if entry and entry[1] > now:
+                with self._lock:
+                    self._store(key, *entry)
+                    self.stats["hits"] += 1
+                    self.stats["disk_hits"] += 1
+                return entry[0]
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def set(self, query, value):
+        key = normalize_query(query)
+        expires_at = self.clock() + self.ttls[query_category(key)]
+        with self._lock:
+            self._store(key, value, expires_at)
+        if self.disk:
+            self.disk.set(key, value, expires_at)
+
+    def _store(self, key, value, expires_at):
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    @property
+    def hit_rate(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    def summary(self):
+        return (f"search cache: {len(self._entries)} entries, hit rate {self.hit_rate:.0%} "
+                f"(hits {self.stats['hits']}, misses {self.stats['misses']}, expired {self.stats['expired']}, "
+                f"evictions {self.stats['evictions']}, disk hits {self.stats['disk_hits']})")
+
+    def close(self):
+        if self.disk:
+            self.disk.close()
@@ -0,0 +1,235 @@
+import argparse
+import asyncio
+import collections
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app import SERPAPI_KEY, create_chat, needs_live_data, search_google
+from backends import SerpApiClient, StubSerpClient
+from search_cache import SearchCache
+
+# Line protocol (one JSON object per line)
+#   client -> server: {"text": "..."}  (a bare text line is accepted too; a line
+#                     starting with { or [ must be such an object)
+#   server -> client: {"type": "chunk", "text": "..."} ... then
+#                     {"type": "done", "source": "model"|"search", "ttft_ms": .., "total_ms": ..}
+#                     or {"type": "error", "error": "..."}
+
+_DONE = object()
+
+
+def parse_message(line):
+    """Text of one client line; raises ValueError for a malformed JSON message"""
+    if not line.startswith(("{", "[")):
+        return line
+    message = json.loads(line)
+    if not isinstance(message, dict):
+        raise ValueError("a message must be a JSON object")
+    text = message.get("text", "")
+    if not isinstance(text, str):
+        raise ValueError('"text" must be a string')
+    return text
+
+
+async def read_line(reader):
+    """Next line from reader, b"" at end of stream
+
+    A line longer than the reader's limit is read through to its end and
+    dropped, then reported with ValueError, so the next line starts clean.
+    """
+    overlong = False
+    while True:
+        try:
+            line = await reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as e:
+            return b"" if overlong else e.partial
+        except asyncio.LimitOverrunError as e:
+            await reader.readexactly(e.consumed)
+            overlong = True
+            continue
+        if overlong:
+            raise ValueError("line too long")
+        return line
+
+
+async def iterate_in_thread(make_iter, executor):
+    """Drive a blocking iterator in a worker thread, yielding its items on the event loop"""
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    cancelled = threading.Event()
+
+    def pump():
+        try:
+            for item in make_iter():
+                if cancelled.is_set():
+                    break
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, _DONE)
+
+    future = loop.run_in_executor(executor, pump)
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        cancelled.set()
+        await asyncio.shield(future)
+
+
+class ChatServer:
+    """Many concurrent chat sessions, each with its own history
+
+    max_model and max_search cap in-flight backend calls across all
+    sessions; max_pending caps queued messages per session (backpressure).
+    """
+
+    def __init__(self, chat_factory, search_client, search_cache=None,
+                 max_model=32, max_search=16, max_pending=4):
+        self.chat_factory = chat_factory
+        self.search_client = search_client
+        self.search_cache = search_cache
+        self.model_slots = asyncio.Semaphore(max_model)
+        self.search_slots = asyncio.Semaphore(max_search)
+        self.max_pending = max_pending
+        # Blocking SDK calls run here; sized so the semaphores, not the pool, are the limit
+        self.executor = ThreadPoolExecutor(max_workers=max_model + max_search)
+        self.sessions = 0
+        self.stats = collections.Counter()
+
+    async def answer(self, chat, text, send):
+        start = time.perf_counter()
+        first = None
+        if needs_live_data(text):
+            source = "search"
+            async with self.search_slots:
+                answer = await asyncio.get_running_loop().run_in_executor(
+                    self.executor, search_google, text, self.search_client, self.search_cache)
+            first = time.perf_counter()
+            await send({"type": "chunk", "text": answer})
+        else:
+            source = "model"
+            async with self.model_slots:
+                async for chunk in iterate_in_thread(lambda: chat.send_message_stream(text), self.executor):
+                    if first is None:
+                        first = time.perf_counter()
+                    await send({"type": "chunk", "text": chunk})
+        end = time.perf_counter()
+        self.stats[f"{source}_turns"] += 1
+        await send({"type": "done", "source": source,
+                    "ttft_ms": ((first or end) - start) * 1000, "total_ms": (end - start) * 1000})
+
+    async def handle_session(self, reader, writer):
+        chat = self.chat_factory()
+        inbox = asyncio.Queue(maxsize=self.max_pending)
+        self.sessions += 1
+        write_lock = asyncio.Lock()
+
+        async def send(message):
+            async with write_lock:
+                writer.write(json.dumps(message).encode() + b"\n")
+                await writer.drain()
+
+        async def worker():
+            # One turn at a time per session keeps its history consistent
+            while True:
+                text = await inbox.get()
+                if text is None:
+                    return
+                try:
+                    if text.lower() == 'clear':
+                        chat.reset()
+                        await send({"type": "done", "source": "command", "ttft_ms": 0.0, "total_ms": 0.0})
+                    else:
+                        await self.answer(chat, text, send)
+                except (ConnectionError, asyncio.CancelledError):
+                    raise
+                except Exception as e:
+                    self.stats["errors"] += 1
+                    await send({"type": "error", "error": str(e)})
+
+        task = asyncio.create_task(worker())
+        try:
+            while True:
+                try:
+                    line = await read_line(reader)
+                    if not line:
+                        break
+                    text = parse_message(line.decode().strip())
+                except ValueError as e:  # includes overlong lines, bad JSON and UTF-8
+                    self.stats["bad_messages"] += 1
+                    await send({"type": "error", "error": f"bad message: {e}"})
+                    continue
+                if not text:
+                    continue
+                if text.lower() in ('exit', 'quit', 'bye'):
+                    break
+                try:
+                    inbox.put_nowait(text)
+                except asyncio.QueueFull:
+                    self.stats["rejected"] += 1
+                    await send({"type": "error", "error": "busy: too many pending messages"})
+            # A worker that died (client gone) no longer drains a full inbox
+            closing = asyncio.ensure_future(inbox.put(None))
+            await asyncio.wait((closing, task), return_when=asyncio.FIRST_COMPLETED)
+            closing.cancel()
+            await task
+        except ConnectionError:
+            pass
+        finally:
+            if not task.done():
+                task.cancel()
+            self.sessions -= 1
+            writer.close()
+
+
+def make_server(fake=False, model_latency=0.3, search_latency=0.5, **limits):
+    if fake:
+        from backends import FakeChat
+        chat_factory = lambda: FakeChat(first_token_delay=model_latency)
+        search_client = StubSerpClient(latency=search_latency)
+    else:
+        if not SERPAPI_KEY:
+            raise ValueError("SERPAPI_KEY not found in environment variables.")
+        chat_factory = create_chat
+        search_client = SerpApiClient(SERPAPI_KEY)
+    return ChatServer(chat_factory, search_client, SearchCache(), **limits)
+
+
+async def serve(host, port, chat_server):
+    server = await asyncio.start_server(chat_server.handle_session, host, port, limit=1 << 20)
+    print(f"Chat server listening on {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multi-session asyncio chat server (JSON lines over TCP)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fake", action="store_true", help="mock Gemini and SerpAPI backends")
+    parser.add_argument("--model-latency", type=float, default=0.3, help="fake model time to first token (s)")
+    parser.add_argument("--search-latency", type=float, default=0.5, help="stub search latency (s)")
+    parser.add_argument("--max-model", type=int, default=32, help="max in-flight model calls")
+    parser.add_argument("--max-search", type=int, default=16, help="max in-flight searches")
+    parser.add_argument("--max-pending", type=int, default=4, help="max queued messages per session")
+    args = parser.parse_args(argv)
+
+    chat_server = make_server(args.fake, args.model_latency, args.search_latency, max_model=args.max_model,
+                              max_search=args.max_search, max_pending=args.max_pending)
+    try:
+        asyncio.run(serve(args.host, args.port, chat_server))
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
+
+
+if __name__ == "__main__":
+    main()
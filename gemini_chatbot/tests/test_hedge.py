@@ -0,0 +1,73 @@
+import time
+
+from backends import FakeChat
+from hedge import Hedger
+
+
+def slow_search(answer, delay):
+    def search(query):
+        time.sleep(delay)
+        return answer
+    return search
+
+
+def test_merge_grounds_the_reply_in_search_results():
+    prompts = []
+    chat = FakeChat(reply_fn=lambda prompt: prompts.append(prompt) or f"answer {len(prompts)}",
+                    first_token_delay=0.05, chunk_delay=0)
+    hedger = Hedger(slow_search("Sunny, 31°C in Pune", 0.01), chat, policy="merge", merge_deadline=0.5)
+
+    result = hedger.run("weather in pune today")
+
+    assert result.source == "merged"
+    assert "Sunny, 31°C in Pune" in prompts[-1] and prompts[-1].endswith("weather in pune today")
+    assert result.answer == f"answer {len(prompts)}"
+    # The history keeps the question, not the prompt with the results
+    assert [user for user, _, _ in chat.history.recent] == ["weather in pune today"]
+
+
+def test_merge_uses_plain_answer_when_search_misses_the_deadline():
+    chat = FakeChat(reply_fn=lambda prompt: "plain", first_token_delay=0.01, chunk_delay=0)
+    hedger = Hedger(slow_search("late results", 0.5), chat, policy="merge", merge_deadline=0.1)
+
+    result = hedger.run("latest on the match")
+
+    assert (result.answer, result.source) == ("plain", "model")
+    assert chat.history.turns == 1
+
+
+def test_losing_model_leaves_no_turn_in_history():
+    chat = FakeChat(reply_fn=lambda prompt: "slow reply", chunk_size=100, first_token_delay=0.1, chunk_delay=0)
+    hedger = Hedger(slow_search("fast results", 0.01), chat, policy="first")
+
+    result = hedger.run("news today")
+    hedger.executor.shutdown(wait=True)  # let the losing model stream run to its end
+
+    assert result.source == "search"
+    assert chat.history.turns == 0
+
+
+def test_merge_keeps_an_answer_that_is_already_streaming():
+    prompts = []
+    chat = FakeChat(reply_fn=lambda prompt: prompts.append(prompt) or "streamed answer",
+                    chunk_size=3, first_token_delay=0, chunk_delay=0.03)
+    hedger = Hedger(slow_search("late-ish results", 0.05), chat, policy="merge", merge_deadline=1.0)
+
+    result = hedger.run("latest on the match")
+
+    assert (result.answer, result.source) == ("streamed answer", "model")
+    assert prompts == ["latest on the match"]  # no second, grounded call
+
+
+def test_merge_closes_the_speculative_stream_when_search_wins():
+    chat = FakeChat(reply_fn=lambda prompt: "grounded" if "Live search" in prompt else "x" * 400,
+                    chunk_size=10, first_token_delay=0.1, chunk_delay=0.05)
+    hedger = Hedger(slow_search("fast results", 0.01), chat, policy="merge", merge_deadline=1.0)
+
+    result = hedger.run("weather today")
+    start = time.perf_counter()
+    hedger.executor.shutdown(wait=True)
+
+    assert (result.answer, result.source) == ("grounded", "merged")
+    # The speculative stream stops at its first chunk instead of running for 2 s
+    assert time.perf_counter() - start < 0.5
@@ -0,0 +1,49 @@
+from backends import FakeChat
+from history import HistoryManager, contents_tokens, estimate_tokens
+
+# The "Summary of our earlier conversation" / "Understood" turns around the summary lines
+FRAMING_TOKENS = 20
+
+
+def long_reply(text):
+    return (f"Here is a detailed answer about {text}. " + "It covers background, examples and caveats. " * 12).strip()
+
+
+def record_payloads(chat):
+    """Keep every contents list the chat builds, i.e. exactly what the model is sent"""
+    payloads = []
+    build = chat.history.build_contents
+    chat.history.build_contents = lambda message: payloads.append(build(message)) or payloads[-1]
+    return payloads
+
+
+def converse(chat, turns):
+    messages = [f"question number {i} about topic {i % 7}" for i in range(turns)]
+    for text in messages:
+        for _ in chat.send_message_stream(text):
+            pass
+    return messages
+
+
+def test_prompt_stays_within_history_budget():
+    budget = 2000
+    chat = FakeChat(reply_fn=long_reply, first_token_delay=0, chunk_delay=0,
+                    history=HistoryManager(token_budget=budget))
+    payloads = record_payloads(chat)
+
+    messages = converse(chat, 200)
+
+    assert len(payloads) == 200 and chat.history.summary
+    for message, contents in zip(messages, payloads):
+        assert contents[-1] == {"role": "user", "parts": [message]}
+        assert contents_tokens(contents) <= budget + estimate_tokens(message) + FRAMING_TOKENS
+    assert chat.payload_sizes == [contents_tokens(contents) for contents in payloads]
+    assert chat.history.last_prompt_tokens == chat.payload_sizes[-1]
+
+
+def test_unbounded_history_grows_past_the_budget():
+    chat = FakeChat(reply_fn=long_reply, first_token_delay=0, chunk_delay=0,
+                    history=HistoryManager(token_budget=None))
+    converse(chat, 200)
+    assert chat.payload_sizes[-1] > 10 * 2000
+    assert chat.payload_sizes == sorted(chat.payload_sizes)
@@ -0,0 +1,17 @@
+import csv
+import os
+
+import pytest
+
+from app import classify_query, needs_live_data
+
+CASES_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "live_intent_cases.csv")
+
+with open(CASES_FILE, newline="", encoding="utf-8") as f:
+    CASES = [(row["text"], row["label"]) for row in csv.DictReader(f)]
+
+
+@pytest.mark.parametrize("text,label", CASES)
+def test_query_routes_to_labeled_intent(text, label):
+    assert classify_query(text).name == label
+    assert needs_live_data(text) == (label != "chat")
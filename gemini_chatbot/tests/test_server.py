@@ -0,0 +1,96 @@
+import asyncio
+import json
+
+from server import make_server, parse_message
+
+
+def test_parse_message():
+    assert parse_message('{"text": "hello"}') == "hello"
+    assert parse_message("hello") == "hello"
+    for line in ('[1, 2]', '{"text": 5}', '{"text": "hi"'):
+        try:
+            parse_message(line)
+        except ValueError:
+            continue
+        raise AssertionError(f"{line!r} was accepted")
+
+
+def test_bad_lines_get_an_error_and_keep_the_session_open():
+    async def session():
+        chat_server = make_server(fake=True, model_latency=0, search_latency=0)
+        server = await asyncio.start_server(chat_server.handle_session, "127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+        for line in ('[1, 2]', '{"text": 5}', '{bad json', '\xff'):
+            writer.write(line.encode("latin-1") + b"\n")
+        writer.write(json.dumps({"text": "hello"}).encode() + b"\n")
+        replies = []
+        while not replies or replies[-1]["type"] != "done":
+            replies.append(json.loads(await asyncio.wait_for(reader.readline(), 5)))
+        writer.write(b"bye\n")
+        await writer.drain()
+        assert await asyncio.wait_for(reader.read(), 5) == b""
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return chat_server, replies
+
+    chat_server, replies = asyncio.run(session())
+    assert [r["type"] for r in replies[:4]] == ["error"] * 4
+    assert all(r["error"].startswith("bad message") for r in replies[:4])
+    assert replies[-1] == {**replies[-1], "type": "done", "source": "model"}
+    assert chat_server.stats["bad_messages"] == 4 and chat_server.sessions == 0
+
+
+def test_overlong_line_gets_an_error_and_the_next_line_is_answered():
+    async def session():
+        chat_server = make_server(fake=True, model_latency=0, search_latency=0)
+        server = await asyncio.start_server(chat_server.handle_session, "127.0.0.1", 0, limit=64)
+        reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+        writer.write(json.dumps({"text": "x" * 500}).encode() + b"\n" + b'{"text": "hi"}\n')
+        replies = [json.loads(await asyncio.wait_for(reader.readline(), 5))]
+        while replies[-1]["type"] != "done":
+            replies.append(json.loads(await asyncio.wait_for(reader.readline(), 5)))
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return replies
+
+    replies = asyncio.run(session())
+    assert replies[0] == {"type": "error", "error": "bad message: line too long"}
+    assert "".join(r["text"] for r in replies if r["type"] == "chunk").startswith("You said: hi")
+
+
+class ResetWriter:
+    """Stream writer whose client resets as soon as a reply chunk is sent"""
+
+    def __init__(self):
+        self.lines = []
+        self.closed = False
+
+    def write(self, data):
+        self.lines.append(json.loads(data))
+
+    async def drain(self):
+        if self.lines[-1]["type"] == "chunk":
+            raise ConnectionResetError("client went away")
+
+    def close(self):
+        self.closed = True
+
+
+def test_session_ends_when_the_worker_dies_with_a_full_inbox():
+    async def session():
+        chat_server = make_server(fake=True, model_latency=0, search_latency=0, max_pending=2)
+        reader, writer = asyncio.StreamReader(), ResetWriter()
+        handler = asyncio.ensure_future(chat_server.handle_session(reader, writer))
+        reader.feed_data(b"hello\n")
+        while not any(line["type"] == "chunk" for line in writer.lines):
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        reader.feed_data(b"one\ntwo\nthree\n")
+        reader.feed_eof()
+        await asyncio.wait_for(handler, 2)
+        return chat_server, writer
+
+    chat_server, writer = asyncio.run(session())
+    assert chat_server.sessions == 0 and writer.closed